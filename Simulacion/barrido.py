@@ -0,0 +1,160 @@
+"""
+Barrido de parámetros sobre CONFIGURACION, en paralelo y con caché en disco.
+
+Un barrido es una lista de "celdas": overrides de la configuración base
+(armados a mano o expandiendo una grilla) por cada semilla. Cada celda se
+corre en un proceso del pool y su resultado se guarda en disco con una clave
+hash de (versión, configuración normalizada, semilla, horizonte). Al repetir
+un barrido que se superpone con uno anterior, sólo se corren las celdas que
+faltan.
+"""
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from remax_corregido_optimizado import CONFIGURACION
+from replicaciones import ejecutar_replica
+
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_barrido')
+
+# Subir cuando cambian las columnas de una celda o los resultados del motor:
+# las celdas en caché de otra versión no se reutilizan
+VERSION_CACHE = 2
+
+# Claves que no cambian los resultados: se excluyen de la clave de caché
+CLAVES_SIN_EFECTO = (
+    'semilla',
+    'verbose_logging',
+    'capacidad_log_criticos',
+    'capacidad_log_actividades',
+    'archivo_log',
+    'directorio_traza',
+    'ruta_checkpoint',
+    'intervalo_checkpoint_horas',
+)
+
+
+def expandir_grilla(grilla: Dict[str, Sequence]) -> List[Dict]:
+    """Producto cartesiano de una grilla {parámetro: [valores]} → lista de overrides"""
+    nombres = list(grilla)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*(grilla[n] for n in nombres))]
+
+
+def normalizar_config(config: Dict) -> Dict:
+    """Configuración canónica para la caché: sin claves irrelevantes y con floats como float"""
+    return {
+        clave: float(valor) if isinstance(valor, (int, float)) and not isinstance(valor, bool) else valor
+        for clave, valor in sorted(config.items())
+        if clave not in CLAVES_SIN_EFECTO
+    }
+
+
+def clave_celda(config: Dict, semilla: int, tiempo_total_horas: float) -> str:
+    """Hash estable de (versión, configuración normalizada, semilla, horizonte)"""
+    contenido = json.dumps(
+        {
+            'version': VERSION_CACHE, 'config': normalizar_config(config),
+            'semilla': semilla, 'horas': float(tiempo_total_horas),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def _ruta_cache(directorio_cache: str, clave: str) -> str:
+    return os.path.join(directorio_cache, clave[:2], f"{clave}.json")
+
+
+def _leer_cache(directorio_cache: str, clave: str) -> Optional[Dict]:
+    ruta = _ruta_cache(directorio_cache, clave)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def _escribir_cache(directorio_cache: str, clave: str, resultado: Dict):
+    ruta = _ruta_cache(directorio_cache, clave)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(resultado, archivo)
+    os.replace(temporal, ruta)
+
+
+def _correr_celda(config: Dict, tiempo_total_horas: float, semilla: int) -> Dict:
+    """Una réplica de una celda; la réplica 0 de la semilla es la corrida de la celda.
+
+    Los promedios de estado se aplanan en columnas `estado_<variable>` para que la tabla siga siendo tidy.
+    """
+    resultado = asdict(ejecutar_replica(config, tiempo_total_horas, semilla, 0))
+    resultado.update({f"estado_{nombre}": valor for nombre, valor in resultado.pop('estado').items()})
+    return resultado
+
+
+def ejecutar_barrido(
+    overrides: Iterable[Dict],
+    tiempo_total_horas: float,
+    semillas: Sequence[int] = (0,),
+    config_base: Dict = CONFIGURACION,
+    procesos: Optional[int] = None,
+    directorio_cache: str = DIRECTORIO_CACHE,
+    archivo_salida: Optional[str] = None,
+) -> pd.DataFrame:
+    """Corre (o recupera de la caché) cada combinación override × semilla.
+
+    Devuelve una tabla "tidy": una fila por celda, con una columna por
+    parámetro variado, la semilla, el horizonte y cada métrica de salida.
+    Si se pasa `archivo_salida`, la tabla también se guarda como CSV.
+    """
+    overrides = [dict(o) for o in overrides]
+    parametros = sorted({clave for o in overrides for clave in o})
+
+    celdas = []
+    for override, semilla in itertools.product(overrides, semillas):
+        config = dict(config_base, **override)
+        celdas.append((override, semilla, config, clave_celda(config, semilla, tiempo_total_horas)))
+
+    resultados = {clave: _leer_cache(directorio_cache, clave) for *_, clave in celdas}
+    pendientes = {clave: (config, semilla) for _, semilla, config, clave in celdas if resultados[clave] is None}
+
+    if pendientes:
+        print(f"🔁 Barrido: {len(pendientes)} celdas a correr, {len(celdas) - len(pendientes)} en caché")
+        with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as pool:
+            futuros = {
+                clave: pool.submit(_correr_celda, config, tiempo_total_horas, semilla)
+                for clave, (config, semilla) in pendientes.items()
+            }
+            for clave, futuro in futuros.items():
+                resultados[clave] = futuro.result()
+                _escribir_cache(directorio_cache, clave, resultados[clave])
+    else:
+        print(f"✅ Barrido: las {len(celdas)} celdas estaban en caché")
+
+    filas = []
+    for override, semilla, config, clave in celdas:
+        fila = {parametro: config.get(parametro) for parametro in parametros}
+        fila.update(semilla=semilla, horas=tiempo_total_horas, clave=clave)
+        fila.update({k: v for k, v in resultados[clave].items() if k != 'replica'})
+        filas.append(fila)
+
+    tabla = pd.DataFrame(filas)
+    if archivo_salida:
+        tabla.to_csv(archivo_salida, index=False)
+    return tabla
+
+
+if __name__ == "__main__":
+    grilla = {
+        'num_agentes': [70, 80, 90],
+        'max_propiedades_verificacion_por_agente': [2, 3, 4],
+        'hora_fin_jornada': [14, 18],
+    }
+    tabla = ejecutar_barrido(expandir_grilla(grilla), tiempo_total_horas=8760, semillas=range(3), archivo_salida='barrido.csv')
+    print(tabla.groupby(list(grilla))[['total_ventas', 'tasa_visitas_perdidas', 'utilizacion_promedio']].mean())
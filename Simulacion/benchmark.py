@@ -0,0 +1,343 @@
+"""
+Benchmark de las tres generaciones del simulador sobre una matriz de escalas.
+
+Compara `remax.py` (original), `remax_corregido.py` (corregido) y
+`remax_corregido_optimizado.py` (optimizado) variando la cantidad de agentes,
+de propiedades activas y el horizonte simulado. Cada celda corre en un
+subproceso aparte (con timeout), así el pico de RSS es el de esa corrida sola
+y una generación que deja de escalar no frena al resto del benchmark.
+
+Por celda se registra: eventos procesados, tiempo de pared, eventos por
+segundo, visitas por segundo (comparable entre generaciones, porque cada una
+define "evento" distinto), pico de RSS, bloques de memoria retenidos por
+evento (crecimiento neto) y asignaciones por evento. Las asignaciones se
+cuentan con memray (dependencia opcional; sin memray quedan en None) en una
+segunda corrida corta de la misma celda, porque rastrear cada asignación es
+mucho más lento que la corrida medida. El reporte se escribe en JSON para
+poder comparar corridas y detectar regresiones con `comparar_reportes`.
+"""
+import argparse
+import contextlib
+import gc
+import heapq
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+VERSION_REPORTE = 2
+
+# Generación → (módulo, ¿modela el stock de propiedades activas?, overrides de configuración)
+GENERACIONES = {
+    'original': ('remax', False, {}),
+    'corregido': ('remax_corregido', True, {}),
+    'optimizado': ('remax_corregido_optimizado', True, {}),
+    'optimizado_calendario': ('remax_corregido_optimizado', True, {'cola_eventos': 'calendario'}),
+}
+
+# Matrices de escalas predefinidas
+ESCALAS = {
+    'rapida': {
+        'agentes': (10, 100, 1000),
+        'propiedades': (10**3, 10**4),
+        'horizontes_horas': (168, 720),
+    },
+    'completa': {
+        'agentes': (10, 100, 1000, 10000),
+        'propiedades': (10**3, 10**4, 10**5, 10**6),
+        'horizontes_horas': (720, 8760, 87600),
+    },
+}
+
+TIMEOUT_CELDA = 600  # Segundos por celda
+HORAS_ASIGNACIONES = 168  # Horizonte (tope) de la corrida corta que cuenta asignaciones
+MARCA_RESULTADO = '@@BENCHMARK@@'  # Prefijo de la línea con el resultado del subproceso
+
+
+class _HeapqContado:
+    """Reemplazo de `heapq` para los motores viejos: cuenta los eventos extraídos"""
+
+    def __init__(self):
+        self.extraidos = 0
+        self.heappush = heapq.heappush
+
+    def heappop(self, heap):
+        self.extraidos += 1
+        return heapq.heappop(heap)
+
+
+def _pico_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso en MB (None si la plataforma no lo expone)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo reporta en KB, macOS en bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def _contar_asignaciones(archivo: str) -> int:
+    """Asignaciones (malloc, calloc, realloc, mmap y las de pymalloc) registradas por memray; sin las liberaciones"""
+    import memray
+    liberaciones = {tipo for tipo in memray.AllocatorType if tipo.name.endswith('FREE') or tipo.name == 'MUNMAP'}
+    return sum(
+        registro.n_allocations for registro in memray.FileReader(archivo).get_allocation_records()
+        if registro.allocator not in liberaciones
+    )
+
+
+def _preparar_corrida(generacion: str, num_agentes: int, num_propiedades: int, semilla: int):
+    """(módulo, configuración, contador de eventos) de una celda; sin contador en el optimizado, que cuenta sus eventos"""
+    nombre_modulo, _, overrides = GENERACIONES[generacion]
+    from remax_corregido_optimizado import CONFIGURACION
+    modulo = importlib.import_module(nombre_modulo)
+
+    # Misma carga de trabajo para las tres generaciones: los parámetros compartidos salen de la
+    # configuración optimizada y los que sólo usa la generación vieja, de su propia configuración
+    config = dict(modulo.CONFIGURACION, **CONFIGURACION)
+    config.update(overrides, num_agentes=num_agentes, num_propiedades_activas=num_propiedades, semilla=semilla)
+    contador = None
+    if nombre_modulo != 'remax_corregido_optimizado':
+        contador = _HeapqContado()
+        modulo.heapq = contador
+        modulo.random.seed(semilla)
+    return modulo, config, contador
+
+
+def _ejecutar(simulacion, tiempo_total_horas: float, optimizado: bool):
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        if optimizado:
+            simulacion.ejecutar_simulacion(tiempo_total_horas, reporte=False)
+        else:
+            simulacion.ejecutar_simulacion(tiempo_total_horas)
+
+
+def medir_asignaciones(generacion: str, num_agentes: int, num_propiedades: int, tiempo_total_horas: float,
+                       semilla: int = 0) -> Optional[float]:
+    """Asignaciones de memoria por evento en una corrida corta de la celda (None sin memray).
+
+    Cuenta cada asignación, aunque se libere enseguida: un motor que asigna y
+    libera mucho da alto acá y ~0 en bloques retenidos. Sólo se rastrea la
+    ejecución, no la construcción (que crea las propiedades de una vez).
+    """
+    try:
+        import memray
+    except ImportError:
+        return None
+    modulo, config, contador = _preparar_corrida(generacion, num_agentes, num_propiedades, semilla)
+    simulacion = modulo.SimulacionInmobiliaria(config=config)
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'asignaciones.bin')
+        with memray.Tracker(archivo, trace_python_allocators=True):
+            _ejecutar(simulacion, min(tiempo_total_horas, HORAS_ASIGNACIONES), contador is None)
+        asignaciones = _contar_asignaciones(archivo)
+    eventos = contador.extraidos if contador is not None else simulacion.eventos_procesados
+    return asignaciones / max(eventos, 1)
+
+
+def medir_celda(generacion: str, num_agentes: int, num_propiedades: int, tiempo_total_horas: float, semilla: int = 0) -> Dict:
+    """Corre una celda en el proceso actual y devuelve sus medidas.
+
+    Pensada para ejecutarse en un subproceso limpio (ver `ejecutar_celda`):
+    el pico de RSS es el del proceso entero y se toma antes de la corrida
+    corta que cuenta asignaciones.
+    """
+    modulo, config, contador = _preparar_corrida(generacion, num_agentes, num_propiedades, semilla)
+
+    rss_base_mb = _pico_rss_mb()
+    gc.collect()
+    bloques_inicio = sys.getallocatedblocks()
+
+    inicio = time.perf_counter()
+    simulacion = modulo.SimulacionInmobiliaria(config=config)
+    tiempo_construccion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    _ejecutar(simulacion, tiempo_total_horas, contador is None)
+    tiempo_pared = time.perf_counter() - inicio
+
+    eventos = contador.extraidos if contador is not None else simulacion.eventos_procesados
+    visitas = getattr(simulacion, 'total_visitas_generadas', None)
+    if visitas is None:
+        # El original crea una propiedad por visita generada
+        visitas = simulacion.proxima_propiedad_id
+    bloques_retenidos = sys.getallocatedblocks() - bloques_inicio
+    pico_rss_mb = _pico_rss_mb()
+    total_ventas = simulacion.total_ventas
+    del simulacion
+
+    return {
+        'eventos': eventos,
+        'visitas_generadas': visitas,
+        'total_ventas': total_ventas,
+        'tiempo_construccion_segundos': tiempo_construccion,
+        'tiempo_pared_segundos': tiempo_pared,
+        'eventos_por_segundo': eventos / tiempo_pared if tiempo_pared > 0 else None,
+        'visitas_por_segundo': visitas / tiempo_pared if tiempo_pared > 0 else None,
+        'rss_base_mb': rss_base_mb,
+        'pico_rss_mb': pico_rss_mb,
+        'bloques_retenidos_por_evento': bloques_retenidos / max(eventos, 1),
+        'asignaciones_por_evento': medir_asignaciones(generacion, num_agentes, num_propiedades, tiempo_total_horas, semilla),
+    }
+
+
+def ejecutar_celda(generacion: str, num_agentes: int, num_propiedades: int, tiempo_total_horas: float,
+                   semilla: int = 0, timeout: float = TIMEOUT_CELDA) -> Dict:
+    """Corre una celda en un subproceso nuevo y devuelve su fila del reporte"""
+    celda = {
+        'generacion': generacion,
+        'num_agentes': num_agentes,
+        'num_propiedades': num_propiedades if GENERACIONES[generacion][1] else None,
+        'horas': tiempo_total_horas,
+        'semilla': semilla,
+    }
+    argumentos = json.dumps(dict(celda, num_propiedades=num_propiedades))
+    comando = [sys.executable, os.path.abspath(__file__), '--celda', argumentos]
+
+    try:
+        proceso = subprocess.run(
+            comando, cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return dict(celda, estado='timeout')
+
+    for linea in reversed(proceso.stdout.splitlines()):
+        if linea.startswith(MARCA_RESULTADO):
+            return dict(celda, estado='ok', **json.loads(linea[len(MARCA_RESULTADO):]))
+
+    error = proceso.stderr.strip().splitlines()
+    return dict(celda, estado='error', error=error[-1] if error else f"código de salida {proceso.returncode}")
+
+
+def _dominada(celda: tuple, fallidas: List[tuple]) -> bool:
+    """True si la celda es al menos tan grande en todas las dimensiones que alguna que ya falló"""
+    return any(all(a >= b for a, b in zip(celda, fallida)) for fallida in fallidas)
+
+
+def ejecutar_benchmark(
+    escala: str = 'rapida',
+    generaciones=tuple(GENERACIONES),
+    timeout: float = TIMEOUT_CELDA,
+    semilla: int = 0,
+    archivo_salida: Optional[str] = None,
+) -> Dict:
+    """Recorre la matriz de escalas para cada generación y arma el reporte.
+
+    Las celdas se corren de menor a mayor; si una celda da timeout o error,
+    las celdas más grandes en todas las dimensiones de esa misma generación
+    se marcan como 'omitida' sin correrlas.
+    """
+    matriz = ESCALAS[escala] if isinstance(escala, str) else escala
+    celdas = []
+    for generacion in generaciones:
+        modela_propiedades = GENERACIONES[generacion][1]
+        # Si la generación no modela el stock de propiedades, variarlo no cambia nada
+        propiedades = matriz['propiedades'] if modela_propiedades else matriz['propiedades'][:1]
+        fallidas = []
+        for horas in sorted(matriz['horizontes_horas']):
+            for num_agentes in sorted(matriz['agentes']):
+                for num_propiedades in sorted(propiedades):
+                    tamano = (horas, num_agentes, num_propiedades)
+                    if _dominada(tamano, fallidas):
+                        celdas.append({
+                            'generacion': generacion, 'num_agentes': num_agentes,
+                            'num_propiedades': num_propiedades if modela_propiedades else None,
+                            'horas': horas, 'semilla': semilla, 'estado': 'omitida',
+                        })
+                        continue
+
+                    fila = ejecutar_celda(generacion, num_agentes, num_propiedades, horas, semilla, timeout)
+                    celdas.append(fila)
+                    if fila['estado'] != 'ok':
+                        fallidas.append(tamano)
+                    _imprimir_fila(fila)
+
+    reporte = {
+        'version': VERSION_REPORTE,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'escala': matriz,
+        'timeout_segundos': timeout,
+        'celdas': celdas,
+    }
+    if archivo_salida:
+        with open(archivo_salida, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, indent=2)
+    return reporte
+
+
+def comparar_reportes(anterior: Dict, actual: Dict, tolerancia: float = 0.10) -> List[Dict]:
+    """Celdas cuyo rendimiento empeoró más que `tolerancia` entre dos reportes.
+
+    Compara visitas por segundo celda a celda (misma generación, agentes,
+    propiedades y horizonte). Una celda que antes terminaba y ahora no, cuenta
+    como regresión.
+    """
+    def clave(celda):
+        return (celda['generacion'], celda['num_agentes'], celda['num_propiedades'], celda['horas'])
+
+    previas = {clave(c): c for c in anterior['celdas']}
+    regresiones = []
+    for celda in actual['celdas']:
+        previa = previas.get(clave(celda))
+        if previa is None or previa['estado'] != 'ok':
+            continue
+        if celda['estado'] != 'ok':
+            regresiones.append({'celda': clave(celda), 'antes': previa['visitas_por_segundo'], 'ahora': celda['estado']})
+            continue
+        cambio = celda['visitas_por_segundo'] / previa['visitas_por_segundo'] - 1
+        if cambio < -tolerancia:
+            regresiones.append({'celda': clave(celda), 'antes': previa['visitas_por_segundo'],
+                                'ahora': celda['visitas_por_segundo'], 'cambio': cambio})
+    return regresiones
+
+
+def _imprimir_fila(fila: Dict):
+    propiedades = fila['num_propiedades'] if fila['num_propiedades'] is not None else '-'
+    encabezado = f"{fila['generacion']:<21} agentes={fila['num_agentes']:<6} props={propiedades:<8} horas={fila['horas']:<7}"
+    if fila['estado'] != 'ok':
+        print(f"{encabezado} ❌ {fila['estado']} {fila.get('error', '')}")
+        return
+    rss = f"{fila['pico_rss_mb']:.0f} MB" if fila['pico_rss_mb'] is not None else 'n/d'
+    print(
+        f"{encabezado} ⏱️ {fila['tiempo_pared_segundos']:8.2f}s  "
+        f"{fila['eventos_por_segundo']:>10,.0f} ev/s  {fila['visitas_por_segundo']:>10,.0f} visitas/s  RSS {rss}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de las generaciones del simulador")
+    parser.add_argument('--escala', choices=sorted(ESCALAS), default='rapida')
+    parser.add_argument('--generaciones', nargs='+', choices=list(GENERACIONES), default=list(GENERACIONES))
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_CELDA, help="Segundos por celda")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='benchmark.json', help="Archivo JSON del reporte")
+    parser.add_argument('--comparar', help="Reporte anterior contra el que buscar regresiones")
+    parser.add_argument('--celda', help=argparse.SUPPRESS)  # Uso interno: subproceso de una celda
+    argumentos = parser.parse_args()
+
+    if argumentos.celda:
+        celda = json.loads(argumentos.celda)
+        resultado = medir_celda(celda['generacion'], celda['num_agentes'], celda['num_propiedades'], celda['horas'], celda['semilla'])
+        print(MARCA_RESULTADO + json.dumps(resultado))
+        sys.exit(0)
+
+    reporte = ejecutar_benchmark(argumentos.escala, argumentos.generaciones, argumentos.timeout, argumentos.semilla, argumentos.salida)
+    print(f"\n📄 Reporte: {argumentos.salida}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar_reportes(json.load(archivo), reporte)
+        print(f"📉 Regresiones: {len(regresiones)}")
+        for regresion in regresiones:
+            print(f"   {regresion}")
+        sys.exit(1 if regresiones else 0)
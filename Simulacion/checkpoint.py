@@ -0,0 +1,30 @@
+"""
+Checkpoints de la simulación: snapshot versionado del estado completo.
+
+El snapshot es un pickle de la simulación entera (cola de eventos, flujos
+aleatorios con sus buffers, agentes, propiedades activas, contadores y
+estadísticas online) envuelto con un número de versión. Se escribe en un
+archivo temporal y se renombra, así un corte durante la escritura nunca deja
+un checkpoint a medio escribir.
+"""
+import os
+import pickle
+
+VERSION_CHECKPOINT = 2
+
+
+def guardar_checkpoint(simulacion, ruta: str):
+    """Escribe el snapshot de forma atómica"""
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as archivo:
+        pickle.dump({'version': VERSION_CHECKPOINT, 'simulacion': simulacion}, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+
+
+def cargar_checkpoint(ruta: str):
+    """Lee un snapshot y devuelve la simulación lista para continuar"""
+    with open(ruta, 'rb') as archivo:
+        snapshot = pickle.load(archivo)
+    if snapshot.get('version') != VERSION_CHECKPOINT:
+        raise ValueError(f"Versión de checkpoint no soportada: {snapshot.get('version')} (se esperaba {VERSION_CHECKPOINT})")
+    return snapshot['simulacion']
@@ -0,0 +1,283 @@
+"""
+Cola de eventos futuros de la simulación inmobiliaria.
+
+Los eventos se guardan como tuplas homogéneas
+    (tiempo, secuencia, codigo, propiedad_id, agente_id)
+con códigos enteros en lugar de nombres. El número de secuencia (creciente)
+desempata los eventos simultáneos en orden de programación (FIFO), así las
+comparaciones del heap nunca llegan a los campos de datos y el orden es
+determinista.
+
+Hay dos implementaciones intercambiables de la lista de eventos futuros, con
+la misma interfaz (programar, extraer, proximo_tiempo, len) y el mismo orden
+de salida; se eligen con `crear_cola_eventos` (clave 'cola_eventos' de la
+configuración):
+
+- 'heap': heap binario (heapq), O(log n) por operación
+- 'calendario': calendar queue (Brown, 1988), O(1) amortizado con buckets
+  que se redimensionan según la cantidad de eventos pendientes
+- 'carriles': una deque FIFO por cada tipo de evento de demora constante y
+  un heap sólo para el resto (las visitas, de tiempos aleatorios)
+"""
+import heapq
+from bisect import insort
+from collections import deque
+from typing import Deque, Dict, List, Sequence, Tuple
+
+# Códigos de evento (índices en la tabla de manejadores de la simulación)
+VISITA = 0
+FIN_VISITA = 1
+FIN_GESTION_PAPELES = 2
+RENEGOCIACION = 3
+FIN_VERIFICACION = 4
+FIN_ESCRIBANIA = 5
+VISITA_DERIVADA = 6  # Visita que otra oficina de la red no pudo atender (ver red_oficinas)
+
+NOMBRES_EVENTOS = (
+    'visita',
+    'fin_visita',
+    'fin_gestion_papeles',
+    'renegociacion',
+    'fin_verificacion',
+    'fin_escribania',
+    'visita_derivada',
+)
+
+SIN_ID = -1  # Para eventos sin propiedad o agente asociado
+
+Evento = Tuple[float, int, int, int, int]
+
+
+class ColaEventos:
+    """Heap binario de eventos con desempate por número de secuencia"""
+
+    def __init__(self):
+        self._heap = []
+        self._secuencia = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def programar(self, tiempo: float, codigo: int, propiedad_id: int = SIN_ID, agente_id: int = SIN_ID):
+        """Agrega un evento en O(log n)"""
+        heapq.heappush(self._heap, (tiempo, self._secuencia, codigo, propiedad_id, agente_id))
+        self._secuencia += 1
+
+    def extraer(self) -> Evento:
+        """Saca el próximo evento (menor tiempo; a igual tiempo, el primero programado)"""
+        return heapq.heappop(self._heap)
+
+    def proximo_tiempo(self) -> float:
+        """Tiempo del próximo evento sin sacarlo"""
+        return self._heap[0][0]
+
+
+class ColaCalendario:
+    """Calendar queue: buckets de ancho fijo recorridos como los días de un año.
+
+    El evento de tiempo t va al bucket int(t / ancho) % cantidad. Cada bucket
+    es una lista ordenada por (tiempo, secuencia), así el orden de salida es
+    exactamente el del heap. Para extraer se recorren los buckets desde el
+    actual buscando un evento del "año" en curso; si una vuelta entera no
+    encuentra ninguno (eventos muy lejanos), se busca el mínimo directamente.
+    El día de un evento se compara como entero, int(t / ancho), con la misma
+    cuenta que decide su bucket: sumar el ancho a un tope acumularía error de
+    redondeo y podría saltear el día correcto.
+    El bucket del próximo evento queda en caché, así `proximo_tiempo` seguido
+    de `extraer` hace una sola búsqueda.
+
+    La cantidad de buckets se duplica cuando hay más de 2 eventos por bucket y
+    se reduce a la mitad cuando hay menos de medio; al redimensionar, el ancho
+    se recalcula con la separación media entre los próximos eventos (sin los
+    saltos grandes), que es lo que importa para extraer.
+    """
+
+    MINIMO_BUCKETS = 2
+    MUESTRA_ANCHO = 25  # Eventos próximos que se miran para estimar el ancho
+
+    def __init__(self, cantidad_buckets: int = 2, ancho: float = 1.0):
+        self._secuencia = 0
+        self._tamano = 0
+        self._ultimo_tiempo = 0.0  # Tiempo del último evento extraído
+        self._proximo = None  # (bucket, día) del próximo evento, si ya se buscó
+        self._iniciar(cantidad_buckets, ancho, 0.0)
+        self._umbral_crecer = 2 * cantidad_buckets
+        self._umbral_achicar = cantidad_buckets // 2 - 2
+
+    def _iniciar(self, cantidad_buckets: int, ancho: float, desde: float):
+        self._buckets: List[List[Evento]] = [[] for _ in range(cantidad_buckets)]
+        self._cantidad = cantidad_buckets
+        self._ancho = ancho
+        # Bucket actual y su "día" (índice entero del intervalo de ancho `ancho`) en el año en curso
+        self._dia = int(desde / ancho)
+        self._actual = self._dia % cantidad_buckets
+        self._proximo = None
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def __bool__(self) -> bool:
+        return self._tamano > 0
+
+    def programar(self, tiempo: float, codigo: int, propiedad_id: int = SIN_ID, agente_id: int = SIN_ID):
+        """Agrega un evento en O(1) amortizado"""
+        evento = (tiempo, self._secuencia, codigo, propiedad_id, agente_id)
+        proximo = self._proximo
+        if proximo is not None and evento < self._buckets[proximo[0]][0]:
+            self._proximo = None  # El nuevo evento sale antes que el buscado
+        insort(self._buckets[int(tiempo / self._ancho) % self._cantidad], evento)
+        self._secuencia += 1
+        self._tamano += 1
+        if self._tamano > self._umbral_crecer:
+            self._redimensionar(2 * self._cantidad)
+
+    def extraer(self) -> Evento:
+        """Saca el próximo evento (menor tiempo; a igual tiempo, el primero programado)"""
+        if not self._tamano:
+            raise IndexError("extraer de una cola de eventos vacía")
+        i, dia = self._proximo or self._buscar()
+        evento = self._buckets[i].pop(0)
+        self._actual = i
+        self._dia = dia
+        self._proximo = None
+        self._ultimo_tiempo = evento[0]
+        self._tamano -= 1
+        if self._tamano < self._umbral_achicar:
+            self._redimensionar(self._cantidad // 2)
+        return evento
+
+    def _buscar(self) -> Tuple[int, int]:
+        """(bucket, día) del próximo evento: O(1) amortizado recorriendo desde el actual"""
+        buckets = self._buckets
+        cantidad = self._cantidad
+        ancho = self._ancho
+        i = self._actual
+        dia = self._dia
+        for _ in range(cantidad):
+            bucket = buckets[i]
+            if bucket and int(bucket[0][0] / ancho) <= dia:
+                self._proximo = (i, dia)
+                return self._proximo
+            i += 1
+            if i == cantidad:
+                i = 0
+            dia += 1
+
+        # Una vuelta entera sin eventos del año en curso: ir directo al mínimo
+        i = min((b for b in range(cantidad) if buckets[b]), key=lambda b: buckets[b][0])
+        self._proximo = (i, int(buckets[i][0][0] / ancho))
+        return self._proximo
+
+    def proximo_tiempo(self) -> float:
+        """Tiempo del próximo evento sin sacarlo (la búsqueda queda para el próximo `extraer`)"""
+        if not self._tamano:
+            raise IndexError("cola de eventos vacía")
+        i, _ = self._proximo or self._buscar()
+        return self._buckets[i][0][0]
+
+    def _redimensionar(self, cantidad_buckets: int):
+        cantidad_buckets = max(cantidad_buckets, self.MINIMO_BUCKETS)
+        eventos = [evento for bucket in self._buckets for evento in bucket]
+        ancho = self._estimar_ancho(eventos)
+        self._iniciar(cantidad_buckets, ancho, self._ultimo_tiempo)
+        for evento in eventos:
+            insort(self._buckets[int(evento[0] / ancho) % cantidad_buckets], evento)
+        self._umbral_crecer = 2 * cantidad_buckets
+        self._umbral_achicar = cantidad_buckets // 2 - 2
+
+    def _estimar_ancho(self, eventos: List[Evento]) -> float:
+        """3 veces la separación media entre los próximos eventos, descartando saltos grandes"""
+        proximos = [evento[0] for evento in heapq.nsmallest(self.MUESTRA_ANCHO, eventos)]
+        separaciones = [b - a for a, b in zip(proximos, proximos[1:])]
+        if not separaciones:
+            return self._ancho
+        media = sum(separaciones) / len(separaciones)
+        acotadas = [s for s in separaciones if s <= 2 * media]
+        media = sum(acotadas) / len(acotadas) if acotadas else media
+        return 3 * media if media > 0 else self._ancho
+
+
+class ColaCarriles:
+    """Carriles FIFO para eventos de demora constante + heap para el resto.
+
+    Si un tipo de evento siempre se programa a `ahora + constante`, sus
+    eventos salen en el mismo orden en que se programan: alcanza con una deque
+    (append O(1)) y el próximo evento es el menor entre las cabezas de los
+    carriles y el tope del heap. Si alguna vez llega un evento de carril con
+    tiempo anterior al último del carril (la demora dejó de ser constante),
+    ese evento va al heap: el orden de salida sigue siendo exacto.
+    """
+
+    def __init__(self, codigos_carril: Sequence[int] = ()):
+        self._heap: List[Evento] = []
+        self._secuencia = 0
+        self._tamano = 0
+        self._carriles: Dict[int, Deque[Evento]] = {codigo: deque() for codigo in codigos_carril}
+        self._lista_carriles = list(self._carriles.values())
+        self.desvios_al_heap = 0  # Eventos de carril que rompieron la monotonía
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def __bool__(self) -> bool:
+        return self._tamano > 0
+
+    def programar(self, tiempo: float, codigo: int, propiedad_id: int = SIN_ID, agente_id: int = SIN_ID):
+        """Agrega un evento: O(1) en su carril, O(log n) en el heap"""
+        evento = (tiempo, self._secuencia, codigo, propiedad_id, agente_id)
+        self._secuencia += 1
+        self._tamano += 1
+        carril = self._carriles.get(codigo)
+        if carril is not None:
+            if not carril or carril[-1][0] <= tiempo:
+                carril.append(evento)
+                return
+            self.desvios_al_heap += 1
+        heapq.heappush(self._heap, evento)
+
+    def extraer(self) -> Evento:
+        """Saca el próximo evento (menor tiempo; a igual tiempo, el primero programado)"""
+        heap = self._heap
+        mejor = heap[0] if heap else None
+        origen = None
+        for carril in self._lista_carriles:
+            if carril and (mejor is None or carril[0] < mejor):
+                mejor = carril[0]
+                origen = carril
+        if mejor is None:
+            raise IndexError("extraer de una cola de eventos vacía")
+        self._tamano -= 1
+        if origen is None:
+            return heapq.heappop(heap)
+        return origen.popleft()
+
+    def proximo_tiempo(self) -> float:
+        """Tiempo del próximo evento sin sacarlo"""
+        cabezas = [carril[0][0] for carril in self._lista_carriles if carril]
+        if self._heap:
+            cabezas.append(self._heap[0][0])
+        return min(cabezas)
+
+
+# Implementaciones disponibles de la lista de eventos futuros
+IMPLEMENTACIONES = {
+    'heap': ColaEventos,
+    'calendario': ColaCalendario,
+    'carriles': ColaCarriles,
+}
+
+
+def crear_cola_eventos(tipo: str = 'heap', codigos_demora_constante: Sequence[int] = ()):
+    """Instancia la lista de eventos futuros según la configuración.
+
+    `codigos_demora_constante` son los tipos de evento que el motor siempre
+    programa con la misma demora (sólo los usa 'carriles').
+    """
+    if tipo not in IMPLEMENTACIONES:
+        raise ValueError(f"Cola de eventos desconocida: {tipo!r} (opciones: {sorted(IMPLEMENTACIONES)})")
+    if tipo == 'carriles':
+        return ColaCarriles(codigos_demora_constante)
+    return IMPLEMENTACIONES[tipo]()
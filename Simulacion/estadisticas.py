@@ -0,0 +1,406 @@
+"""
+Herramientas estadísticas para analizar las corridas de la simulación.
+
+- Cuantiles de la t de Student (sin depender de SciPy)
+- Intervalos de confianza para la media de réplicas independientes
+- Comparación de dos muestras independientes (IC de Welch, Kolmogorov-Smirnov)
+- Estadísticas online en memoria constante (media/varianza de Welford,
+  mínimo/máximo y cuantiles con el algoritmo P²)
+- Promedios temporales de variables de estado (N(t), B(t), agentes ocupados)
+- Detección online del fin del período de calentamiento (MSER-5)
+"""
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def cuantil_t(probabilidad: float, grados_libertad: int) -> float:
+    """Cuantil de la distribución t de Student.
+
+    Para 1 y 2 grados de libertad usa la fórmula cerrada; para el resto, la
+    expansión de Cornish-Fisher alrededor del cuantil normal
+    (Abramowitz & Stegun 26.7.5): error < 5e-3 con ν = 3 y < 1e-3 desde ν = 4.
+    """
+    if grados_libertad < 1:
+        raise ValueError("Se necesita al menos 1 grado de libertad")
+    if grados_libertad == 1:
+        return math.tan(math.pi * (probabilidad - 0.5))
+    if grados_libertad == 2:
+        return (2 * probabilidad - 1) / math.sqrt(2 * probabilidad * (1 - probabilidad))
+
+    z = NormalDist().inv_cdf(probabilidad)
+    v = grados_libertad
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    return z + g1 / v + g2 / v ** 2 + g3 / v ** 3 + g4 / v ** 4
+
+
+@dataclass
+class IntervaloConfianza:
+    """Estimación de una media con su intervalo de confianza basado en la t"""
+    media: float
+    desvio: float
+    semiamplitud: float
+    n: int
+    nivel: float
+
+    @property
+    def inferior(self) -> float:
+        return self.media - self.semiamplitud
+
+    @property
+    def superior(self) -> float:
+        return self.media + self.semiamplitud
+
+    @property
+    def semiamplitud_relativa(self) -> float:
+        """Semiamplitud / |media| (infinito si la media es 0)"""
+        return self.semiamplitud / abs(self.media) if self.media else math.inf
+
+
+def intervalo_confianza(valores: Sequence[float], nivel: float = 0.95) -> IntervaloConfianza:
+    """Intervalo de confianza t para la media de observaciones i.i.d. (p. ej. réplicas)"""
+    n = len(valores)
+    if n == 0:
+        raise ValueError("No hay valores para estimar")
+    media = sum(valores) / n
+    if n == 1:
+        return IntervaloConfianza(media, 0.0, math.inf, 1, nivel)
+
+    varianza = sum((x - media) ** 2 for x in valores) / (n - 1)
+    desvio = math.sqrt(varianza)
+    semiamplitud = cuantil_t(1 - (1 - nivel) / 2, n - 1) * desvio / math.sqrt(n)
+    return IntervaloConfianza(media, desvio, semiamplitud, n, nivel)
+
+
+def intervalo_diferencia(
+    valores_a: Sequence[float], valores_b: Sequence[float], nivel: float = 0.95
+) -> IntervaloConfianza:
+    """Intervalo de confianza de Welch para media(B) - media(A) con muestras independientes"""
+    a = intervalo_confianza(valores_a, nivel)
+    b = intervalo_confianza(valores_b, nivel)
+    if a.n < 2 or b.n < 2:
+        return IntervaloConfianza(b.media - a.media, 0.0, math.inf, min(a.n, b.n), nivel)
+    varianza_a = a.desvio ** 2 / a.n
+    varianza_b = b.desvio ** 2 / b.n
+    error = math.sqrt(varianza_a + varianza_b)
+    if error == 0:
+        return IntervaloConfianza(b.media - a.media, 0.0, 0.0, min(a.n, b.n), nivel)
+    # Grados de libertad de Welch-Satterthwaite
+    grados = (varianza_a + varianza_b) ** 2 / (varianza_a ** 2 / (a.n - 1) + varianza_b ** 2 / (b.n - 1))
+    semiamplitud = cuantil_t(1 - (1 - nivel) / 2, max(int(grados), 1)) * error
+    return IntervaloConfianza(b.media - a.media, error, semiamplitud, min(a.n, b.n), nivel)
+
+
+@dataclass
+class PruebaKS:
+    """Prueba de Kolmogorov-Smirnov de dos muestras: ¿vienen de la misma distribución?"""
+    estadistico: float  # Máxima distancia entre las funciones de distribución empíricas
+    critico: float  # Valor crítico asintótico al nivel pedido
+
+    @property
+    def rechaza(self) -> bool:
+        return self.estadistico > self.critico
+
+
+def prueba_ks(valores_a: Sequence[float], valores_b: Sequence[float], nivel: float = 0.95) -> PruebaKS:
+    """Kolmogorov-Smirnov de dos muestras con el valor crítico asintótico
+    c(α)·sqrt((n + m) / (n·m)), c(α) = sqrt(-ln(α/2) / 2)"""
+    a = sorted(valores_a)
+    b = sorted(valores_b)
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        raise ValueError("No hay valores para comparar")
+    estadistico = 0.0
+    i = j = 0
+    while i < n and j < m:
+        x = min(a[i], b[j])
+        while i < n and a[i] == x:
+            i += 1
+        while j < m and b[j] == x:
+            j += 1
+        estadistico = max(estadistico, abs(i / n - j / m))
+    alfa = 1 - nivel
+    critico = math.sqrt(-math.log(alfa / 2) / 2) * math.sqrt((n + m) / (n * m))
+    return PruebaKS(estadistico, critico)
+
+
+class CuantilP2:
+    """Estimador online de un cuantil con el algoritmo P² (Jain & Chlamtac, 1985).
+
+    Mantiene 5 marcadores cuyas alturas se ajustan con interpolación parabólica:
+    memoria constante sin importar cuántas observaciones lleguen.
+    """
+
+    def __init__(self, p: float):
+        if not 0 < p < 1:
+            raise ValueError("El cuantil debe estar entre 0 y 1")
+        self.p = p
+        self._iniciales: List[float] = []
+        self.alturas: Optional[List[float]] = None
+        self.posiciones = [0, 1, 2, 3, 4]
+        self.posiciones_deseadas = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.incrementos = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def agregar(self, x: float):
+        if self.alturas is None:
+            self._iniciales.append(x)
+            if len(self._iniciales) == 5:
+                self.alturas = sorted(self._iniciales)
+                self._iniciales = []
+            return
+
+        q = self.alturas
+        n = self.posiciones
+
+        # Celda donde cae la observación (ajustando los extremos si hace falta)
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.posiciones_deseadas[i] += self.incrementos[i]
+
+        # Ajustar los marcadores centrales si se alejaron de su posición deseada
+        for i in (1, 2, 3):
+            d = self.posiciones_deseadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolica = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolica < q[i + 1]:
+                    q[i] = parabolica
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    @property
+    def valor(self) -> float:
+        """Estimación actual del cuantil (exacta mientras haya menos de 5 observaciones)"""
+        if self.alturas is not None:
+            return self.alturas[2]
+        if not self._iniciales:
+            return math.nan
+        ordenados = sorted(self._iniciales)
+        return ordenados[min(int(self.p * len(ordenados)), len(ordenados) - 1)]
+
+
+class EstadisticaOnline:
+    """Resumen de una serie en memoria constante: n, media, varianza, min, max y cuantiles"""
+
+    def __init__(self, cuantiles: Sequence[float] = ()):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0  # Suma de cuadrados de desvíos (Welford)
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.cuantiles: Dict[float, CuantilP2] = {p: CuantilP2(p) for p in cuantiles}
+
+    def agregar(self, x: float):
+        """Actualización de Welford: numéricamente estable y en O(1)"""
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (x - self.media)
+        if x < self.minimo:
+            self.minimo = x
+        if x > self.maximo:
+            self.maximo = x
+        for estimador in self.cuantiles.values():
+            estimador.agregar(x)
+
+    @property
+    def varianza(self) -> float:
+        """Varianza muestral (n - 1)"""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desvio(self) -> float:
+        return math.sqrt(self.varianza)
+
+    def cuantil(self, p: float) -> float:
+        return self.cuantiles[p].valor
+
+
+class AcumuladorTemporal:
+    """Promedio ponderado por tiempo de una variable de estado escalonada.
+
+    La variable cambia sólo en instantes discretos; cada cambio suma a la
+    integral el valor anterior por el tiempo que estuvo vigente. Actualizar
+    es O(1) y no se guarda ninguna serie de tiempo.
+    """
+
+    __slots__ = ('valor', 'tiempo_inicial', 'tiempo_ultimo_cambio', '_integral', 'maximo', 'minimo')
+
+    def __init__(self, valor_inicial: float = 0, tiempo_inicial: float = 0.0):
+        self.valor = valor_inicial
+        self.tiempo_inicial = tiempo_inicial
+        self.tiempo_ultimo_cambio = tiempo_inicial
+        self._integral = 0.0
+        self.maximo = valor_inicial
+        self.minimo = valor_inicial
+
+    def actualizar(self, tiempo: float, valor: float):
+        """Fija un nuevo valor a partir de `tiempo`"""
+        self._integral += self.valor * (tiempo - self.tiempo_ultimo_cambio)
+        self.tiempo_ultimo_cambio = tiempo
+        self.valor = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        if valor < self.minimo:
+            self.minimo = valor
+
+    def sumar(self, tiempo: float, delta: float):
+        """Suma `delta` al valor actual a partir de `tiempo`"""
+        valor = self.valor
+        self._integral += valor * (tiempo - self.tiempo_ultimo_cambio)
+        self.tiempo_ultimo_cambio = tiempo
+        valor += delta
+        self.valor = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        elif valor < self.minimo:
+            self.minimo = valor
+
+    def integral(self, tiempo: float) -> float:
+        """Área bajo la variable entre el tiempo inicial y `tiempo`"""
+        return self._integral + self.valor * (tiempo - self.tiempo_ultimo_cambio)
+
+    def reiniciar(self, tiempo: float):
+        """Descarta lo acumulado hasta `tiempo` (conserva el valor vigente)"""
+        self._integral = 0.0
+        self.tiempo_inicial = tiempo
+        self.tiempo_ultimo_cambio = tiempo
+        self.maximo = self.valor
+        self.minimo = self.valor
+
+    def cerrar_tramo(self, tiempo: float) -> Tuple[float, float, float]:
+        """(integral hasta `tiempo`, máximo, mínimo) del tramo que termina en `tiempo`.
+
+        Los extremos vuelven a empezar desde el valor vigente: mientras se cierran
+        tramos, `maximo`/`minimo` son los del tramo en curso, no los de toda la corrida.
+        """
+        tramo = (self.integral(tiempo), self.maximo, self.minimo)
+        self.maximo = self.valor
+        self.minimo = self.valor
+        return tramo
+
+    def descontar(self, tiempo: float, integral: float, maximo: float, minimo: float):
+        """Mide desde `tiempo` (ya pasado): resta la `integral` acumulada hasta ahí y
+        suma los extremos de los tramos cerrados desde entonces"""
+        self._integral -= integral
+        self.tiempo_inicial = tiempo
+        self.maximo = max(self.maximo, maximo)
+        self.minimo = min(self.minimo, minimo)
+
+    def media(self, tiempo: float) -> float:
+        """Promedio temporal entre el tiempo inicial y `tiempo`"""
+        duracion = tiempo - self.tiempo_inicial
+        if duracion <= 0:
+            return float(self.valor)
+        return self.integral(tiempo) / duracion
+
+
+def mser(valores: Sequence[float]) -> int:
+    """Punto de truncamiento MSER (White, 1997) de una serie.
+
+    Devuelve el d que minimiza el error estándar marginal
+        MSER(d) = Σ_{i>d} (y_i - ȳ_d)² / (n - d)²
+    recorriendo las sumas acumuladas desde el final en O(n).
+    """
+    n = len(valores)
+    if n < 2:
+        return 0
+    mejor_d = 0
+    mejor_valor = math.inf
+    suma = 0.0
+    suma_cuadrados = 0.0
+    for d in range(n - 1, -1, -1):
+        y = valores[d]
+        suma += y
+        suma_cuadrados += y * y
+        restantes = n - d
+        if restantes < 2:
+            continue
+        desvios = max(suma_cuadrados - suma * suma / restantes, 0.0)
+        valor = desvios / (restantes * restantes)
+        if valor <= mejor_valor:  # A igual valor, el menor truncamiento
+            mejor_valor = valor
+            mejor_d = d
+    return mejor_d
+
+
+class DetectorCalentamiento:
+    """Regla MSER-5 online sobre una o más series de salida.
+
+    Las observaciones (por ejemplo, ventas y utilización de cada día) se
+    agrupan en lotes de `tamano_lote` y sólo se guardan las medias de lote.
+    Con cada lote completo se recalcula el truncamiento de cada serie; el
+    calentamiento se da por terminado cuando, con al menos `lotes_minimos`
+    lotes, el truncamiento de todas las series cae en la primera mitad de los
+    datos (si cae más tarde, todavía no hay suficientes datos en régimen).
+    Con `lotes_maximos` lotes sin decidir, el detector abandona: la serie no
+    se estabiliza en ese horizonte y no se trunca nada.
+    """
+
+    def __init__(
+        self, series: Sequence[str], tamano_lote: int = 5, lotes_minimos: int = 10, lotes_maximos: Optional[int] = None,
+    ):
+        self.series = tuple(series)
+        self.tamano_lote = tamano_lote
+        self.lotes_minimos = lotes_minimos
+        self.lotes_maximos = lotes_maximos
+        self.abandonado = False
+        self.medias_lote: Dict[str, List[float]] = {nombre: [] for nombre in self.series}
+        self._sumas_lote = dict.fromkeys(self.series, 0.0)
+        self.observaciones = 0
+        self.truncamiento: Optional[int] = None  # En observaciones, una vez detectado
+
+    @property
+    def detectado(self) -> bool:
+        return self.truncamiento is not None
+
+    @property
+    def decidido(self) -> bool:
+        """Ya no recibe observaciones: detectó el fin del calentamiento o abandonó"""
+        return self.detectado or self.abandonado
+
+    def agregar(self, observacion: Dict[str, float]) -> bool:
+        """Agrega una observación de cada serie; devuelve True en la que detecta el fin del calentamiento"""
+        if self.decidido:
+            return False
+        for nombre in self.series:
+            self._sumas_lote[nombre] += observacion[nombre]
+        self.observaciones += 1
+        if self.observaciones % self.tamano_lote:
+            return False
+
+        for nombre in self.series:
+            self.medias_lote[nombre].append(self._sumas_lote[nombre] / self.tamano_lote)
+            self._sumas_lote[nombre] = 0.0
+
+        lotes = self.observaciones // self.tamano_lote
+        if lotes < self.lotes_minimos:
+            return False
+        truncamientos = [mser(self.medias_lote[nombre]) for nombre in self.series]
+        if max(truncamientos) > lotes // 2:
+            if self.lotes_maximos is not None and lotes >= self.lotes_maximos:
+                self.abandonado = True
+                self.medias_lote = {nombre: [] for nombre in self.series}
+            return False
+        self.truncamiento = max(truncamientos) * self.tamano_lote
+        return True
@@ -0,0 +1,137 @@
+"""
+Flujos de números aleatorios para la simulación inmobiliaria.
+
+Cada proceso estocástico (llegada de visitas, elección de propiedad, venta,
+arrepentimiento, re-engagement, ...) tiene su propio flujo con su propia semilla.
+Así, cambiar un parámetro no desplaza los números que consumen los demás
+procesos: es la base de los números aleatorios comunes (CRN) entre
+configuraciones.
+Los valores se generan con NumPy en bloques y se sirven uno a uno desde un
+buffer, de modo que el costo de generar cada variable se amortiza en el bloque.
+"""
+from typing import Dict, Iterator, Sequence
+
+import numpy as np
+
+TAMANO_BLOQUE = 4096
+
+# Orden fijo de los flujos: agregar nombres SIEMPRE al final para no cambiar las semillas existentes
+NOMBRES_FLUJOS = (
+    'visitas',
+    'fuera_horario',
+    'apertura',
+    'propiedades',
+    'venta',
+    'arrepentimiento',
+    'reengagement',
+)
+
+
+class FlujoAleatorio:
+    """Flujo de uniformes U(0, 1) servidas desde un bloque pre-generado"""
+
+    def __init__(self, semilla, tamano_bloque: int = TAMANO_BLOQUE):
+        self.generador = np.random.default_rng(semilla)
+        self.tamano_bloque = tamano_bloque
+        self._buffer: Iterator = iter(())
+
+    def _generar_bloque(self) -> np.ndarray:
+        return self.generador.random(self.tamano_bloque)
+
+    def siguiente(self):
+        """Devuelve el próximo valor del flujo (recarga el bloque si se agotó)"""
+        try:
+            return next(self._buffer)
+        except StopIteration:
+            # tolist() convierte a floats de Python: servirlos es más barato que indexar el array
+            self._buffer = iter(self._generar_bloque().tolist())
+            return next(self._buffer)
+
+
+class FlujoTriangular(FlujoAleatorio):
+    """Inverse sampling vectorizado de la distribución Triangular(a, m, b)"""
+
+    def __init__(self, semilla, a: float, m: float, b: float, tamano_bloque: int = TAMANO_BLOQUE):
+        super().__init__(semilla, tamano_bloque)
+        self.a = a
+        self.m = m
+        self.b = b
+        self.c = (m - a) / (b - a)
+
+    def _generar_bloque(self) -> np.ndarray:
+        u = self.generador.random(self.tamano_bloque)
+        a, m, b = self.a, self.m, self.b
+        # Primera rama: [a, m] si U <= c; segunda rama: [m, b] si U > c
+        return np.where(
+            u <= self.c,
+            a + np.sqrt(u * (b - a) * (m - a)),
+            b - np.sqrt((1 - u) * (b - a) * (b - m)),
+        )
+
+
+class FlujoBernoulli(FlujoAleatorio):
+    """Ensayos Bernoulli(p) con p fijo: devuelve True/False"""
+
+    def __init__(self, semilla, p: float, tamano_bloque: int = TAMANO_BLOQUE):
+        super().__init__(semilla, tamano_bloque)
+        self.p = p
+
+    def _generar_bloque(self) -> np.ndarray:
+        return self.generador.random(self.tamano_bloque) < self.p
+
+
+class FlujoNormal(FlujoAleatorio):
+    """Normales estándar N(0, 1)"""
+
+    def _generar_bloque(self) -> np.ndarray:
+        return self.generador.standard_normal(self.tamano_bloque)
+
+
+def derivar_semillas(semilla, nombres: Sequence[str] = NOMBRES_FLUJOS) -> Dict[str, np.random.SeedSequence]:
+    """Deriva una semilla independiente por flujo a partir de la semilla de la corrida.
+
+    `semilla` puede ser None (entropía del sistema), un entero o un SeedSequence
+    (por ejemplo, el de una réplica).
+    """
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    # Las mismas hijas que semilla.spawn() sin avanzar su contador: la misma config
+    # (p. ej. la de una oficina de red_oficinas) se puede correr varias veces con igual resultado
+    hijas = [
+        np.random.SeedSequence(semilla.entropy, spawn_key=semilla.spawn_key + (i,), pool_size=semilla.pool_size)
+        for i in range(len(nombres))
+    ]
+    return dict(zip(nombres, hijas))
+
+
+def crear_flujos(config: Dict, semilla=None) -> Dict[str, FlujoAleatorio]:
+    """Crea los flujos de la simulación a partir de la configuración.
+
+    `config['semillas_flujos']` permite fijar la semilla de flujos puntuales
+    ({'venta': 123, ...}); el resto se deriva de `semilla`.
+    """
+    semillas = derivar_semillas(semilla)
+    for nombre, semilla_flujo in config.get('semillas_flujos', {}).items():
+        if nombre not in semillas:
+            raise ValueError(f"Flujo aleatorio desconocido: {nombre}")
+        semillas[nombre] = semilla_flujo
+    tamano_bloque = config.get('tamano_bloque_aleatorio', TAMANO_BLOQUE)
+
+    flujos = {
+        'fuera_horario': FlujoNormal(semillas['fuera_horario'], tamano_bloque),
+        'apertura': FlujoAleatorio(semillas['apertura'], tamano_bloque),
+        'propiedades': FlujoAleatorio(semillas['propiedades'], tamano_bloque),
+        'venta': FlujoBernoulli(semillas['venta'], config['probabilidad_venta'], tamano_bloque),
+        'arrepentimiento': FlujoBernoulli(semillas['arrepentimiento'], config['probabilidad_arrepentimiento'], tamano_bloque),
+        'reengagement': FlujoAleatorio(semillas['reengagement'], tamano_bloque),
+    }
+
+    if config.get('usar_distribucion_visitas', False):
+        c = config.get('dist_c', 0.11683330812731067)
+        loc = config.get('dist_loc', 169.04207586301385)
+        scale = config.get('dist_scale', 30433.163765426078)
+        flujos['visitas'] = FlujoTriangular(semillas['visitas'], loc, loc + c * scale, loc + scale, tamano_bloque)
+    else:
+        flujos['visitas'] = FlujoAleatorio(semillas['visitas'], tamano_bloque)
+
+    return flujos
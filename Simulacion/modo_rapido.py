@@ -0,0 +1,677 @@
+"""
+Modo rápido aproximado (tau-leaping) para barridos de capacidad en horizontes largos.
+
+Con probabilidad_venta = 0.07, ~93% de las visitas sólo bloquean a un agente
+durante tiempo_atencion_visitas y lo liberan. El modo rápido no simula esas
+visitas una por una:
+
+- La jornada avanza en saltos de `paso_tau_minutos`. En cada salto se sortea
+  cuántas visitas llegan (aproximación normal del proceso de renovación, la
+  misma que usa el motor exacto para contar el horario cerrado) y se atienden
+  tantas como agentes libres haya; el resto se pierde.
+- Los agentes que atienden visitas son un pool anónimo. Las visitas de un
+  salto forman una cohorte que se libera entera al terminar la visita: como la
+  duración es fija, la liberación no es aleatoria, y el paso se ajusta para
+  que caiga justo en un salto.
+- Al liberarse una cohorte de M visitas, las ventas salen de una
+  Binomial(M, p). Sólo ellas siguen evento por evento (papeles,
+  renegociación, verificación, escribanía) con un agente identificado, que
+  respeta el límite de propiedades en verificación y la cola de escribanías.
+- Las visitas que recibe cada propiedad no se cuentan una por una: se acumula
+  la intensidad de visitas por propiedad y, al vender, la cantidad sale de una
+  Poisson con la intensidad acumulada desde que se publicó.
+
+Aproximaciones respecto del motor exacto (medirlas con
+`replicaciones.validar_modo_rapido` antes de confiar en un barrido):
+- las visitas de un salto empiezan todas al inicio del salto
+- la utilización por visitas se reparte por igual entre los agentes (la
+  asignación equitativa del motor exacto la empareja)
+- el agente de cada venta se elige al azar entre los que no están en gestión
+
+Las etapas cuentan gestiones (cada visita y cada venta en curso) y espera y
+gestión cuentan propiedades, igual que el motor exacto. Las visitas son
+anónimas: cada una cuenta como una propiedad más en gestión hasta que una
+venta la asigna a su propiedad (si ésta ya tenía otra gestión abierta, se
+descuenta). Una visita sin venta a una propiedad que ya estaba en gestión se
+cuenta dos veces mientras dura (~2% de las visitas).
+
+Mientras el motor exacto pisaba la etapa de una venta con la de una nueva
+visita a la misma propiedad, daba ~20% menos que este modo en
+etapa_verificacion y propiedades_en_gestion (~117-124 contra ~143 con la
+misma semilla). Corregido eso coinciden, y `validar_modo_rapido` contrasta
+también esas columnas.
+
+No soporta números aleatorios comunes, checkpoints, traza, perfilado ni
+detección de calentamiento (esas claves de la configuración se ignoran).
+"""
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cola_eventos import (
+    crear_cola_eventos, VISITA, FIN_VISITA, FIN_GESTION_PAPELES, RENEGOCIACION, FIN_VERIFICACION, FIN_ESCRIBANIA,
+)
+from estadisticas import AcumuladorTemporal, EstadisticaOnline
+from flujos_aleatorios import FlujoAleatorio, FlujoBernoulli, FlujoNormal, derivar_semillas
+from remax_corregido_optimizado import CODIGOS_DEMORA_CONSTANTE, ETAPAS, IndicePropiedadesActivas
+from resultados import (
+    ResultadoAgente, ResultadoSimulacion, ResumenSerie, formatear_dias_horas, imprimir_reporte,
+)
+
+# Flujos propios del modo rápido (mismo criterio que NOMBRES_FLUJOS: agregar SIEMPRE al final)
+NOMBRES_FLUJOS_RAPIDOS = (
+    'llegadas',
+    'fuera_horario',
+    'ventas',
+    'agentes',
+    'propiedades',
+    'arrepentimiento',
+    'reengagement',
+    'visitas_propiedad',
+)
+
+
+class PropiedadRapida:
+    """Propiedad del modo rápido: sólo lo que se consulta durante la venta"""
+    __slots__ = (
+        'id', 'visitas_al_publicar', 'tiempo_creacion', 'tiempo_ultima_visita_agente', 'atendidas_a_la_ultima_visita',
+        'contador_renegociaciones', 'gestiones_abiertas',
+    )
+
+    def __init__(self, id_propiedad: int, visitas_al_publicar: float, tiempo_creacion: float):
+        self.id = id_propiedad
+        self.visitas_al_publicar = visitas_al_publicar  # Intensidad acumulada de visitas por propiedad al publicarse
+        self.tiempo_creacion = tiempo_creacion
+        self.tiempo_ultima_visita_agente = tiempo_creacion
+        self.atendidas_a_la_ultima_visita = 0.0  # Intensidad de visitas atendidas en la visita con venta
+        self.contador_renegociaciones = 0
+        self.gestiones_abiertas = 0  # Ventas en curso sobre esta propiedad
+
+
+class SimulacionRapida:
+    """Simulación aproximada: visitas por saltos y cohortes, ventas evento por evento.
+
+    Misma configuración y mismo `ResultadoSimulacion` que SimulacionInmobiliaria,
+    así que se puede usar en su lugar en réplicas y barridos (clave 'modo_rapido').
+    """
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.num_agentes = config['num_agentes']
+        self.num_propiedades_activas = config['num_propiedades_activas']
+        self.max_renegociaciones = config['max_renegociaciones']
+
+        self.prob_venta = config['probabilidad_venta']
+        self.prob_base_reengagement = config['probabilidad_base_reengagement']
+        self.penalizacion_reengagement = config['penalizacion_reengagement']
+
+        self.tiempo_atencion_visitas = config['tiempo_atencion_visitas'] + config['tiempo_primer_contacto']
+        self.tiempo_gestion_papeles = config['tiempo_gestion_papeles'] + config['tiempo_gestion_ofertas']
+        self.tiempo_gestion_verificacion = config['tiempo_gestion_verificacion']
+        self.tiempo_gestion_escribania = config['tiempo_gestion_escribania']
+        self.tiempo_gestion_renegociacion = config['tiempo_gestion_renegociacion']
+        self.max_propiedades_verificacion_por_agente = config.get('max_propiedades_verificacion_por_agente', 3)
+        self.mantener_propiedades_constante = config.get('mantener_propiedades_constante', True)
+
+        self.usar_jornada_laboral = config.get('usar_jornada_laboral', False)
+        if self.usar_jornada_laboral:
+            self.hora_inicio_jornada = config.get('hora_inicio_jornada', 9) * 60
+            self.hora_fin_jornada = config.get('hora_fin_jornada', 18) * 60
+
+        # Proceso de llegadas: media y varianza del tiempo entre visitas
+        self.usar_distribucion = config.get('usar_distribucion_visitas', False)
+        if self.usar_distribucion:
+            c = config.get('dist_c', 0.11683330812731067)
+            a = config.get('dist_loc', 169.04207586301385)
+            b = a + config.get('dist_scale', 30433.163765426078)
+            m = a + c * (b - a)
+            self.tiempo_entre_visitas = (a + m + b) / 3
+            self.varianza_entre_visitas = (a ** 2 + b ** 2 + m ** 2 - a * b - a * m - b * m) / 18
+        else:
+            self.tiempo_entre_visitas = config['tiempo_entre_visitas']
+            self.varianza_entre_visitas = 0
+        self.proxima_llegada = self.tiempo_entre_visitas  # Fase de las llegadas con tiempo fijo
+
+        # ✅ Paso ajustado para que una visita dure exactamente `pasos_por_visita` saltos
+        paso_pedido = config.get('paso_tau_minutos', 30)
+        self.pasos_por_visita = max(1, math.ceil(self.tiempo_atencion_visitas / paso_pedido))
+        self.paso = self.tiempo_atencion_visitas / self.pasos_por_visita
+
+        self.semilla = config.get('semilla')
+        semillas = derivar_semillas(self.semilla, NOMBRES_FLUJOS_RAPIDOS)
+        self.flujo_llegadas = FlujoNormal(semillas['llegadas'])
+        self.flujo_fuera_horario = FlujoNormal(semillas['fuera_horario'])
+        self.generador_ventas = np.random.default_rng(semillas['ventas'])
+        self.siguiente_u_agente = FlujoAleatorio(semillas['agentes']).siguiente
+        self.siguiente_u_propiedad = FlujoAleatorio(semillas['propiedades']).siguiente
+        self.siguiente_arrepentimiento = FlujoBernoulli(semillas['arrepentimiento'], config['probabilidad_arrepentimiento']).siguiente
+        self.siguiente_u_reengagement = FlujoAleatorio(semillas['reengagement']).siguiente
+        self.generador_visitas_propiedad = np.random.default_rng(semillas['visitas_propiedad'])
+
+        # Pool de agentes: los libres y los que están en visita son anónimos
+        self.agentes_libres = self.num_agentes
+        self.cohortes: Deque[Tuple[float, int]] = deque()  # (tiempo de liberación, visitas) en orden de liberación
+        self.visitas_atendidas = 0
+
+        # Agentes en gestión de una venta (bloqueados, identificados)
+        k = self.num_agentes
+        self.en_gestion = [False] * k
+        self.inicio_gestion: List[Optional[float]] = [None] * k
+        self.tiempo_gestion = [0.0] * k
+        self.tareas_gestion = [0] * k
+        self.propiedades_en_verificacion = [0] * k
+        self.escribanias_pendientes: List[Deque[int]] = [deque() for _ in range(k)]
+        self.agentes_en_gestion = 0
+        # Escribanías cuyo agente estaba en el pool sin lugar libre: esperan la próxima liberación
+        self.escribanias_en_espera: Deque[Tuple[int, int]] = deque()
+
+        self.visitas_por_propiedad = 0.0  # Intensidad acumulada: visitas / propiedades activas
+        self.atendidas_por_propiedad = 0.0  # Ídem, sólo las visitas que consiguieron agente
+        self.propiedades_activas = IndicePropiedadesActivas()
+        for i in range(self.num_propiedades_activas):
+            self.propiedades_activas[i] = PropiedadRapida(i, 0.0, 0)
+        self.proximo_id_propiedad = self.num_propiedades_activas
+        self.propiedades_creadas_nuevas = 0
+
+        self.tiempo_actual = 0
+        self.tiempo_total_minutos = 0
+        self.origen_jornada = 0  # Inicio del período abierto en curso (los saltos se miden desde acá)
+        self.cierre_jornada = math.inf
+        self.total_ventas = 0
+        self.ventas_perdidas = 0
+        self.visitas_perdidas = 0
+        self.visitas_perdidas_fuera_horario = 0
+        self.visitas_sin_venta = 0
+        self.total_visitas_generadas = 0
+        self.ventas_ganadas_por_re_engagement = 0
+        self.visitas_perdidas_por_limite_verificacion = 0
+        self.eventos = crear_cola_eventos(config.get('cola_eventos', 'heap'), CODIGOS_DEMORA_CONSTANTE)
+        self.eventos_procesados = 0
+        self.saltos = 0  # Saltos procesados dentro del bucle, sin pasar por la cola
+        self.eventos_por_segundo = 0.0
+        self.segundos_bucle = 0.0
+
+        self.estadistica_tiempo_venta = EstadisticaOnline(cuantiles=(0.5, 0.9))
+        self.estadistica_visitas_por_venta = EstadisticaOnline()
+        self.estado_propiedades_activas = AcumuladorTemporal(len(self.propiedades_activas))
+        self.estado_propiedades_en_espera = AcumuladorTemporal(len(self.propiedades_activas))
+        self.estado_propiedades_en_gestion = AcumuladorTemporal()
+        self.estado_etapas = {etapa: AcumuladorTemporal() for etapa in ETAPAS}
+        self.estado_agentes_ocupados = AcumuladorTemporal()
+
+    # ------------------------------------------------------------------
+    # Llegadas
+    # ------------------------------------------------------------------
+    def contar_llegadas(self, desde: float, hasta: float, flujo_normal: FlujoNormal) -> int:
+        """Visitas que llegan en [desde, hasta).
+
+        Con tiempo fijo la cuenta es exacta y conserva la fase; con distribución,
+        N(L) ~ Normal(L/μ, L·σ²/μ³) como en `saltar_periodo_cerrado`.
+        """
+        longitud = hasta - desde
+        if longitud <= 0:
+            return 0
+        if self.usar_distribucion:
+            media = longitud / self.tiempo_entre_visitas
+            desvio = math.sqrt(longitud * self.varianza_entre_visitas / self.tiempo_entre_visitas ** 3)
+            return max(0, round(media + desvio * flujo_normal.siguiente()))
+        if self.proxima_llegada >= hasta:
+            return 0
+        llegadas = math.ceil((hasta - self.proxima_llegada) / self.tiempo_entre_visitas)
+        self.proxima_llegada += llegadas * self.tiempo_entre_visitas
+        return llegadas
+
+    def programar_primer_salto(self):
+        """Primer salto: ya mismo, o en la primera apertura contando en bloque lo que llega antes"""
+        if not self.usar_jornada_laboral:
+            self.origen_jornada = 0
+            self.cierre_jornada = math.inf
+            self.eventos.programar(0, VISITA, 0)
+            return
+        apertura = self.hora_inicio_jornada
+        self.contar_fuera_horario(0, min(apertura, self.tiempo_total_minutos))
+        self.abrir_jornada(apertura)
+
+    def abrir_jornada(self, apertura: float):
+        """Programa el primer salto del período abierto que empieza en `apertura`"""
+        self.origen_jornada = apertura
+        self.cierre_jornada = apertura + self.hora_fin_jornada - self.hora_inicio_jornada
+        if apertura < self.tiempo_total_minutos:
+            self.eventos.programar(apertura, VISITA, 0)
+
+    def contar_fuera_horario(self, desde: float, hasta: float):
+        perdidas = self.contar_llegadas(desde, hasta, self.flujo_fuera_horario)
+        self.total_visitas_generadas += perdidas
+        self.visitas_perdidas_fuera_horario += perdidas
+
+    def procesar_salto(self, indice: int, _):
+        """Evento VISITA del modo rápido: procesa saltos seguidos hasta que haya otro evento antes.
+
+        Los saltos del período abierto corren en este bucle sin pasar por la cola
+        de eventos; se cede el control (reprogramando el salto) cuando un evento
+        de gestión cae antes del próximo salto, o al cerrar la jornada.
+        """
+        eventos = self.eventos
+        cohortes = self.cohortes
+        tiempo_total = self.tiempo_total_minutos
+        paso = self.paso
+        tiempo = self.tiempo_actual
+        while True:
+            while cohortes and cohortes[0][0] <= tiempo:
+                self.liberar_cohorte(cohortes.popleft()[1])
+            if self.escribanias_en_espera:
+                self.atender_escribanias_en_espera()
+
+            fin = min(self.origen_jornada + (indice + 1) * paso, self.cierre_jornada, tiempo_total)
+            llegadas = self.contar_llegadas(tiempo, fin, self.flujo_llegadas)
+            if llegadas:
+                self.atender_llegadas(llegadas, self.origen_jornada + (indice + self.pasos_por_visita) * paso)
+
+            if fin >= self.cierre_jornada or fin >= tiempo_total:
+                self.cerrar_jornada(fin)
+                return
+            indice += 1
+            if eventos and eventos.proximo_tiempo() <= fin:
+                eventos.programar(fin, VISITA, indice)
+                return
+            tiempo = self.tiempo_actual = fin
+            self.saltos += 1
+
+    def atender_llegadas(self, llegadas: int, tiempo_liberacion: float):
+        """Las llegadas de un salto toman agentes libres; las que no consiguen se pierden"""
+        self.total_visitas_generadas += llegadas
+        if not self.propiedades_activas:
+            self.visitas_perdidas += llegadas
+            return
+        self.visitas_por_propiedad += llegadas / len(self.propiedades_activas)
+        atendidas = min(llegadas, self.agentes_libres)
+        self.visitas_perdidas += llegadas - atendidas
+        if atendidas:
+            self.atendidas_por_propiedad += atendidas / len(self.propiedades_activas)
+            self.agentes_libres -= atendidas
+            self.visitas_atendidas += atendidas
+            self.estado_agentes_ocupados.sumar(self.tiempo_actual, atendidas)
+            self.mover_etapa(None, 'visita', atendidas)
+            self.cohortes.append((tiempo_liberacion, atendidas))
+
+    def cerrar_jornada(self, cierre: float):
+        """Las cohortes pendientes pasan a la cola de eventos y el horario cerrado se cuenta en bloque"""
+        while self.cohortes:
+            tiempo_liberacion, atendidas = self.cohortes.popleft()
+            self.eventos.programar(tiempo_liberacion, FIN_VISITA, atendidas)
+        if cierre >= self.tiempo_total_minutos or not self.usar_jornada_laboral:
+            return
+        apertura = cierre - cierre % 1440 + self.hora_inicio_jornada
+        if apertura <= cierre:
+            apertura += 1440
+        self.contar_fuera_horario(cierre, min(apertura, self.tiempo_total_minutos))
+        self.abrir_jornada(apertura)
+
+    def procesar_fin_cohorte(self, atendidas: int, _):
+        """Evento FIN_VISITA del modo rápido: una cohorte que termina fuera del bucle de saltos"""
+        self.liberar_cohorte(atendidas)
+        if self.escribanias_en_espera:
+            self.atender_escribanias_en_espera()
+
+    def liberar_cohorte(self, atendidas: int):
+        """Fin de M visitas: Binomial(M, p) ventas siguen en gestión, el resto vuelve al pool"""
+        ventas = self.generador_ventas.binomial(atendidas, self.prob_venta)
+        aceptadas = 0
+        for _ in range(ventas):
+            if self.iniciar_venta():
+                aceptadas += 1
+        sin_venta = atendidas - aceptadas
+        self.visitas_sin_venta += sin_venta
+        self.mover_etapa('visita', None, sin_venta)
+        self.agentes_libres += sin_venta
+        self.estado_agentes_ocupados.sumar(self.tiempo_actual, -sin_venta)
+
+    # ------------------------------------------------------------------
+    # Gestión de las ventas (evento por evento, como el motor exacto)
+    # ------------------------------------------------------------------
+    def iniciar_venta(self) -> bool:
+        """Una visita con venta: agente al azar entre los que no están en gestión; False si se rechaza"""
+        k = self.num_agentes
+        en_gestion = self.en_gestion
+        agente_id = int(self.siguiente_u_agente() * k)
+        while en_gestion[agente_id]:
+            agente_id = int(self.siguiente_u_agente() * k)
+
+        if self.propiedades_en_verificacion[agente_id] >= self.max_propiedades_verificacion_por_agente:
+            self.visitas_perdidas_por_limite_verificacion += 1
+            return False
+        if not self.propiedades_activas:
+            return False
+
+        propiedad = self.propiedades_activas.elegir_aleatoria(self.siguiente_u_propiedad())
+        propiedad.tiempo_ultima_visita_agente = self.tiempo_actual - self.tiempo_atencion_visitas
+        propiedad.atendidas_a_la_ultima_visita = self.atendidas_por_propiedad
+        # El agente pasa de la visita a la gestión sin liberarse (agentes ocupados no cambia)
+        en_gestion[agente_id] = True
+        self.inicio_gestion[agente_id] = self.tiempo_actual
+        self.agentes_en_gestion += 1
+        self.mover_etapa('visita', 'papeles')
+        propiedad.gestiones_abiertas += 1
+        if propiedad.gestiones_abiertas > 1:
+            # La visita anónima se había contado como otra propiedad en gestión
+            self.estado_propiedades_en_espera.sumar(self.tiempo_actual, 1)
+            self.estado_propiedades_en_gestion.sumar(self.tiempo_actual, -1)
+        self.eventos.programar(self.tiempo_actual + self.tiempo_gestion_papeles, FIN_GESTION_PAPELES, propiedad.id, agente_id)
+        return True
+
+    def procesar_fin_gestion_papeles(self, propiedad_id: int, agente_id: int):
+        if propiedad_id not in self.propiedades_activas:
+            self.descartar_etapa('papeles')
+            self.liberar_agente(agente_id)
+            return
+        if self.siguiente_arrepentimiento():
+            self.mover_etapa('papeles', 'renegociacion')
+            self.eventos.programar(self.tiempo_actual + self.tiempo_gestion_renegociacion, RENEGOCIACION, propiedad_id, agente_id)
+            return
+        self.liberar_agente(agente_id)
+        self.iniciar_verificacion(propiedad_id, agente_id, 'papeles')
+
+    def procesar_renegociacion(self, propiedad_id: int, agente_id: int):
+        propiedad = self.propiedades_activas.get(propiedad_id)
+        if propiedad is None:
+            self.descartar_etapa('renegociacion')
+            self.liberar_agente(agente_id)
+            return
+        convencido = False
+        if propiedad.contador_renegociaciones < self.max_renegociaciones:
+            prob_convencimiento = max(0.1, self.prob_base_reengagement -
+                                      propiedad.contador_renegociaciones * self.penalizacion_reengagement)
+            convencido = self.siguiente_u_reengagement() < prob_convencimiento
+        self.liberar_agente(agente_id)
+        if convencido:
+            propiedad.contador_renegociaciones += 1
+            self.ventas_ganadas_por_re_engagement += 1
+            self.iniciar_verificacion(propiedad_id, agente_id, 'renegociacion')
+        else:
+            self.ventas_perdidas += 1
+            self.cerrar_gestion(propiedad, 'renegociacion')
+
+    def iniciar_verificacion(self, propiedad_id: int, agente_id: int, etapa_anterior: str):
+        """Verificación no bloqueante: cuenta para el límite del agente"""
+        self.propiedades_en_verificacion[agente_id] += 1
+        self.mover_etapa(etapa_anterior, 'verificacion')
+        self.eventos.programar(self.tiempo_actual + self.tiempo_gestion_verificacion, FIN_VERIFICACION, propiedad_id, agente_id)
+
+    def procesar_fin_verificacion(self, propiedad_id: int, agente_id: int):
+        self.propiedades_en_verificacion[agente_id] -= 1
+        if propiedad_id not in self.propiedades_activas:
+            self.descartar_etapa('verificacion')
+            return
+        if self.en_gestion[agente_id]:
+            # Ocupado en otra gestión: la escribanía arranca cuando se libere
+            self.escribanias_pendientes[agente_id].append(propiedad_id)
+            self.mover_etapa('verificacion', 'espera_escribania')
+        elif self.agentes_libres:
+            self.tomar_agente_del_pool(agente_id)
+            self.iniciar_escribania(propiedad_id, agente_id, 'verificacion')
+        else:
+            # En el pool pero sin lugar libre: espera la próxima liberación
+            self.escribanias_en_espera.append((propiedad_id, agente_id))
+            self.mover_etapa('verificacion', 'espera_escribania')
+
+    def iniciar_escribania(self, propiedad_id: int, agente_id: int, etapa_anterior: str):
+        """El agente (ya marcado en gestión) queda bloqueado por la escribanía"""
+        self.inicio_gestion[agente_id] = self.tiempo_actual
+        self.tareas_gestion[agente_id] += 1
+        self.mover_etapa(etapa_anterior, 'escribania')
+        self.eventos.programar(self.tiempo_actual + self.tiempo_gestion_escribania, FIN_ESCRIBANIA, propiedad_id, agente_id)
+
+    def procesar_fin_escribania(self, propiedad_id: int, agente_id: int):
+        propiedad = self.propiedades_activas.get(propiedad_id)
+        if propiedad is None:
+            # Otra gestión de la misma propiedad ya la vendió
+            self.descartar_etapa('escribania')
+            self.liberar_agente(agente_id)
+            return
+
+        tiempo = self.tiempo_actual
+        self.total_ventas += 1
+        self.estadistica_tiempo_venta.agregar(tiempo - self.tiempo_ultima_visita(propiedad))
+        # La visita con venta más las que recibió desde que se publicó
+        intensidad = max(self.visitas_por_propiedad - propiedad.visitas_al_publicar, 0.0)
+        self.estadistica_visitas_por_venta.agregar(1 + int(self.generador_visitas_propiedad.poisson(intensidad)))
+
+        # La propiedad sale de N(t) desde gestión; sus otras gestiones abiertas se descartan al terminar
+        self.estado_etapas['escribania'].sumar(tiempo, -1)
+        del self.propiedades_activas[propiedad_id]
+        self.estado_propiedades_activas.sumar(tiempo, -1)
+        self.estado_propiedades_en_gestion.sumar(tiempo, -1)
+        if self.mantener_propiedades_constante:
+            self.crear_nueva_propiedad()
+        self.liberar_agente(agente_id)
+
+    def tiempo_ultima_visita(self, propiedad: PropiedadRapida) -> float:
+        """Inicio de la última visita atendida de la propiedad.
+
+        Como en el motor exacto, una visita atendida durante la gestión pisa el
+        tiempo de la visita con venta. Las K visitas posteriores son Poisson
+        con la intensidad acumulada desde la venta; la última está en la
+        fracción U^(1/K) del intervalo (máximo de K uniformes), interpolando
+        la intensidad como lineal en el tiempo.
+        """
+        inicio = propiedad.tiempo_ultima_visita_agente
+        intensidad = self.atendidas_por_propiedad - propiedad.atendidas_a_la_ultima_visita
+        if intensidad <= 0:
+            return inicio
+        generador = self.generador_visitas_propiedad
+        posteriores = generador.poisson(intensidad)
+        if not posteriores:
+            return inicio
+        return inicio + (self.tiempo_actual - inicio) * generador.random() ** (1 / posteriores)
+
+    def crear_nueva_propiedad(self):
+        """Reposición automática"""
+        nueva = PropiedadRapida(self.proximo_id_propiedad, self.visitas_por_propiedad, self.tiempo_actual)
+        self.propiedades_activas[nueva.id] = nueva
+        self.proximo_id_propiedad += 1
+        self.propiedades_creadas_nuevas += 1
+        self.estado_propiedades_activas.sumar(self.tiempo_actual, 1)
+        self.estado_propiedades_en_espera.sumar(self.tiempo_actual, 1)
+
+    # ------------------------------------------------------------------
+    # Agentes y etapas
+    # ------------------------------------------------------------------
+    def tomar_agente_del_pool(self, agente_id: int):
+        """Un agente libre del pool pasa a gestión con identidad `agente_id`"""
+        self.agentes_libres -= 1
+        self.en_gestion[agente_id] = True
+        self.agentes_en_gestion += 1
+        self.estado_agentes_ocupados.sumar(self.tiempo_actual, 1)
+
+    def liberar_agente(self, agente_id: int):
+        """Fin de un bloqueo de gestión: sigue con su escribanía pendiente o vuelve al pool"""
+        self.tiempo_gestion[agente_id] += self.tiempo_actual - self.inicio_gestion[agente_id]
+        self.inicio_gestion[agente_id] = None
+        pendientes = self.escribanias_pendientes[agente_id]
+        while pendientes:
+            propiedad_id = pendientes.popleft()
+            if propiedad_id in self.propiedades_activas:
+                self.iniciar_escribania(propiedad_id, agente_id, 'espera_escribania')
+                return
+            self.descartar_etapa('espera_escribania')
+
+        self.en_gestion[agente_id] = False
+        self.agentes_en_gestion -= 1
+        self.agentes_libres += 1
+        self.estado_agentes_ocupados.sumar(self.tiempo_actual, -1)
+        if self.escribanias_en_espera:
+            self.atender_escribanias_en_espera()
+
+    def atender_escribanias_en_espera(self):
+        """Las escribanías en espera tienen prioridad sobre las visitas por los agentes libres"""
+        espera = self.escribanias_en_espera
+        while espera and self.agentes_libres:
+            propiedad_id, agente_id = espera.popleft()
+            if propiedad_id not in self.propiedades_activas:
+                self.descartar_etapa('espera_escribania')
+            elif self.en_gestion[agente_id]:
+                self.escribanias_pendientes[agente_id].append(propiedad_id)
+            else:
+                self.tomar_agente_del_pool(agente_id)
+                self.iniciar_escribania(propiedad_id, agente_id, 'espera_escribania')
+
+    def mover_etapa(self, anterior: Optional[str], nueva: Optional[str], cantidad: int = 1):
+        """Mueve `cantidad` gestiones entre etapas (None = en espera; sólo para las visitas anónimas)"""
+        if not cantidad:
+            return
+        tiempo = self.tiempo_actual
+        if anterior is not None:
+            self.estado_etapas[anterior].sumar(tiempo, -cantidad)
+        else:
+            self.estado_propiedades_en_espera.sumar(tiempo, -cantidad)
+            self.estado_propiedades_en_gestion.sumar(tiempo, cantidad)
+        if nueva is not None:
+            self.estado_etapas[nueva].sumar(tiempo, cantidad)
+        else:
+            self.estado_propiedades_en_espera.sumar(tiempo, cantidad)
+            self.estado_propiedades_en_gestion.sumar(tiempo, -cantidad)
+
+    def cerrar_gestion(self, propiedad: PropiedadRapida, etapa: str):
+        """Una venta termina sin concretarse: la propiedad vuelve a espera si era su última gestión"""
+        tiempo = self.tiempo_actual
+        self.estado_etapas[etapa].sumar(tiempo, -1)
+        propiedad.gestiones_abiertas -= 1
+        if not propiedad.gestiones_abiertas:
+            self.estado_propiedades_en_espera.sumar(tiempo, 1)
+            self.estado_propiedades_en_gestion.sumar(tiempo, -1)
+
+    def descartar_etapa(self, etapa: str):
+        """Una gestión termina sobre una propiedad ya vendida: sólo sale de su etapa (la propiedad ya salió de gestión)"""
+        self.estado_etapas[etapa].sumar(self.tiempo_actual, -1)
+
+    # ------------------------------------------------------------------
+    # Corrida y resultados
+    # ------------------------------------------------------------------
+    def ejecutar_simulacion(self, tiempo_total_simulacion: float, reporte: bool = True) -> ResultadoSimulacion:
+        """Ejecuta la simulación aproximada por el tiempo especificado (en HORAS)"""
+        self.tiempo_total_minutos = tiempo_total_simulacion * 60
+        if reporte:
+            print("⚡ INICIANDO SIMULACIÓN EN MODO RÁPIDO (aproximado)")
+            print(f"⏰ Tiempo total: {tiempo_total_simulacion:.0f} horas ({formatear_dias_horas(tiempo_total_simulacion)})")
+            print(f"👥 Agentes: {self.num_agentes} - 🏠 Propiedades: {self.num_propiedades_activas}")
+            print(f"🦘 Paso: {self.paso:.2f} min ({self.pasos_por_visita} saltos por visita)")
+            print("=" * 50)
+
+        self.programar_primer_salto()
+
+        manejadores = [None] * 6
+        manejadores[VISITA] = self.procesar_salto
+        manejadores[FIN_VISITA] = self.procesar_fin_cohorte
+        manejadores[FIN_GESTION_PAPELES] = self.procesar_fin_gestion_papeles
+        manejadores[RENEGOCIACION] = self.procesar_renegociacion
+        manejadores[FIN_VERIFICACION] = self.procesar_fin_verificacion
+        manejadores[FIN_ESCRIBANIA] = self.procesar_fin_escribania
+
+        eventos = self.eventos
+        extraer = eventos.extraer
+        tiempo_total_minutos = self.tiempo_total_minutos
+        eventos_procesados = 0
+        inicio_reloj = time.perf_counter()
+        while eventos:
+            tiempo_evento, _, codigo, a, b = extraer()
+            if tiempo_evento > tiempo_total_minutos:
+                break
+            self.tiempo_actual = tiempo_evento
+            eventos_procesados += 1
+            manejadores[codigo](a, b)
+        self.tiempo_actual = tiempo_total_minutos
+        self.segundos_bucle = time.perf_counter() - inicio_reloj
+        self.eventos_procesados = eventos_procesados
+        self.eventos_por_segundo = eventos_procesados / self.segundos_bucle if self.segundos_bucle > 0 else 0.0
+
+        self.calcular_metricas()
+        resultado = self.obtener_resultado()
+        if reporte:
+            imprimir_reporte(resultado)
+        return resultado
+
+    def calcular_metricas(self):
+        """Cierra los bloqueos de gestión abiertos al final del horizonte"""
+        for agente_id, inicio in enumerate(self.inicio_gestion):
+            if inicio is not None:
+                self.tiempo_gestion[agente_id] += self.tiempo_actual - inicio
+                self.inicio_gestion[agente_id] = self.tiempo_actual
+
+    def calcular_tiempo_efectivo(self) -> float:
+        """Tiempo (en minutos) sobre el que se mide la utilización, como en el motor exacto"""
+        if self.usar_jornada_laboral:
+            horas_por_dia = (self.hora_fin_jornada - self.hora_inicio_jornada) / 60
+            return (self.tiempo_actual / 1440) * horas_por_dia * 60
+        return self.tiempo_actual
+
+    def obtener_resultado(self) -> ResultadoSimulacion:
+        tiempo = self.tiempo_actual
+        tiempo_efectivo = self.calcular_tiempo_efectivo()
+        tiempos_venta = self.estadistica_tiempo_venta
+        visitas_por_venta = self.estadistica_visitas_por_venta
+        # Las visitas se reparten por igual entre los agentes (asignación equitativa)
+        visitas_por_agente = self.estado_etapas['visita'].integral(tiempo) / self.num_agentes
+        tareas_por_agente = self.visitas_atendidas // self.num_agentes
+        variables = {
+            'propiedades_activas': self.estado_propiedades_activas,
+            'propiedades_en_espera': self.estado_propiedades_en_espera,
+            'propiedades_en_gestion': self.estado_propiedades_en_gestion,
+            **{f"etapa_{etapa}": acumulador for etapa, acumulador in self.estado_etapas.items()},
+            'agentes_ocupados': self.estado_agentes_ocupados,
+        }
+
+        return ResultadoSimulacion(
+            tiempo_simulado=tiempo,
+            tiempo_inicio_medicion=0,
+            tiempo_efectivo=tiempo_efectivo,
+            propiedades_activas_inicio=self.num_propiedades_activas,
+            propiedades_activas_final=len(self.propiedades_activas),
+            propiedades_creadas_nuevas=self.propiedades_creadas_nuevas,
+            mantener_propiedades_constante=self.mantener_propiedades_constante,
+            total_visitas_generadas=self.total_visitas_generadas,
+            total_ventas=self.total_ventas,
+            ventas_perdidas=self.ventas_perdidas,
+            visitas_sin_venta=self.visitas_sin_venta,
+            visitas_perdidas=self.visitas_perdidas,
+            visitas_perdidas_fuera_horario=self.visitas_perdidas_fuera_horario,
+            visitas_perdidas_por_limite_verificacion=self.visitas_perdidas_por_limite_verificacion,
+            ventas_ganadas_por_re_engagement=self.ventas_ganadas_por_re_engagement,
+            tiempo_venta=ResumenSerie(
+                tiempos_venta.n, tiempos_venta.media, tiempos_venta.desvio, tiempos_venta.minimo, tiempos_venta.maximo,
+                tiempos_venta.cuantil(0.5), tiempos_venta.cuantil(0.9),
+            ),
+            visitas_por_venta=ResumenSerie(
+                visitas_por_venta.n, visitas_por_venta.media, visitas_por_venta.desvio,
+                visitas_por_venta.minimo, visitas_por_venta.maximo,
+            ),
+            probabilidad_venta=self.prob_venta,
+            comision_minima=self.negociacion(self.max_renegociaciones),
+            usar_jornada_laboral=self.usar_jornada_laboral,
+            hora_inicio_jornada=self.hora_inicio_jornada if self.usar_jornada_laboral else 0,
+            hora_fin_jornada=self.hora_fin_jornada if self.usar_jornada_laboral else 24 * 60,
+            agentes=[
+                ResultadoAgente(
+                    agente_id, (visitas_por_agente + self.tiempo_gestion[agente_id]) / max(tiempo_efectivo, 1),
+                    visitas_por_agente + self.tiempo_gestion[agente_id],
+                    tareas_por_agente + self.tareas_gestion[agente_id],
+                )
+                for agente_id in range(self.num_agentes)
+            ],
+            estado={
+                nombre: {'media': acumulador.media(tiempo), 'maximo': acumulador.maximo}
+                for nombre, acumulador in variables.items()
+            },
+            eventos_procesados=self.eventos_procesados + self.saltos,
+            eventos_por_segundo=(self.eventos_procesados + self.saltos) / self.segundos_bucle if self.segundos_bucle > 0 else 0.0,
+            segundos_bucle=self.segundos_bucle,
+        )
+
+    def negociacion(self, N, max_intentos=6, inicio=0.036, fin=0.026):
+        """Comisión mínima según el número de intentos de re-negociación (igual que el motor exacto)"""
+        total_descuento = inicio - fin
+        pesos = list(range(1, max_intentos + 1))
+        reduccion = sum(pesos[:min(N, max_intentos)]) / sum(pesos) * total_descuento
+        return inicio - reduccion
@@ -0,0 +1,758 @@
+"""
+Motor vectorizado: R réplicas de la misma configuración avanzando juntas (lockstep).
+
+El costo de R réplicas con el motor de referencia es R veces el bucle de
+eventos en Python. Acá el estado de todas las réplicas vive en arrays de NumPy
+con un eje de réplica (agentes [R, K], propiedades [R, N], relojes de eventos
+[R, 1 + K]) y cada vuelta del bucle procesa el próximo evento de CADA réplica:
+las réplicas se agrupan por tipo de evento y cada manejador opera sobre los
+índices de su grupo. El costo del intérprete por vuelta se reparte entre las R
+réplicas, así que rinde más cuantas más réplicas se corren juntas.
+
+La lógica es la de SimulacionInmobiliaria, evento por evento:
+
+- Cada agente tiene a lo sumo un evento pendiente mientras está bloqueado
+  (fin de visita, papeles, renegociación o escribanía): su reloj es la
+  columna 1 + k; la columna 0 es la próxima llegada de visita.
+- Las verificaciones no bloquean: hasta `max_propiedades_verificacion_por_agente`
+  por agente, en su propio array con el mínimo por réplica cacheado.
+- Las propiedades ocupan casillas fijas; una generación por casilla marca
+  cuándo la propiedad de un evento ya se vendió (el `get` que da None en el
+  motor de referencia).
+- Las etapas cuentan gestiones (cada visita y cada venta en curso), como el
+  motor de referencia: cada manejador sabe de qué etapa sale su gestión, así
+  que no hace falta guardar la etapa por propiedad. Espera y gestión cuentan
+  propiedades, con las gestiones abiertas de cada casilla.
+
+Diferencias con el motor de referencia:
+- los empates exactos de tiempo se rompen visita → agentes por id →
+  verificaciones, no por orden de programación (con tiempos continuos no pasa)
+- los flujos aleatorios son de todo el lote: una réplica no se reproduce sola
+  con su semilla, pero el lote completo sí (clave 'semilla')
+- no soporta números aleatorios comunes, checkpoints, traza, perfilado,
+  logging ni detección de calentamiento (esas claves se ignoran)
+
+`replicaciones.validar_motor_vectorizado` contrasta las distribuciones de las
+métricas de salida contra el motor de referencia.
+"""
+import math
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from cola_eventos import VISITA, FIN_VISITA, FIN_GESTION_PAPELES, RENEGOCIACION, FIN_VERIFICACION, FIN_ESCRIBANIA
+from estadisticas import EstadisticaOnline
+from flujos_aleatorios import derivar_semillas
+from remax_corregido_optimizado import ETAPAS
+from resultados import ResultadoAgente, ResultadoSimulacion, ResumenSerie, formatear_dias_horas
+
+# Flujos del motor vectorizado (mismo criterio que NOMBRES_FLUJOS: agregar SIEMPRE al final)
+NOMBRES_FLUJOS_VECTORIZADOS = (
+    'visitas',
+    'fuera_horario',
+    'apertura',
+    'propiedades',
+    'venta',
+    'arrepentimiento',
+    'reengagement',
+)
+
+ETAPA_VISITA = ETAPAS.index('visita')
+ETAPA_PAPELES = ETAPAS.index('papeles')
+ETAPA_RENEGOCIACION = ETAPAS.index('renegociacion')
+ETAPA_VERIFICACION = ETAPAS.index('verificacion')
+ETAPA_ESPERA_ESCRIBANIA = ETAPAS.index('espera_escribania')
+ETAPA_ESCRIBANIA = ETAPAS.index('escribania')
+
+# Columnas de las variables de estado (mismo orden que ResultadoSimulacion.estado)
+COLUMNA_ACTIVAS = 0
+COLUMNA_ESPERA = 1
+COLUMNA_GESTION = 2
+COLUMNA_ETAPAS = 3
+COLUMNA_OCUPADOS = COLUMNA_ETAPAS + len(ETAPAS)
+NOMBRES_ESTADO = (
+    'propiedades_activas',
+    'propiedades_en_espera',
+    'propiedades_en_gestion',
+    *(f"etapa_{etapa}" for etapa in ETAPAS),
+    'agentes_ocupados',
+)
+
+# Opciones que cambian los resultados del motor de referencia y acá se ignoran:
+# al compararlos, la referencia tiene que correr con estos valores
+OPCIONES_NO_SOPORTADAS = {'modo_rapido': False, 'detectar_calentamiento': False, 'numeros_aleatorios_comunes': False}
+
+AGENTE_BLOQUEADO = np.iinfo(np.int64).max  # Clave de asignación de un agente no disponible
+SIN_PENDIENTE = np.iinfo(np.int64).max  # Orden de una casilla libre de escribanías pendientes
+
+
+class AcumuladorVectorial:
+    """AcumuladorTemporal con un eje de réplica: una fila por réplica, una columna por variable.
+
+    Los cambios de una vuelta del bucle se juntan en `delta` y se aplican
+    todos juntos con `aplicar` (todos ocurren en el tiempo actual de su
+    réplica). La integral sale de ∫v = v(T)·T − Σ δ·t, así que cada cambio es
+    una sola suma indexada; el máximo se toma al final de cada evento.
+    """
+
+    def __init__(self, filas: int, valores_iniciales):
+        self.valor = np.tile(np.asarray(valores_iniciales, dtype=float), (filas, 1))
+        self.columnas = self.valor.shape[1]
+        self.delta = np.zeros_like(self.valor)
+        self._delta_plano = self.delta.reshape(-1)
+        self._suma_delta_tiempo = np.zeros_like(self.valor)
+        self.maximo = self.valor.copy()
+
+    def sumar(self, filas, columnas, delta):
+        """Suma `delta` en (filas, columnas) en esta vuelta (los pares de una llamada deben ser distintos)"""
+        self._delta_plano[filas * self.columnas + columnas] += delta
+
+    def aplicar(self, tiempo: np.ndarray):
+        """Aplica los cambios de la vuelta en el tiempo de cada réplica"""
+        self.valor += self.delta
+        self._suma_delta_tiempo += self.delta * tiempo[:, None]
+        np.maximum(self.maximo, self.valor, out=self.maximo)
+        self.delta.fill(0)
+
+    def media(self, tiempo: np.ndarray) -> np.ndarray:
+        """Promedio temporal entre 0 y `tiempo` (uno por réplica)"""
+        duracion = tiempo[:, None]
+        integral = self.valor * duracion - self._suma_delta_tiempo
+        return np.where(duracion > 0, integral / np.where(duracion > 0, duracion, 1), self.valor)
+
+
+def triangular_inversa(u: np.ndarray, a: float, m: float, b: float) -> np.ndarray:
+    """Inverse sampling de la Triangular(a, m, b), como FlujoTriangular"""
+    c = (m - a) / (b - a)
+    return np.where(
+        u <= c,
+        a + np.sqrt(u * (b - a) * (m - a)),
+        b - np.sqrt((1 - u) * (b - a) * (b - m)),
+    )
+
+
+class SimulacionVectorizada:
+    """`num_replicaciones` réplicas de SimulacionInmobiliaria en un solo bucle de eventos vectorizado.
+
+    Misma configuración que el motor de referencia; `ejecutar_simulacion`
+    devuelve un `ResultadoSimulacion` por réplica.
+    """
+
+    def __init__(self, config: Dict, num_replicaciones: int):
+        if num_replicaciones < 1:
+            raise ValueError("Se necesita al menos 1 réplica")
+        self.config = config
+        self.num_replicaciones = r = num_replicaciones
+        self.num_agentes = k = config['num_agentes']
+        self.num_propiedades_activas = n = config['num_propiedades_activas']
+        self.max_renegociaciones = config['max_renegociaciones']
+
+        self.prob_venta = config['probabilidad_venta']
+        self.prob_arrepentimiento = config['probabilidad_arrepentimiento']
+        self.prob_base_reengagement = config['probabilidad_base_reengagement']
+        self.penalizacion_reengagement = config['penalizacion_reengagement']
+
+        self.tiempo_atencion_visitas = config['tiempo_atencion_visitas'] + config['tiempo_primer_contacto']
+        self.tiempo_gestion_papeles = config['tiempo_gestion_papeles'] + config['tiempo_gestion_ofertas']
+        self.tiempo_gestion_verificacion = config['tiempo_gestion_verificacion']
+        self.tiempo_gestion_escribania = config['tiempo_gestion_escribania']
+        self.tiempo_gestion_renegociacion = config['tiempo_gestion_renegociacion']
+        self.max_propiedades_verificacion_por_agente = config.get('max_propiedades_verificacion_por_agente', 3)
+        self.mantener_propiedades_constante = config.get('mantener_propiedades_constante', True)
+
+        self.usar_jornada_laboral = config.get('usar_jornada_laboral', False)
+        if self.usar_jornada_laboral:
+            self.hora_inicio_jornada = config.get('hora_inicio_jornada', 9) * 60
+            self.hora_fin_jornada = config.get('hora_fin_jornada', 18) * 60
+        self.saltar_horario_cerrado = self.usar_jornada_laboral and config.get('saltar_horario_cerrado', False)
+
+        self.usar_distribucion = config.get('usar_distribucion_visitas', False)
+        if self.usar_distribucion:
+            c = config.get('dist_c', 0.11683330812731067)
+            self.dist_a = config.get('dist_loc', 169.04207586301385)
+            self.dist_b = self.dist_a + config.get('dist_scale', 30433.163765426078)
+            self.dist_m = self.dist_a + c * (self.dist_b - self.dist_a)
+            a, m, b = self.dist_a, self.dist_m, self.dist_b
+            self.tiempo_entre_visitas = (a + m + b) / 3
+            self.varianza_entre_visitas = (a ** 2 + b ** 2 + m ** 2 - a * b - a * m - b * m) / 18
+        else:
+            self.tiempo_entre_visitas = config['tiempo_entre_visitas']
+            self.varianza_entre_visitas = 0
+
+        self.semilla = config.get('semilla')
+        semillas = derivar_semillas(self.semilla, NOMBRES_FLUJOS_VECTORIZADOS)
+        self.generadores = {nombre: np.random.default_rng(semilla) for nombre, semilla in semillas.items()}
+
+        self.filas = np.arange(r)
+        self.tiempo_actual = np.zeros(r)
+        self.tiempo_total_minutos = 0
+        self.eventos_procesados = np.zeros(r, dtype=np.int64)
+        self.segundos_bucle = 0.0
+
+        # Relojes: columna 0 = próxima visita, columna 1 + k = evento pendiente del agente k
+        self.relojes = np.full((r, 1 + k), math.inf)
+        self.codigo_tarea = np.zeros((r, k), dtype=np.int8)
+        self.propiedad_tarea = np.zeros((r, k), dtype=np.int64)
+        self.generacion_tarea = np.zeros((r, k), dtype=np.int64)
+
+        # Agentes: la clave de asignación es tareas * K + id (mínima = el disponible con menos tareas)
+        self.ids_agentes = np.arange(k)
+        self.disponible = np.ones((r, k), dtype=bool)
+        self.contador_tareas = np.zeros((r, k), dtype=np.int64)
+        self.clave_agente = np.tile(self.ids_agentes, (r, 1))
+        self.inicio_bloqueo = np.zeros((r, k))
+        self.tiempo_bloqueado = np.zeros((r, k))
+
+        # Verificaciones en curso: V casillas por agente, con el mínimo de cada réplica cacheado
+        self.casillas_verificacion = v = max(self.max_propiedades_verificacion_por_agente, 1)
+        self.fin_verificacion = np.full((r, k * v), math.inf)
+        self.propiedad_verificacion = np.zeros((r, k * v), dtype=np.int64)
+        self.generacion_verificacion = np.zeros((r, k * v), dtype=np.int64)
+        self.en_verificacion = np.zeros((r, k), dtype=np.int64)
+        self.proxima_verificacion = np.full(r, math.inf)
+        self.columna_verificacion = np.zeros(r, dtype=np.int64)
+
+        # Escribanías pendientes por agente (FIFO por número de orden)
+        casillas_pendientes = v + 1
+        self.orden_pendiente = np.full((r, k, casillas_pendientes), SIN_PENDIENTE, dtype=np.int64)
+        self.propiedad_pendiente = np.zeros((r, k, casillas_pendientes), dtype=np.int64)
+        self.generacion_pendiente = np.zeros((r, k, casillas_pendientes), dtype=np.int64)
+        self.escribanias_pendientes = np.zeros((r, k), dtype=np.int64)
+        self.contador_pendientes = np.zeros(r, dtype=np.int64)
+
+        # Propiedades por casilla; sin reposición, las activas son orden_propiedades[:propiedades_activas]
+        self.visitas_recibidas = np.zeros((r, n), dtype=np.int32)
+        self.tiempo_ultima_visita = np.zeros((r, n))
+        self.renegociaciones = np.zeros((r, n), dtype=np.int32)
+        self.paso_verificacion = np.zeros((r, n), dtype=bool)
+        self.gestiones_abiertas = np.zeros((r, n), dtype=np.int32)
+        self.generacion = np.zeros((r, n), dtype=np.int64)
+        self.propiedades_activas = np.full(r, n, dtype=np.int64)
+        if self.mantener_propiedades_constante:
+            self.orden_propiedades = self.posicion_propiedad = None
+        else:
+            self.orden_propiedades = np.tile(np.arange(n), (r, 1))
+            self.posicion_propiedad = self.orden_propiedades.copy()
+
+        # Contadores por réplica
+        self.total_ventas = np.zeros(r, dtype=np.int64)
+        self.ventas_perdidas = np.zeros(r, dtype=np.int64)
+        self.visitas_perdidas = np.zeros(r, dtype=np.int64)
+        self.visitas_perdidas_fuera_horario = np.zeros(r, dtype=np.int64)
+        self.visitas_sin_venta = np.zeros(r, dtype=np.int64)
+        self.total_visitas_generadas = np.zeros(r, dtype=np.int64)
+        self.ventas_ganadas_por_re_engagement = np.zeros(r, dtype=np.int64)
+        self.visitas_perdidas_por_limite_verificacion = np.zeros(r, dtype=np.int64)
+        self.propiedades_creadas_nuevas = np.zeros(r, dtype=np.int64)
+
+        # Ventas concretadas (réplica, tiempo de venta, visitas recibidas) en orden cronológico
+        self._ventas: List[tuple] = []
+        iniciales = np.zeros(len(NOMBRES_ESTADO))
+        iniciales[COLUMNA_ACTIVAS] = iniciales[COLUMNA_ESPERA] = n
+        self.estado = AcumuladorVectorial(r, iniciales)
+
+    # ------------------------------------------------------------------
+    # Llegadas
+    # ------------------------------------------------------------------
+    def tiempos_entre_visitas(self, cantidad: int) -> np.ndarray:
+        if self.usar_distribucion:
+            u = self.generadores['visitas'].random(cantidad)
+            return triangular_inversa(u, self.dist_a, self.dist_m, self.dist_b)
+        return np.full(cantidad, float(self.tiempo_entre_visitas))
+
+    def en_horario(self, tiempo: np.ndarray) -> np.ndarray:
+        minutos_del_dia = tiempo % 1440
+        return (self.hora_inicio_jornada <= minutos_del_dia) & (minutos_del_dia < self.hora_fin_jornada)
+
+    def proxima_apertura(self, tiempo: np.ndarray) -> np.ndarray:
+        inicio_dia = tiempo - tiempo % 1440
+        return np.where(
+            tiempo % 1440 < self.hora_inicio_jornada,
+            inicio_dia + self.hora_inicio_jornada,
+            inicio_dia + 1440 + self.hora_inicio_jornada,
+        )
+
+    def saltar_periodo_cerrado(self, filas: np.ndarray, llegada: np.ndarray) -> np.ndarray:
+        """Versión vectorizada de SimulacionInmobiliaria.saltar_periodo_cerrado"""
+        apertura = self.proxima_apertura(llegada)
+        longitud = np.maximum(np.minimum(apertura, self.tiempo_total_minutos) - llegada, 0)
+        media = self.tiempo_entre_visitas
+        if self.usar_distribucion:
+            desvio = np.sqrt(longitud * self.varianza_entre_visitas / media ** 3)
+            z = self.generadores['fuera_horario'].standard_normal(len(filas))
+            llegadas_extra = np.maximum(0, np.round(longitud / media + desvio * z))
+            proxima = apertura + self.generadores['apertura'].random(len(filas)) * self.tiempos_entre_visitas(len(filas))
+        else:
+            llegadas_extra = np.maximum(0, np.ceil(longitud / media) - 1)
+            proxima = llegada + (llegadas_extra + 1) * media
+
+        cuentan = llegada <= self.tiempo_total_minutos
+        perdidas = (1 + llegadas_extra[cuentan]).astype(np.int64)
+        self.total_visitas_generadas[filas[cuentan]] += perdidas
+        self.visitas_perdidas_fuera_horario[filas[cuentan]] += perdidas
+        return proxima
+
+    def programar_proximas_visitas(self, filas: np.ndarray):
+        """Programa la próxima visita de cada réplica de `filas` (saltando el horario cerrado si corresponde)"""
+        if not filas.size:
+            return
+        proxima = self.tiempo_actual[filas] + self.tiempos_entre_visitas(filas.size)
+        if self.saltar_horario_cerrado:
+            cerrada = ~self.en_horario(proxima)
+            while cerrada.any():
+                sin_mas_visitas = cerrada & (proxima > self.tiempo_total_minutos)
+                proxima[sin_mas_visitas] = math.inf
+                indices = np.flatnonzero(cerrada & ~sin_mas_visitas)
+                proxima[indices] = self.saltar_periodo_cerrado(filas[indices], proxima[indices])
+                cerrada = np.zeros_like(cerrada)
+                cerrada[indices] = ~self.en_horario(proxima[indices])
+        self.relojes[filas, 0] = proxima
+
+    def procesar_visitas(self, filas: np.ndarray, _):
+        """Evento VISITA: atiende las llegadas y programa las siguientes"""
+        tiempo = self.tiempo_actual[filas]
+        self.total_visitas_generadas[filas] += 1
+        atender = filas
+        if self.usar_jornada_laboral:
+            abierta = self.en_horario(tiempo)
+            self.visitas_perdidas_fuera_horario[filas[~abierta]] += 1
+            atender = filas[abierta]
+        if atender.size:
+            self.atender_visitas(atender)
+
+        siguen = tiempo + self.tiempo_entre_visitas <= self.tiempo_total_minutos
+        self.relojes[filas[~siguen], 0] = math.inf
+        self.programar_proximas_visitas(filas[siguen])
+
+    def atender_visitas(self, filas: np.ndarray):
+        """Propiedad al azar y agente equitativo (el disponible con menos tareas; empate → menor id)"""
+        activas = self.propiedades_activas[filas]
+        sin_propiedades = activas == 0
+        if sin_propiedades.any():
+            self.visitas_perdidas[filas[sin_propiedades]] += 1
+            filas, activas = filas[~sin_propiedades], activas[~sin_propiedades]
+
+        posicion = (self.generadores['propiedades'].random(filas.size) * activas).astype(np.int64)
+        casilla = posicion if self.orden_propiedades is None else self.orden_propiedades[filas, posicion]
+        self.visitas_recibidas[filas, casilla] += 1
+
+        claves = self.clave_agente[filas]
+        agente = claves.argmin(1)
+        hay_agente = claves[np.arange(filas.size), agente] != AGENTE_BLOQUEADO
+        self.visitas_perdidas[filas[~hay_agente]] += 1
+        filas, casilla, agente = filas[hay_agente], casilla[hay_agente], agente[hay_agente]
+
+        self.bloquear_agentes(filas, agente)
+        self.tiempo_ultima_visita[filas, casilla] = self.tiempo_actual[filas]
+        self.abrir_gestiones(filas, casilla, ETAPA_VISITA)
+        self.programar_tarea(
+            filas, agente, FIN_VISITA, self.tiempo_atencion_visitas, casilla, self.generacion[filas, casilla],
+        )
+
+    # ------------------------------------------------------------------
+    # Agentes y etapas
+    # ------------------------------------------------------------------
+    def programar_tarea(self, filas, agente, codigo: int, duracion: float, casilla, generacion):
+        self.relojes[filas, agente + 1] = self.tiempo_actual[filas] + duracion
+        self.codigo_tarea[filas, agente] = codigo
+        self.propiedad_tarea[filas, agente] = casilla
+        self.generacion_tarea[filas, agente] = generacion
+
+    def bloquear_agentes(self, filas, agente):
+        tiempo = self.tiempo_actual[filas]
+        self.disponible[filas, agente] = False
+        self.inicio_bloqueo[filas, agente] = tiempo
+        self.contador_tareas[filas, agente] += 1
+        self.clave_agente[filas, agente] = AGENTE_BLOQUEADO
+        self.estado.sumar(filas, COLUMNA_OCUPADOS, 1)
+
+    def desbloquear_agentes(self, filas, agente):
+        """Libera los agentes y arranca su próxima escribanía pendiente, si tienen"""
+        if not filas.size:
+            return
+        tiempo = self.tiempo_actual[filas]
+        self.tiempo_bloqueado[filas, agente] += tiempo - self.inicio_bloqueo[filas, agente]
+        self.disponible[filas, agente] = True
+        self.clave_agente[filas, agente] = self.contador_tareas[filas, agente] * self.num_agentes + agente
+        self.relojes[filas, agente + 1] = math.inf
+        self.estado.sumar(filas, COLUMNA_OCUPADOS, -1)
+
+        con_pendientes = self.escribanias_pendientes[filas, agente] > 0
+        if con_pendientes.any():
+            self.iniciar_escribanias_pendientes(filas[con_pendientes], agente[con_pendientes])
+
+    def cambiar_etapa(self, filas, anterior: int, nueva: int):
+        """Mueve una gestión por réplica de `anterior` a `nueva`"""
+        if not filas.size:
+            return
+        self.estado.sumar(filas, COLUMNA_ETAPAS + anterior, -1)
+        self.estado.sumar(filas, COLUMNA_ETAPAS + nueva, 1)
+
+    def abrir_gestiones(self, filas, casilla, etapa: int):
+        """Una gestión nueva por réplica; la propiedad sale de espera si es la primera"""
+        if not filas.size:
+            return
+        self.estado.sumar(filas, COLUMNA_ETAPAS + etapa, 1)
+        self.gestiones_abiertas[filas, casilla] += 1
+        primera = filas[self.gestiones_abiertas[filas, casilla] == 1]
+        self.estado.sumar(primera, COLUMNA_ESPERA, -1)
+        self.estado.sumar(primera, COLUMNA_GESTION, 1)
+
+    def cerrar_gestiones(self, filas, casilla, etapa: int):
+        """Una gestión termina sin venta; la propiedad vuelve a espera si era la última"""
+        if not filas.size:
+            return
+        self.estado.sumar(filas, COLUMNA_ETAPAS + etapa, -1)
+        self.gestiones_abiertas[filas, casilla] -= 1
+        ultima = filas[self.gestiones_abiertas[filas, casilla] == 0]
+        self.estado.sumar(ultima, COLUMNA_ESPERA, 1)
+        self.estado.sumar(ultima, COLUMNA_GESTION, -1)
+
+    def descartar_etapa(self, filas, etapa: int):
+        """Gestiones que terminan sobre una propiedad ya vendida: sólo salen de su etapa"""
+        if not filas.size:
+            return
+        self.estado.sumar(filas, COLUMNA_ETAPAS + etapa, -1)
+
+    def propiedades_de_tareas(self, filas, agente, etapa: int):
+        """Propiedad de la tarea de cada agente; las ya vendidas liberan al agente y se descartan de `etapa`"""
+        casilla = self.propiedad_tarea[filas, agente]
+        generacion = self.generacion_tarea[filas, agente]
+        existe = self.generacion[filas, casilla] == generacion
+        if not existe.all():
+            self.desbloquear_agentes(filas[~existe], agente[~existe])
+            self.descartar_etapa(filas[~existe], etapa)
+            filas, agente, casilla, generacion = filas[existe], agente[existe], casilla[existe], generacion[existe]
+        return filas, agente, casilla, generacion
+
+    # ------------------------------------------------------------------
+    # Gestión de las ventas
+    # ------------------------------------------------------------------
+    def procesar_fines_visita(self, filas, agente):
+        """Evento FIN_VISITA: decide la venta (respetando el límite de verificaciones del agente)"""
+        filas, agente, casilla, generacion = self.propiedades_de_tareas(filas, agente, ETAPA_VISITA)
+        venta = self.generadores['venta'].random(filas.size) < self.prob_venta
+        rechazada = venta & (self.en_verificacion[filas, agente] >= self.max_propiedades_verificacion_por_agente)
+        self.visitas_perdidas_por_limite_verificacion[filas[rechazada]] += 1
+        venta &= ~rechazada
+
+        self.cambiar_etapa(filas[venta], ETAPA_VISITA, ETAPA_PAPELES)
+        self.programar_tarea(
+            filas[venta], agente[venta], FIN_GESTION_PAPELES, self.tiempo_gestion_papeles, casilla[venta], generacion[venta],
+        )
+
+        sin_venta = ~venta
+        self.visitas_sin_venta[filas[sin_venta]] += 1
+        self.desbloquear_agentes(filas[sin_venta], agente[sin_venta])
+        self.cerrar_gestiones(filas[sin_venta], casilla[sin_venta], ETAPA_VISITA)
+
+    def procesar_fines_papeles(self, filas, agente):
+        """Evento FIN_GESTION_PAPELES: arrepentimiento → renegociación; si no, verificación"""
+        filas, agente, casilla, generacion = self.propiedades_de_tareas(filas, agente, ETAPA_PAPELES)
+        arrepentido = self.generadores['arrepentimiento'].random(filas.size) < self.prob_arrepentimiento
+
+        self.cambiar_etapa(filas[arrepentido], ETAPA_PAPELES, ETAPA_RENEGOCIACION)
+        self.programar_tarea(
+            filas[arrepentido], agente[arrepentido], RENEGOCIACION, self.tiempo_gestion_renegociacion,
+            casilla[arrepentido], generacion[arrepentido],
+        )
+
+        sigue = ~arrepentido
+        filas, agente, casilla, generacion = filas[sigue], agente[sigue], casilla[sigue], generacion[sigue]
+        self.desbloquear_agentes(filas, agente)
+        self.agregar_verificaciones(filas, agente, casilla, generacion)
+        self.cambiar_etapa(filas, ETAPA_PAPELES, ETAPA_VERIFICACION)
+
+    def procesar_renegociaciones(self, filas, agente):
+        """Evento RENEGOCIACION: rutina de re-engagement con probabilidad decreciente"""
+        filas, agente, casilla, generacion = self.propiedades_de_tareas(filas, agente, ETAPA_RENEGOCIACION)
+        contador = self.renegociaciones[filas, casilla]
+        puede = contador < self.max_renegociaciones
+        convencido = np.zeros(filas.size, dtype=bool)
+        prob_convencimiento = np.maximum(
+            0.1, self.prob_base_reengagement - contador[puede] * self.penalizacion_reengagement,
+        )
+        convencido[puede] = self.generadores['reengagement'].random(int(puede.sum())) < prob_convencimiento
+
+        exito = convencido
+        self.renegociaciones[filas[exito], casilla[exito]] += 1
+        self.desbloquear_agentes(filas[exito], agente[exito])
+        self.agregar_verificaciones(filas[exito], agente[exito], casilla[exito], generacion[exito])
+        self.cambiar_etapa(filas[exito], ETAPA_RENEGOCIACION, ETAPA_VERIFICACION)
+        self.ventas_ganadas_por_re_engagement[filas[exito]] += 1
+
+        fracaso = ~exito
+        self.ventas_perdidas[filas[fracaso]] += 1
+        self.desbloquear_agentes(filas[fracaso], agente[fracaso])
+        self.cerrar_gestiones(filas[fracaso], casilla[fracaso], ETAPA_RENEGOCIACION)
+
+    def agregar_verificaciones(self, filas, agente, casilla, generacion):
+        """Ocupa una casilla de verificación del agente (siempre hay: el límite se controla en FIN_VISITA)"""
+        if not filas.size:
+            return
+        v = self.casillas_verificacion
+        columnas = agente[:, None] * v + np.arange(v)
+        columna = agente * v + (self.fin_verificacion[filas[:, None], columnas] == math.inf).argmax(1)
+        fin = self.tiempo_actual[filas] + self.tiempo_gestion_verificacion
+        self.fin_verificacion[filas, columna] = fin
+        self.propiedad_verificacion[filas, columna] = casilla
+        self.generacion_verificacion[filas, columna] = generacion
+        self.en_verificacion[filas, agente] += 1
+
+        antes = fin < self.proxima_verificacion[filas]
+        self.proxima_verificacion[filas[antes]] = fin[antes]
+        self.columna_verificacion[filas[antes]] = columna[antes]
+
+    def procesar_fines_verificacion(self, filas, _):
+        """Evento FIN_VERIFICACION: escribanía ya si el agente está libre; si no, queda en su cola"""
+        columna = self.columna_verificacion[filas]
+        agente = columna // self.casillas_verificacion
+        casilla = self.propiedad_verificacion[filas, columna]
+        generacion = self.generacion_verificacion[filas, columna]
+        self.fin_verificacion[filas, columna] = math.inf
+        self.en_verificacion[filas, agente] -= 1
+        pendientes = self.fin_verificacion[filas]
+        proxima = pendientes.argmin(1)
+        self.columna_verificacion[filas] = proxima
+        self.proxima_verificacion[filas] = pendientes[np.arange(filas.size), proxima]
+
+        existe = self.generacion[filas, casilla] == generacion
+        self.descartar_etapa(filas[~existe], ETAPA_VERIFICACION)
+        filas, agente, casilla, generacion = filas[existe], agente[existe], casilla[existe], generacion[existe]
+        self.paso_verificacion[filas, casilla] = True
+
+        libre = self.disponible[filas, agente]
+        self.iniciar_escribanias(filas[libre], agente[libre], casilla[libre], generacion[libre], ETAPA_VERIFICACION)
+
+        ocupado = ~libre
+        self.encolar_escribanias(filas[ocupado], agente[ocupado], casilla[ocupado], generacion[ocupado])
+        self.cambiar_etapa(filas[ocupado], ETAPA_VERIFICACION, ETAPA_ESPERA_ESCRIBANIA)
+
+    def iniciar_escribanias(self, filas, agente, casilla, generacion, etapa_anterior: int):
+        """Bloquea a los agentes y programa el fin de la escribanía"""
+        if not filas.size:
+            return
+        self.bloquear_agentes(filas, agente)
+        self.cambiar_etapa(filas, etapa_anterior, ETAPA_ESCRIBANIA)
+        self.programar_tarea(filas, agente, FIN_ESCRIBANIA, self.tiempo_gestion_escribania, casilla, generacion)
+
+    def encolar_escribanias(self, filas, agente, casilla, generacion):
+        if not filas.size:
+            return
+        libre = (self.orden_pendiente[filas, agente] == SIN_PENDIENTE).argmax(1)
+        self.orden_pendiente[filas, agente, libre] = self.contador_pendientes[filas]
+        self.propiedad_pendiente[filas, agente, libre] = casilla
+        self.generacion_pendiente[filas, agente, libre] = generacion
+        self.contador_pendientes[filas] += 1
+        self.escribanias_pendientes[filas, agente] += 1
+
+    def iniciar_escribanias_pendientes(self, filas, agente):
+        """Arranca la escribanía pendiente más antigua de cada agente (salteando propiedades ya vendidas)"""
+        while filas.size:
+            primera = self.orden_pendiente[filas, agente].argmin(1)
+            casilla = self.propiedad_pendiente[filas, agente, primera]
+            generacion = self.generacion_pendiente[filas, agente, primera]
+            self.orden_pendiente[filas, agente, primera] = SIN_PENDIENTE
+            self.escribanias_pendientes[filas, agente] -= 1
+
+            existe = self.generacion[filas, casilla] == generacion
+            self.iniciar_escribanias(
+                filas[existe], agente[existe], casilla[existe], generacion[existe], ETAPA_ESPERA_ESCRIBANIA,
+            )
+            self.descartar_etapa(filas[~existe], ETAPA_ESPERA_ESCRIBANIA)
+            seguir = ~existe & (self.escribanias_pendientes[filas, agente] > 0)
+            filas, agente = filas[seguir], agente[seguir]
+
+    def procesar_fines_escribania(self, filas, agente):
+        """Evento FIN_ESCRIBANIA: venta concretada si la propiedad sigue activa y pasó la verificación"""
+        casilla = self.propiedad_tarea[filas, agente]
+        generacion = self.generacion_tarea[filas, agente]
+        venta = (self.generacion[filas, casilla] == generacion) & self.paso_verificacion[filas, casilla]
+        vendidas, casillas_vendidas = filas[venta], casilla[venta]
+        if vendidas.size:
+            self.total_ventas[vendidas] += 1
+            self._ventas.append((
+                vendidas,
+                self.tiempo_actual[vendidas] - self.tiempo_ultima_visita[vendidas, casillas_vendidas],
+                self.visitas_recibidas[vendidas, casillas_vendidas].copy(),
+            ))
+            # La propiedad sale desde gestión; sus otras gestiones abiertas se descartan al terminar
+            self.estado.sumar(vendidas, COLUMNA_ETAPAS + ETAPA_ESCRIBANIA, -1)
+            self.estado.sumar(vendidas, COLUMNA_GESTION, -1)
+            self.retirar_propiedades(vendidas, casillas_vendidas)
+        # Otra gestión de la misma propiedad ya la vendió
+        self.descartar_etapa(filas[~venta], ETAPA_ESCRIBANIA)
+        self.desbloquear_agentes(filas, agente)
+
+    def retirar_propiedades(self, filas, casilla):
+        """Saca las propiedades vendidas; con reposición, una nueva ocupa la misma casilla"""
+        self.generacion[filas, casilla] += 1
+        self.gestiones_abiertas[filas, casilla] = 0
+        if self.mantener_propiedades_constante:
+            # Baja y alta en el mismo instante: activas no cambia y la nueva entra en espera
+            self.estado.sumar(filas, COLUMNA_ESPERA, 1)
+            self.visitas_recibidas[filas, casilla] = 0
+            self.tiempo_ultima_visita[filas, casilla] = 0
+            self.renegociaciones[filas, casilla] = 0
+            self.paso_verificacion[filas, casilla] = False
+            self.propiedades_creadas_nuevas[filas] += 1
+            return
+        # ✅ Swap-remove en el orden de las activas, como IndicePropiedadesActivas
+        ultima = self.propiedades_activas[filas] - 1
+        posicion = self.posicion_propiedad[filas, casilla]
+        casilla_ultima = self.orden_propiedades[filas, ultima]
+        self.orden_propiedades[filas, posicion] = casilla_ultima
+        self.posicion_propiedad[filas, casilla_ultima] = posicion
+        self.propiedades_activas[filas] = ultima
+        self.estado.sumar(filas, COLUMNA_ACTIVAS, -1)
+
+    # ------------------------------------------------------------------
+    # Corrida y resultados
+    # ------------------------------------------------------------------
+    def ejecutar_simulacion(self, tiempo_total_simulacion: float, reporte: bool = False) -> List[ResultadoSimulacion]:
+        """Ejecuta las réplicas por el tiempo especificado (en HORAS) y devuelve un resultado por réplica"""
+        self.tiempo_total_minutos = tiempo_total = tiempo_total_simulacion * 60
+        if reporte:
+            print("🧮 INICIANDO SIMULACIÓN VECTORIZADA")
+            print(f"⏰ Tiempo total: {tiempo_total_simulacion:.0f} horas ({formatear_dias_horas(tiempo_total_simulacion)})")
+            print(f"🔁 Réplicas: {self.num_replicaciones} - 👥 Agentes: {self.num_agentes} "
+                  f"- 🏠 Propiedades: {self.num_propiedades_activas}")
+            print("=" * 50)
+
+        self.programar_proximas_visitas(self.filas)
+
+        manejadores = [None] * (max(VISITA, FIN_VISITA, FIN_GESTION_PAPELES, RENEGOCIACION, FIN_VERIFICACION, FIN_ESCRIBANIA) + 1)
+        manejadores[VISITA] = self.procesar_visitas
+        manejadores[FIN_VISITA] = self.procesar_fines_visita
+        manejadores[FIN_GESTION_PAPELES] = self.procesar_fines_papeles
+        manejadores[RENEGOCIACION] = self.procesar_renegociaciones
+        manejadores[FIN_VERIFICACION] = self.procesar_fines_verificacion
+        manejadores[FIN_ESCRIBANIA] = self.procesar_fines_escribania
+
+        filas = self.filas
+        relojes = self.relojes
+        codigos = np.empty(self.num_replicaciones, dtype=np.int64)
+        inicio_reloj = time.perf_counter()
+        # ✅ Cada vuelta procesa el próximo evento de todas las réplicas que siguen activas
+        while True:
+            columna = relojes.argmin(1)
+            tiempo = relojes[filas, columna]
+            es_verificacion = self.proxima_verificacion < tiempo
+            tiempo = np.where(es_verificacion, self.proxima_verificacion, tiempo)
+            # Como el motor de referencia: se procesa hasta el primer evento posterior al horizonte
+            activas = np.flatnonzero((tiempo < math.inf) & (self.tiempo_actual <= tiempo_total))
+            if not activas.size:
+                break
+            self.tiempo_actual[activas] = tiempo[activas]
+            self.eventos_procesados[activas] += 1
+
+            codigos[:] = self.codigo_tarea[filas, columna - 1]  # La columna 0 (visita) se pisa abajo
+            codigos[columna == 0] = VISITA
+            codigos[es_verificacion] = FIN_VERIFICACION
+            codigos_activas = codigos[activas]
+            agentes = columna[activas] - 1
+            for codigo in np.flatnonzero(np.bincount(codigos_activas, minlength=len(manejadores))):
+                grupo = codigos_activas == codigo
+                manejadores[codigo](activas[grupo], agentes[grupo])
+            self.estado.aplicar(self.tiempo_actual)
+        self.segundos_bucle = time.perf_counter() - inicio_reloj
+
+        self.calcular_metricas()
+        resultados = self.obtener_resultados()
+        if reporte:
+            eventos = int(self.eventos_procesados.sum())
+            print(f"⚡ {eventos:,} eventos en {self.segundos_bucle:.2f} s "
+                  f"({eventos / max(self.segundos_bucle, 1e-9):,.0f} eventos/seg, {self.num_replicaciones} réplicas)")
+        return resultados
+
+    def calcular_metricas(self):
+        """Cierra los bloqueos abiertos al final del horizonte"""
+        bloqueados = ~self.disponible
+        extra = self.tiempo_actual[:, None] - self.inicio_bloqueo
+        self.tiempo_bloqueado += np.where(bloqueados, extra, 0)
+        self.inicio_bloqueo = np.where(bloqueados, self.tiempo_actual[:, None], self.inicio_bloqueo)
+
+    def calcular_tiempo_efectivo(self) -> np.ndarray:
+        """Tiempo (en minutos) sobre el que se mide la utilización, como en el motor de referencia"""
+        if self.usar_jornada_laboral:
+            horas_por_dia = (self.hora_fin_jornada - self.hora_inicio_jornada) / 60
+            return (self.tiempo_actual / 1440) * horas_por_dia * 60
+        return self.tiempo_actual.copy()
+
+    def estadisticas_ventas(self) -> List[tuple]:
+        """(tiempo de venta, visitas por venta) de cada réplica como EstadisticaOnline"""
+        estadisticas = [(EstadisticaOnline(cuantiles=(0.5, 0.9)), EstadisticaOnline()) for _ in self.filas]
+        if self._ventas:
+            filas = np.concatenate([f for f, _, _ in self._ventas])
+            tiempos = np.concatenate([t for _, t, _ in self._ventas])
+            visitas = np.concatenate([v for _, _, v in self._ventas])
+            orden = np.argsort(filas, kind='stable')  # Conserva el orden cronológico dentro de cada réplica
+            for fila, tiempo, cantidad in zip(filas[orden].tolist(), tiempos[orden].tolist(), visitas[orden].tolist()):
+                tiempo_venta, visitas_por_venta = estadisticas[fila]
+                tiempo_venta.agregar(tiempo)
+                visitas_por_venta.agregar(cantidad)
+        return estadisticas
+
+    def obtener_resultados(self) -> List[ResultadoSimulacion]:
+        tiempo_efectivo = self.calcular_tiempo_efectivo()
+        medias = self.estado.media(self.tiempo_actual)
+        maximos = self.estado.maximo
+        segundos = self.segundos_bucle / self.num_replicaciones  # Parte del bucle compartido
+        comision_minima = self.negociacion(self.max_renegociaciones)
+
+        resultados = []
+        for fila, (tiempos_venta, visitas_por_venta) in enumerate(self.estadisticas_ventas()):
+            efectivo = max(float(tiempo_efectivo[fila]), 1)
+            resultados.append(ResultadoSimulacion(
+                tiempo_simulado=float(self.tiempo_actual[fila]),
+                tiempo_inicio_medicion=0,
+                tiempo_efectivo=float(tiempo_efectivo[fila]),
+                propiedades_activas_inicio=self.num_propiedades_activas,
+                propiedades_activas_final=int(self.propiedades_activas[fila]),
+                propiedades_creadas_nuevas=int(self.propiedades_creadas_nuevas[fila]),
+                mantener_propiedades_constante=self.mantener_propiedades_constante,
+                total_visitas_generadas=int(self.total_visitas_generadas[fila]),
+                total_ventas=int(self.total_ventas[fila]),
+                ventas_perdidas=int(self.ventas_perdidas[fila]),
+                visitas_sin_venta=int(self.visitas_sin_venta[fila]),
+                visitas_perdidas=int(self.visitas_perdidas[fila]),
+                visitas_perdidas_fuera_horario=int(self.visitas_perdidas_fuera_horario[fila]),
+                visitas_perdidas_por_limite_verificacion=int(self.visitas_perdidas_por_limite_verificacion[fila]),
+                ventas_ganadas_por_re_engagement=int(self.ventas_ganadas_por_re_engagement[fila]),
+                tiempo_venta=ResumenSerie(
+                    tiempos_venta.n, tiempos_venta.media, tiempos_venta.desvio, tiempos_venta.minimo,
+                    tiempos_venta.maximo, tiempos_venta.cuantil(0.5), tiempos_venta.cuantil(0.9),
+                ),
+                visitas_por_venta=ResumenSerie(
+                    visitas_por_venta.n, visitas_por_venta.media, visitas_por_venta.desvio,
+                    visitas_por_venta.minimo, visitas_por_venta.maximo,
+                ),
+                probabilidad_venta=self.prob_venta,
+                comision_minima=comision_minima,
+                usar_jornada_laboral=self.usar_jornada_laboral,
+                hora_inicio_jornada=self.hora_inicio_jornada if self.usar_jornada_laboral else 0,
+                hora_fin_jornada=self.hora_fin_jornada if self.usar_jornada_laboral else 24 * 60,
+                agentes=[
+                    ResultadoAgente(
+                        agente_id, float(self.tiempo_bloqueado[fila, agente_id]) / efectivo,
+                        float(self.tiempo_bloqueado[fila, agente_id]), int(self.contador_tareas[fila, agente_id]),
+                    )
+                    for agente_id in range(self.num_agentes)
+                ],
+                estado={
+                    nombre: {'media': float(medias[fila, columna]), 'maximo': int(maximos[fila, columna])}
+                    for columna, nombre in enumerate(NOMBRES_ESTADO)
+                },
+                eventos_procesados=int(self.eventos_procesados[fila]),
+                eventos_por_segundo=int(self.eventos_procesados[fila]) / segundos if segundos > 0 else 0.0,
+                segundos_bucle=segundos,
+            ))
+        return resultados
+
+    def negociacion(self, N, max_intentos=6, inicio=0.036, fin=0.026):
+        """Comisión mínima según el número de intentos de re-negociación (igual que el motor de referencia)"""
+        total_descuento = inicio - fin
+        pesos = list(range(1, max_intentos + 1))
+        reduccion = sum(pesos[:min(N, max_intentos)]) / sum(pesos) * total_descuento
+        return inicio - reduccion
@@ -0,0 +1,150 @@
+"""
+Perfilado opcional del bucle de despacho de la simulación.
+
+Con `perfilar_eventos` activado, el bucle principal reemplaza su tabla de
+manejadores por versiones envueltas que miden cada llamada. Con el perfilado
+desactivado la tabla queda intacta, así que no cuesta nada.
+
+Por tipo de evento se acumulan: cantidad, tiempo de reloj total (incluye los
+`programar` que hace el manejador) y cantidad por resultado. La extracción de
+la cola se mide aparte. Por día simulado se guardan los eventos procesados y
+el tamaño máximo de la cola de eventos.
+"""
+import time
+from array import array
+from typing import Callable, Dict, List, Sequence
+
+from cola_eventos import NOMBRES_EVENTOS
+from traza import NOMBRES_RESULTADOS
+
+MINUTOS_POR_DIA = 24 * 60
+
+
+class PerfilEventos:
+    """Medidas del bucle de despacho por tipo de evento y por día simulado"""
+
+    def __init__(self):
+        cantidad_codigos = len(NOMBRES_EVENTOS)
+        self.cantidades = [0] * cantidad_codigos
+        self.segundos = [0.0] * cantidad_codigos
+        self.resultados = [[0] * len(NOMBRES_RESULTADOS) for _ in range(cantidad_codigos)]
+        self.extracciones = 0
+        self.segundos_extraccion = 0.0
+
+        # Series diarias (índice = día simulado)
+        self.eventos_por_dia = array('q')
+        self.cola_maxima_por_dia = array('q')
+
+    def instrumentar(self, manejadores: Sequence[Callable], simulacion) -> List[Callable]:
+        """Devuelve una tabla de manejadores equivalente que mide cada llamada"""
+        return [self._envolver(codigo, manejador, simulacion) for codigo, manejador in enumerate(manejadores)]
+
+    def instrumentar_extraccion(self, extraer: Callable) -> Callable:
+        """Envuelve la extracción de la cola de eventos"""
+        reloj = time.perf_counter
+
+        def extraer_medido():
+            inicio = reloj()
+            evento = extraer()
+            self.segundos_extraccion += reloj() - inicio
+            self.extracciones += 1
+            return evento
+
+        return extraer_medido
+
+    def _envolver(self, codigo: int, manejador: Callable, simulacion) -> Callable:
+        reloj = time.perf_counter
+        cantidades = self.cantidades
+        segundos = self.segundos
+        resultados = self.resultados[codigo]
+        eventos_por_dia = self.eventos_por_dia
+        cola_maxima_por_dia = self.cola_maxima_por_dia
+        cola = simulacion.eventos
+
+        def manejador_medido(propiedad_id, agente_id):
+            inicio = reloj()
+            resultado = manejador(propiedad_id, agente_id)
+            segundos[codigo] += reloj() - inicio
+            cantidades[codigo] += 1
+            resultados[resultado] += 1
+
+            dia = int(simulacion.tiempo_actual // MINUTOS_POR_DIA)
+            while len(eventos_por_dia) <= dia:
+                eventos_por_dia.append(0)
+                cola_maxima_por_dia.append(0)
+            eventos_por_dia[dia] += 1
+            tamano_cola = len(cola)
+            if tamano_cola > cola_maxima_por_dia[dia]:
+                cola_maxima_por_dia[dia] = tamano_cola
+            return resultado
+
+        return manejador_medido
+
+    @property
+    def total_eventos(self) -> int:
+        return sum(self.cantidades)
+
+    @property
+    def segundos_manejadores(self) -> float:
+        return sum(self.segundos)
+
+    def filas(self) -> List[Dict]:
+        """Resumen por tipo de evento (una fila por código con al menos un evento)"""
+        total_segundos = self.segundos_manejadores + self.segundos_extraccion
+        filas = []
+        for codigo, nombre in enumerate(NOMBRES_EVENTOS):
+            cantidad = self.cantidades[codigo]
+            if cantidad == 0:
+                continue
+            filas.append({
+                'evento': nombre,
+                'cantidad': cantidad,
+                'segundos': self.segundos[codigo],
+                'microsegundos_medio': self.segundos[codigo] / cantidad * 1e6,
+                'fraccion_tiempo': self.segundos[codigo] / total_segundos if total_segundos > 0 else 0.0,
+                'resultados': {
+                    NOMBRES_RESULTADOS[r]: n for r, n in enumerate(self.resultados[codigo]) if n
+                },
+            })
+        if self.extracciones:
+            filas.append({
+                'evento': 'extraer (cola)',
+                'cantidad': self.extracciones,
+                'segundos': self.segundos_extraccion,
+                'microsegundos_medio': self.segundos_extraccion / self.extracciones * 1e6,
+                'fraccion_tiempo': self.segundos_extraccion / total_segundos if total_segundos > 0 else 0.0,
+                'resultados': {},
+            })
+        return filas
+
+    def resumen_diario(self) -> Dict[str, float]:
+        """Eventos por día simulado y tamaño de la cola (medias y máximos sobre los días)"""
+        dias = len(self.eventos_por_dia)
+        if dias == 0:
+            return {'dias': 0, 'eventos_por_dia_medio': 0.0, 'eventos_por_dia_maximo': 0,
+                    'cola_maxima_media': 0.0, 'cola_maxima': 0}
+        return {
+            'dias': dias,
+            'eventos_por_dia_medio': sum(self.eventos_por_dia) / dias,
+            'eventos_por_dia_maximo': max(self.eventos_por_dia),
+            'cola_maxima_media': sum(self.cola_maxima_por_dia) / dias,
+            'cola_maxima': max(self.cola_maxima_por_dia),
+        }
+
+    def tabla(self) -> str:
+        """Tabla de texto para el reporte"""
+        lineas = [f"  {'Evento':<22}{'Cantidad':>12}{'Total (s)':>11}{'Medio (µs)':>12}{'% tiempo':>10}"]
+        for fila in self.filas():
+            lineas.append(
+                f"  {fila['evento']:<22}{fila['cantidad']:>12,}{fila['segundos']:>11.3f}"
+                f"{fila['microsegundos_medio']:>12.2f}{fila['fraccion_tiempo']:>10.1%}"
+            )
+        diario = self.resumen_diario()
+        lineas.append(
+            f"  Eventos por día simulado: {diario['eventos_por_dia_medio']:,.1f} medio, "
+            f"{diario['eventos_por_dia_maximo']:,} máximo ({diario['dias']:,} días)"
+        )
+        lineas.append(
+            f"  Cola de eventos: {diario['cola_maxima_media']:,.1f} máximo diario medio, {diario['cola_maxima']:,} máximo"
+        )
+        return "\n".join(lineas)
@@ -0,0 +1,252 @@
+"""
+Red de oficinas: varias simulaciones inmobiliarias acopladas por derivación de visitas.
+
+Cada oficina es una `SimulacionInmobiliaria` completa (sus agentes, propiedades
+y flujos aleatorios) y corre su propio bucle de eventos, en un proceso aparte
+si se pide. Lo único que cruza de una oficina a otra es una visita que llega
+cuando no hay agentes libres: en vez de perderse, se deriva a la oficina con
+más agentes libres y llega allí `tiempo_primer_contacto` minutos después.
+
+Ese retardo fijo es el *lookahead* de la sincronización conservadora: si todas
+las oficinas procesaron sus eventos hasta T, ningún mensaje generado después
+puede llegar antes de T + L. El coordinador avanza por ventanas:
+
+1. T = mínimo entre los próximos eventos de todas las oficinas
+2. cada oficina procesa sus eventos con tiempo < T + L (en paralelo)
+3. en la barrera se reparten las derivaciones (llegan en t + L >= T + L)
+
+Así ninguna oficina recibe un evento en su pasado y el resultado es el mismo
+corriendo en procesos o en el mismo proceso (ver `ejecutar_red`).
+"""
+import math
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from remax_corregido_optimizado import CONFIGURACION, SimulacionInmobiliaria
+from replicaciones import semilla_replica
+from resultados import ResultadoSimulacion
+
+
+class OficinaLocal:
+    """Oficina que corre en el mismo proceso que el coordinador"""
+
+    def __init__(self, config: Dict, tiempo_total_horas: float, derivar_visitas: bool = True):
+        self.simulacion = SimulacionInmobiliaria(config)
+        if derivar_visitas:
+            self.simulacion.derivaciones = []
+        self.simulacion.iniciar_simulacion(tiempo_total_horas)
+
+    def estado(self) -> Tuple[float, int]:
+        """(próximo evento, agentes libres)"""
+        simulacion = self.simulacion
+        return simulacion.proximo_evento(), len(simulacion.agentes_disponibles)
+
+    def avanzar(self, hasta: float, llegadas: List[float]) -> Tuple[List[float], float, int]:
+        """Inyecta las visitas derivadas, procesa los eventos < `hasta` y devuelve
+        (tiempos de las visitas a derivar, próximo evento, agentes libres)"""
+        simulacion = self.simulacion
+        for tiempo in llegadas:
+            simulacion.inyectar_visita_derivada(tiempo)
+        simulacion.avanzar_hasta(hasta)
+        salientes = simulacion.derivaciones or []
+        if simulacion.derivaciones is not None:
+            simulacion.derivaciones = []
+        return (salientes, *self.estado())
+
+    def finalizar(self) -> ResultadoSimulacion:
+        self.simulacion.avanzar_hasta(math.inf)
+        return self.simulacion.finalizar_simulacion()
+
+
+def _servir_oficina(conexion, config: Dict, tiempo_total_horas: float, derivar_visitas: bool):
+    """Bucle del proceso de una oficina: atiende los pedidos del coordinador por el pipe"""
+    oficina = OficinaLocal(config, tiempo_total_horas, derivar_visitas)
+    conexion.send(oficina.estado())
+    while True:
+        pedido = conexion.recv()
+        if pedido[0] == 'avanzar':
+            conexion.send(oficina.avanzar(pedido[1], pedido[2]))
+        else:
+            conexion.send(oficina.finalizar())
+            break
+    conexion.close()
+
+
+class OficinaRemota:
+    """Oficina que corre en su propio proceso; el pedido y la respuesta van separados
+    para que el coordinador lance todas las oficinas antes de esperar a ninguna"""
+
+    def __init__(self, config: Dict, tiempo_total_horas: float, derivar_visitas: bool = True):
+        self.conexion, extremo_hijo = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(
+            target=_servir_oficina, args=(extremo_hijo, config, tiempo_total_horas, derivar_visitas), daemon=True,
+        )
+        self.proceso.start()
+        extremo_hijo.close()
+        self._estado = self.conexion.recv()
+
+    def estado(self) -> Tuple[float, int]:
+        return self._estado
+
+    def pedir_avance(self, hasta: float, llegadas: List[float]):
+        self.conexion.send(('avanzar', hasta, llegadas))
+
+    def recibir_avance(self) -> Tuple[List[float], float, int]:
+        salientes, *self._estado = self.conexion.recv()
+        return salientes, *self._estado
+
+    def avanzar(self, hasta: float, llegadas: List[float]) -> Tuple[List[float], float, int]:
+        self.pedir_avance(hasta, llegadas)
+        return self.recibir_avance()
+
+    def finalizar(self) -> ResultadoSimulacion:
+        self.conexion.send(('finalizar',))
+        resultado = self.conexion.recv()
+        self.proceso.join()
+        return resultado
+
+
+@dataclass
+class ResultadoRed:
+    """Resultados por oficina + costo de la sincronización"""
+    oficinas: List[ResultadoSimulacion]
+    lookahead: float  # En minutos
+    ventanas: int
+    mensajes: int  # Visitas derivadas entregadas
+    segundos: float  # Tiempo de reloj total
+
+    @property
+    def total_ventas(self) -> int:
+        return sum(r.total_ventas for r in self.oficinas)
+
+    @property
+    def total_visitas_generadas(self) -> int:
+        return sum(r.total_visitas_generadas for r in self.oficinas)
+
+    @property
+    def visitas_perdidas(self) -> int:
+        """Perdidas sin agentes en cada oficina más las derivadas que se perdieron en destino (por cualquier causa)"""
+        return sum(r.visitas_perdidas + r.visitas_derivadas_perdidas for r in self.oficinas)
+
+    @property
+    def eventos_procesados(self) -> int:
+        return sum(r.eventos_procesados for r in self.oficinas)
+
+
+def configuraciones_oficinas(config_base: Dict, cantidad: int, semilla_base: Optional[int] = None) -> List[Dict]:
+    """`cantidad` oficinas iguales con flujos aleatorios independientes (como réplicas)"""
+    if semilla_base is None:
+        semilla_base = config_base.get('semilla')
+        if not isinstance(semilla_base, int):
+            semilla_base = None
+    if semilla_base is None:
+        semilla_base = np.random.SeedSequence().entropy
+    return [dict(config_base, semilla=semilla_replica(semilla_base, oficina)) for oficina in range(cantidad)]
+
+
+def calcular_lookahead(configs: List[Dict]) -> float:
+    """Retardo mínimo de una derivación: el primer contacto más corto de la red"""
+    lookahead = min(config['tiempo_primer_contacto'] for config in configs)
+    if lookahead <= 0:
+        raise ValueError(
+            f"La red necesita tiempo_primer_contacto > 0 en todas las oficinas (lookahead = {lookahead})"
+        )
+    return lookahead
+
+
+def repartir_derivaciones(
+    salientes: List[List[float]], libres: List[int], lookahead: float, tiempo_limite: float,
+) -> Tuple[List[List[float]], int]:
+    """Asigna cada visita derivada a la oficina con más agentes libres en la barrera
+    (sin contar la de origen; empate → menor índice). Devuelve las llegadas por oficina."""
+    libres = list(libres)
+    llegadas: List[List[float]] = [[] for _ in salientes]
+    mensajes = 0
+    pendientes = sorted((tiempo, origen) for origen, tiempos in enumerate(salientes) for tiempo in tiempos)
+    for tiempo, origen in pendientes:
+        llegada = tiempo + lookahead
+        if llegada > tiempo_limite:
+            continue  # Llegaría después del horizonte
+        destino = max((i for i in range(len(libres)) if i != origen), key=lambda i: (libres[i], -i))
+        libres[destino] -= 1
+        llegadas[destino].append(llegada)
+        mensajes += 1
+    return llegadas, mensajes
+
+
+def ejecutar_red(
+    configs: List[Dict],
+    tiempo_total_horas: float,
+    derivar_visitas: bool = True,
+    en_paralelo: bool = True,
+    reporte: bool = True,
+) -> ResultadoRed:
+    """Corre una oficina por configuración, sincronizadas por ventanas de lookahead.
+
+    - `derivar_visitas`: False = oficinas aisladas (igual que corridas independientes)
+    - `en_paralelo`: una oficina por proceso; False = todas en este proceso (mismo resultado)
+    """
+    if len(configs) < 2:
+        raise ValueError("La red necesita al menos 2 oficinas")
+    lookahead = calcular_lookahead(configs)
+    tiempo_limite = tiempo_total_horas * 60
+    tipo_oficina = OficinaRemota if en_paralelo else OficinaLocal
+
+    inicio = time.perf_counter()
+    oficinas = [tipo_oficina(config, tiempo_total_horas, derivar_visitas) for config in configs]
+    estados = [oficina.estado() for oficina in oficinas]
+    llegadas: List[List[float]] = [[] for _ in oficinas]
+    ventanas = mensajes = 0
+    while True:
+        inicio_ventana = min(
+            [proximo for proximo, _ in estados] + [min(tiempos) for tiempos in llegadas if tiempos]
+        )
+        if inicio_ventana == math.inf:
+            break
+        fin_ventana = inicio_ventana + lookahead
+        if en_paralelo:
+            for oficina, tiempos in zip(oficinas, llegadas):
+                oficina.pedir_avance(fin_ventana, tiempos)
+            respuestas = [oficina.recibir_avance() for oficina in oficinas]
+        else:
+            respuestas = [oficina.avanzar(fin_ventana, tiempos) for oficina, tiempos in zip(oficinas, llegadas)]
+        estados = [(proximo, libres) for _, proximo, libres in respuestas]
+        llegadas, entregados = repartir_derivaciones(
+            [salientes for salientes, _, _ in respuestas], [libres for _, libres in estados], lookahead, tiempo_limite,
+        )
+        mensajes += entregados
+        ventanas += 1
+
+    resultado = ResultadoRed(
+        [oficina.finalizar() for oficina in oficinas], lookahead, ventanas, mensajes, time.perf_counter() - inicio,
+    )
+    if reporte:
+        imprimir_resumen_red(resultado)
+    return resultado
+
+
+def imprimir_resumen_red(resultado: ResultadoRed):
+    """Tabla por oficina con las derivaciones enviadas/recibidas"""
+    print("\n" + "=" * 80)
+    print(f"🏢 RED DE OFICINAS: {len(resultado.oficinas)} oficinas (lookahead {resultado.lookahead:.0f} min)")
+    print("=" * 80)
+    print(f"  {'Oficina':<9}{'Ventas':>9}{'Visitas':>11}{'Perdidas':>10}{'Derivadas':>11}{'Recibidas':>11}"
+          f"{'Rec. perd.':>11}{'Utiliz.':>9}")
+    for i, r in enumerate(resultado.oficinas):
+        print(f"  {i:<9}{r.total_ventas:>9,}{r.total_visitas_generadas:>11,}{r.visitas_perdidas:>10,}"
+              f"{r.visitas_derivadas_enviadas:>11,}{r.visitas_derivadas_recibidas:>11,}"
+              f"{r.visitas_derivadas_perdidas:>11,}{r.utilizacion_promedio:>9.1%}")
+    print(f"  {'Total':<9}{resultado.total_ventas:>9,}{resultado.total_visitas_generadas:>11,}"
+          f"{resultado.visitas_perdidas:>10,}{resultado.mensajes:>11,}")
+    print(f"\n  🔄 Ventanas de sincronización: {resultado.ventanas:,} "
+          f"({resultado.mensajes / max(resultado.ventanas, 1):.2f} mensajes por ventana)")
+    print(f"  ⏱️  {resultado.segundos:.1f} s de reloj, {resultado.eventos_procesados / max(resultado.segundos, 1e-9):,.0f} eventos/seg")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    ejecutar_red(configuraciones_oficinas(CONFIGURACION, 4, semilla_base=2025), tiempo_total_horas=8760)
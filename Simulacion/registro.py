@@ -0,0 +1,185 @@
+"""
+Registro de actividades de la simulación (logging estructurado y perezoso).
+
+Los manejadores de eventos no arman strings: emiten un código de mensaje y sus
+argumentos. El texto se formatea recién cuando un sumidero lo consume (al
+escribir en archivo o al leer el buffer en memoria). Si no hay sumideros para
+un nivel, registrar cuesta sólo una comparación.
+"""
+import os
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Códigos de mensaje
+NUEVA_PROPIEDAD = 0
+VISITA_FUERA_HORARIO = 1
+VISITA_SIN_PROPIEDADES = 2
+VISITA_SIN_AGENTES = 3
+VISITA_ATENDIDA = 4
+PROPIEDAD_NO_ENCONTRADA = 5
+VENTA_RECHAZADA = 6
+VISITA_CON_VENTA = 7
+VISITA_SIN_VENTA = 8
+FIN_PAPELES = 9
+ARREPENTIMIENTO = 10
+INICIO_VERIFICACION = 11
+FIN_RENEGOCIACION = 12
+RENEGOCIACION_EXITOSA = 13
+RENEGOCIACION_FALLIDA = 14
+FIN_VERIFICACION = 15
+VENTA_CONCRETADA = 16
+REPOSICION_PROPIEDAD = 17
+
+Registro = Tuple[float, int, tuple]  # (tiempo, codigo, argumentos)
+
+
+def formatear_horas_minutos(minutos_totales: float) -> str:
+    """Convierte minutos totales a formato HH:MM"""
+    return f"{int(minutos_totales // 60):02d}:{int(minutos_totales % 60):02d}"
+
+
+# Formateadores por código: reciben los argumentos emitidos y devuelven el texto
+FORMATOS: Dict[int, Callable[..., str]] = {
+    NUEVA_PROPIEDAD: lambda pid, activas: f"✨ NUEVA PROPIEDAD {pid} publicada - Total activas: {activas}",
+    VISITA_FUERA_HORARIO: lambda minuto: f"❌ VISITA FUERA DE HORARIO - Hora: {minuto:.0f} min del día",
+    VISITA_SIN_PROPIEDADES: lambda: "❌ VISITA PERDIDA - No hay propiedades activas",
+    VISITA_SIN_AGENTES: lambda pid: f"❌ VISITA PERDIDA prop {pid} - No hay agentes",
+    VISITA_ATENDIDA: lambda aid, pid, n: f"Agente {aid} → VISITA prop {pid} (#{n})",
+    PROPIEDAD_NO_ENCONTRADA: lambda pid: f"⚠️ Prop {pid} no encontrada",
+    VENTA_RECHAZADA: lambda aid, n, maximo: (
+        f"❌ Venta RECHAZADA - Agente {aid} tiene {n} props en verificación (máx: {maximo})"
+    ),
+    VISITA_CON_VENTA: lambda aid, pid: f"Agente {aid} COMPLETA visita prop {pid} - ✅ VENTA",
+    VISITA_SIN_VENTA: lambda aid, pid: f"Agente {aid} COMPLETA visita prop {pid} - ❌ SIN VENTA",
+    FIN_PAPELES: lambda aid, pid: f"Agente {aid} COMPLETA papeles prop {pid}",
+    ARREPENTIMIENTO: lambda pid: f"ARREPENTIMIENTO prop {pid}",
+    INICIO_VERIFICACION: lambda pid: f"Prop {pid} → VERIFICACIÓN",
+    FIN_RENEGOCIACION: lambda aid, pid: f"Agente {aid} COMPLETA renegociación prop {pid}",
+    RENEGOCIACION_EXITOSA: lambda pid: f"RENEGOCIACIÓN EXITOSA prop {pid}",
+    RENEGOCIACION_FALLIDA: lambda pid: f"RENEGOCIACIÓN FALLIDA prop {pid}",
+    FIN_VERIFICACION: lambda pid: f"VERIFICACIÓN COMPLETADA prop {pid}",
+    VENTA_CONCRETADA: lambda pid, aid, tiempo, visitas: (
+        f"🎉 VENTA prop {pid} por Agente {aid} - "
+        f"Tiempo: {formatear_horas_minutos(tiempo)} - Visitas: {visitas}"
+    ),
+    REPOSICION_PROPIEDAD: lambda pid, activas: (
+        f"🔄 Propiedad {pid} vendida → Nueva propiedad creada - Total activas: {activas}"
+    ),
+}
+
+
+def formatear(registro: Registro) -> str:
+    """Texto legible de un registro: 'HH:MM -> mensaje'"""
+    tiempo, codigo, argumentos = registro
+    return f"{formatear_horas_minutos(tiempo)} -> {FORMATOS[codigo](*argumentos)}"
+
+
+class SumideroMemoria:
+    """Buffer circular en memoria: conserva sólo los últimos `capacidad` registros"""
+
+    def __init__(self, capacidad: int = 10000):
+        self.registros: Deque[Registro] = deque(maxlen=capacidad)
+        self.total = 0  # Registros recibidos (incluye los descartados por el buffer)
+
+    def consumir(self, registro: Registro):
+        self.registros.append(registro)
+        self.total += 1
+
+    def __len__(self) -> int:
+        return len(self.registros)
+
+    def __iter__(self) -> Iterator[str]:
+        """Itera los mensajes ya formateados"""
+        return (formatear(registro) for registro in self.registros)
+
+    def cerrar(self):
+        pass
+
+
+class SumideroArchivo:
+    """Escribe cada registro como una línea de texto a medida que llega"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.archivo = open(ruta, 'w', encoding='utf-8')
+        self.total = 0
+
+    def consumir(self, registro: Registro):
+        self.archivo.write(formatear(registro))
+        self.archivo.write("\n")
+        self.total += 1
+
+    def cerrar(self):
+        if not self.archivo.closed:
+            self.archivo.close()
+
+    def __getstate__(self):
+        # Para checkpoints: se guarda hasta dónde se escribió, no el archivo abierto
+        estado = dict(self.__dict__)
+        archivo = estado.pop('archivo')
+        if not archivo.closed:
+            archivo.flush()
+            estado['posicion'] = archivo.buffer.tell()
+        else:
+            estado['posicion'] = None
+        return estado
+
+    def __setstate__(self, estado):
+        posicion = estado.pop('posicion')
+        self.__dict__.update(estado)
+        if posicion is None:
+            # Ya estaba cerrado: se restaura como cerrado, sin tocar el archivo
+            self.archivo = open(os.devnull, 'w')
+            self.archivo.close()
+            return
+        # Descartar lo escrito después del checkpoint y seguir agregando
+        with open(self.ruta, 'r+b') as archivo:
+            archivo.truncate(posicion)
+        self.archivo = open(self.ruta, 'a', encoding='utf-8')
+
+
+class RegistroActividades:
+    """Reparte los registros entre los sumideros según su nivel.
+
+    - `criticos`: reciben sólo los registros críticos (ventas, errores, ...)
+    - `detalle`: reciben todos los registros
+    """
+
+    def __init__(self):
+        self.sumideros_criticos: List = []  # Consumen los registros críticos (incluye los de detalle)
+        self.sumideros_detalle: List = []  # Consumen todo
+
+    def agregar_sumidero(self, sumidero, solo_criticos: bool = True):
+        if not solo_criticos:
+            self.sumideros_detalle.append(sumidero)
+        self.sumideros_criticos.append(sumidero)
+
+    def cerrar(self):
+        for sumidero in self.sumideros_criticos:
+            sumidero.cerrar()
+
+
+def crear_registro(config: Dict) -> Tuple[RegistroActividades, Optional[SumideroMemoria], Optional[SumideroMemoria]]:
+    """Arma el registro según la configuración.
+
+    Devuelve (registro, buffer de eventos críticos, buffer de detalle); los
+    buffers son None si no están habilitados.
+    """
+    registro = RegistroActividades()
+    verbose = config.get('verbose_logging', False)
+
+    criticos = None
+    capacidad_criticos = config.get('capacidad_log_criticos', 1000)
+    if capacidad_criticos:
+        criticos = SumideroMemoria(capacidad_criticos)
+        registro.agregar_sumidero(criticos, solo_criticos=True)
+
+    detalle = None
+    if verbose:
+        detalle = SumideroMemoria(config.get('capacidad_log_actividades', 10000))
+        registro.agregar_sumidero(detalle, solo_criticos=False)
+
+    if config.get('archivo_log'):
+        registro.agregar_sumidero(SumideroArchivo(config['archivo_log']), solo_criticos=not verbose)
+
+    return registro, criticos, detalle
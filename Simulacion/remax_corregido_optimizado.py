@@ -1,35 +1,74 @@
-import random
 import heapq
 import pandas as pd
 import math
-from typing import List, Dict, Optional, Set
+import time
+from array import array
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Dict, NamedTuple, Optional, Set
+
+from cola_eventos import (
+    crear_cola_eventos, NOMBRES_EVENTOS, VISITA, FIN_VISITA, FIN_GESTION_PAPELES, RENEGOCIACION, FIN_VERIFICACION,
+    FIN_ESCRIBANIA, VISITA_DERIVADA,
+)
+from flujos_aleatorios import crear_flujos
+import registro as log
+from estadisticas import AcumuladorTemporal, DetectorCalentamiento, EstadisticaOnline
+import traza
+from traza import RegistradorTraza
+from checkpoint import cargar_checkpoint, guardar_checkpoint
+from perfilado import PerfilEventos
+from resultados import (
+    Progreso, ResultadoAgente, ResultadoSimulacion, ResumenSerie, formatear_dias_horas, imprimir_progreso, imprimir_reporte,
+)
+
+MINUTOS_POR_DIA = 24 * 60
+# Eventos que siempre se programan a `ahora + duración fija de la configuración`: con la cola
+# 'carriles' van a una deque FIFO cada uno. Si alguna duración pasa a ser aleatoria, sacarla de acá.
+CODIGOS_DEMORA_CONSTANTE = (FIN_VISITA, FIN_GESTION_PAPELES, RENEGOCIACION, FIN_VERIFICACION, FIN_ESCRIBANIA)
+EVENTOS_POR_CONSULTA_RELOJ = 1024  # Cada cuántos eventos se mira el reloj para el callback de progreso
+# Contadores de salida que se descartan al truncar el calentamiento
+CONTADORES_SALIDA = (
+    'total_ventas', 'ventas_perdidas', 'visitas_perdidas', 'visitas_perdidas_fuera_horario', 'visitas_sin_venta',
+    'total_visitas_generadas', 'ventas_ganadas_por_re_engagement', 'visitas_perdidas_por_limite_verificacion',
+    'visitas_derivadas_enviadas', 'visitas_derivadas_recibidas', 'visitas_derivadas_perdidas',
+    'propiedades_creadas_nuevas',
+)
+
+# Etapas de una gestión (visita o venta en curso); None = sin gestión
+ETAPAS = ('visita', 'papeles', 'renegociacion', 'verificacion', 'espera_escribania', 'escribania')
 
 class Propiedad:
+    # ✅ OPTIMIZADO: __slots__ evita el __dict__ por instancia (hay cientos de miles en corridas largas)
+    __slots__ = (
+        'id', 'tiempo_ultima_visita_agente', 'arrepentimiento', 'contador_renegociaciones', 'en_venta',
+        'agente_asignado', 'paso_verificacion', 'etapa_actual', 'total_visitas_recibidas', 'tiempo_creacion',
+        'gestiones_abiertas',
+    )
+
     def __init__(self, id_propiedad):
         self.id = id_propiedad
-        self.tiempo_comprometido_agente = 0
         self.tiempo_ultima_visita_agente = 0
-        self.flag_escribania = False
-        self.flag_verificacion = False
-        self.contador_dias_verificacion = 0
         self.arrepentimiento = False
         self.contador_renegociaciones = 0
         self.en_venta = False
-        self.historial_estados = []
         self.agente_asignado = None
         self.paso_verificacion = False
         self.etapa_actual = None
         self.total_visitas_recibidas = 0
         self.tiempo_creacion = 0
+        self.gestiones_abiertas = 0  # Visitas y ventas en curso sobre esta propiedad
 
 class Agente:
+    __slots__ = (
+        'id', 'disponible', 'propiedad_asignada', 'tiempo_total_bloqueado', 'tiempo_inicio_bloqueo',
+        'tiempo_ultima_actividad', 'contador_tareas', 'propiedades_en_verificacion', 'escribanias_pendientes',
+        'numeros_comunes',
+    )
+
     def __init__(self, id_agente):
         self.id = id_agente
         self.disponible = True
-        self.tiempo_comprometido_propiedad = {}
-        self.tiempo_proxima_visita = 0
         self.propiedad_asignada = None
-        self.historial_bloqueos = []
         self.tiempo_total_bloqueado = 0
         self.tiempo_inicio_bloqueo = None
         self.tiempo_ultima_actividad = 0
@@ -38,6 +77,160 @@ class Agente:
         # ✅ NUEVO: Rastreo de propiedades en verificación
         self.propiedades_en_verificacion: Set[int] = set()  # IDs de propiedades
 
+        # ✅ NUEVO: Escribanías que esperan a que el agente se libere (FIFO)
+        self.escribanias_pendientes: Deque[int] = deque()
+
+        # ✅ NUEVO: Decisiones pre-sorteadas de la visita en curso (modo CRN): (venta, arrepentimiento, U reengagement)
+        self.numeros_comunes = None
+
+class IndiceAgentesDisponibles:
+    """✅ OPTIMIZADO: Índice de agentes disponibles ordenado por (contador_tareas, id).
+
+    Min-heap con borrado perezoso: una entrada es válida sólo si el agente sigue
+    disponible y su contador de tareas no cambió desde que se insertó. Como el
+    contador sólo crece al bloquear, las entradas viejas quedan siempre por debajo
+    de las vigentes y se descartan al llegar a la cima.
+    """
+
+    def __init__(self, agentes: Dict[int, Agente]):
+        self._agentes = agentes
+        self._heap = [(agente.contador_tareas, agente_id) for agente_id, agente in agentes.items()]
+        heapq.heapify(self._heap)
+        self._cantidad = len(agentes)
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def agregar(self, agente_id: int):
+        """O(log k): el agente vuelve a estar disponible"""
+        heapq.heappush(self._heap, (self._agentes[agente_id].contador_tareas, agente_id))
+        self._cantidad += 1
+
+    def quitar(self, agente_id: int):
+        """O(1): la entrada se invalida y se limpia al llegar a la cima"""
+        self._cantidad -= 1
+
+    def minimo(self) -> Optional[int]:
+        """O(log k) amortizado: agente disponible con menos tareas (desempata por id)"""
+        heap = self._heap
+        agentes = self._agentes
+        while heap:
+            contador, agente_id = heap[0]
+            agente = agentes[agente_id]
+            if agente.disponible and agente.contador_tareas == contador:
+                return agente_id
+            heapq.heappop(heap)
+        return None
+
+class IndicePropiedadesActivas:
+    """✅ OPTIMIZADO: Contenedor indexado de propiedades activas.
+
+    Guarda las propiedades en un arreglo contiguo más un diccionario id → posición,
+    lo que permite búsqueda, inserción, borrado (swap-remove) y muestreo uniforme
+    en O(1), sin crear listas temporales en cada visita.
+    """
+
+    def __init__(self):
+        self._propiedades: List[Propiedad] = []
+        self._posicion: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._propiedades)
+
+    def __contains__(self, propiedad_id: int) -> bool:
+        return propiedad_id in self._posicion
+
+    def __getitem__(self, propiedad_id: int) -> Propiedad:
+        return self._propiedades[self._posicion[propiedad_id]]
+
+    def __setitem__(self, propiedad_id: int, propiedad: Propiedad):
+        posicion = self._posicion.get(propiedad_id)
+        if posicion is None:
+            self._posicion[propiedad_id] = len(self._propiedades)
+            self._propiedades.append(propiedad)
+        else:
+            self._propiedades[posicion] = propiedad
+
+    def __delitem__(self, propiedad_id: int):
+        # Swap-remove: la última propiedad ocupa el hueco del borrado
+        posicion = self._posicion.pop(propiedad_id)
+        ultima = self._propiedades.pop()
+        if posicion < len(self._propiedades):
+            self._propiedades[posicion] = ultima
+            self._posicion[ultima.id] = posicion
+
+    def __iter__(self):
+        return iter(self._posicion)
+
+    def get(self, propiedad_id: int, default=None) -> Optional[Propiedad]:
+        posicion = self._posicion.get(propiedad_id)
+        if posicion is None:
+            return default
+        return self._propiedades[posicion]
+
+    def keys(self):
+        return self._posicion.keys()
+
+    def values(self) -> List[Propiedad]:
+        return self._propiedades
+
+    def elegir_aleatoria(self, u: float) -> Propiedad:
+        """Devuelve una propiedad activa con probabilidad uniforme en O(1) a partir de U ~ U(0,1)"""
+        return self._propiedades[int(u * len(self._propiedades))]
+
+class CorteEstadisticas(NamedTuple):
+    """Acumulados de salida al fin de un lote del detector de calentamiento (posible punto de truncamiento)"""
+    tiempo: float
+    contadores: tuple  # En el orden de CONTADORES_SALIDA
+    integrales: tuple  # Integral de cada acumulador de estado hasta `tiempo`
+    maximos: tuple  # Extremos de cada acumulador en el tramo que termina en `tiempo`
+    minimos: tuple
+    tiempos_bloqueado: tuple  # Tiempo bloqueado de cada agente hasta `tiempo`
+    propiedades_activas: int
+
+
+class PropiedadVendida(NamedTuple):
+    """Fila de solo lectura del registro de propiedades vendidas"""
+    id: int
+    tiempo_creacion: float
+    tiempo_venta: float
+    total_visitas_recibidas: int
+    contador_renegociaciones: int
+
+class ColumnasPropiedadesVendidas:
+    """✅ OPTIMIZADO: Registro columnar de propiedades vendidas.
+
+    En lugar de conservar cada objeto Propiedad, guarda sólo los campos que se
+    consultan después de la venta en arrays tipados (~29 bytes por propiedad
+    contra ~400 de un objeto con __dict__ más su entrada en un diccionario).
+    """
+
+    def __init__(self):
+        self.id = array('q')
+        self.tiempo_creacion = array('d')
+        self.tiempo_venta = array('d')
+        self.total_visitas_recibidas = array('l')
+        self.contador_renegociaciones = array('b')
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def agregar(self, propiedad: Propiedad, tiempo_venta: float):
+        self.id.append(propiedad.id)
+        self.tiempo_creacion.append(propiedad.tiempo_creacion)
+        self.tiempo_venta.append(tiempo_venta)
+        self.total_visitas_recibidas.append(propiedad.total_visitas_recibidas)
+        self.contador_renegociaciones.append(propiedad.contador_renegociaciones)
+
+    def __getitem__(self, fila: int) -> PropiedadVendida:
+        return PropiedadVendida(
+            self.id[fila], self.tiempo_creacion[fila], self.tiempo_venta[fila],
+            self.total_visitas_recibidas[fila], self.contador_renegociaciones[fila],
+        )
+
+    def __iter__(self) -> Iterator[PropiedadVendida]:
+        return (self[fila] for fila in range(len(self)))
+
 class SimulacionInmobiliaria:
     def __init__(self, config: Dict):
         # Configuración de parámetros
@@ -64,6 +257,8 @@ class SimulacionInmobiliaria:
         if self.usar_jornada_laboral:
             self.hora_inicio_jornada = config.get('hora_inicio_jornada', 9) * 60  # 9 AM en minutos
             self.hora_fin_jornada = config.get('hora_fin_jornada', 18) * 60  # 6 PM en minutos
+        # ✅ NUEVO: Saltar el horario cerrado sin generar un evento por cada visita perdida
+        self.saltar_horario_cerrado = self.usar_jornada_laboral and config.get('saltar_horario_cerrado', False)
         
         # ✅ NUEVO: Parámetros para distribución de tiempo entre visitas
         self.usar_distribucion = config.get('usar_distribucion_visitas', False)
@@ -78,17 +273,38 @@ class SimulacionInmobiliaria:
             self.dist_m = self.dist_loc + self.dist_c * self.dist_scale
             # Calcular media de la triangular como referencia
             self.tiempo_entre_visitas = (self.dist_a + self.dist_m + self.dist_b) / 3
+            # Varianza de la triangular (para contar en bloque las visitas fuera de horario)
+            self.varianza_entre_visitas = (
+                self.dist_a ** 2 + self.dist_b ** 2 + self.dist_m ** 2
+                - self.dist_a * self.dist_b - self.dist_a * self.dist_m - self.dist_b * self.dist_m
+            ) / 18
         else:
             # Tiempo fijo (modelo simple)
             self.tiempo_entre_visitas = config['tiempo_entre_visitas']
+            self.varianza_entre_visitas = 0
+        
+        # ✅ NUEVO: Un flujo aleatorio (con su propia semilla) por proceso estocástico
+        self.semilla = config.get('semilla')
+        self.flujos = crear_flujos(config, self.semilla)
+        self.siguiente_tiempo_visita = self.flujos['visitas'].siguiente
+        self.siguiente_u_propiedad = self.flujos['propiedades'].siguiente
+        self.siguiente_venta = self.flujos['venta'].siguiente
+        self.siguiente_arrepentimiento = self.flujos['arrepentimiento'].siguiente
+        self.siguiente_u_reengagement = self.flujos['reengagement'].siguiente
+
+        # ✅ NUEVO: Números aleatorios comunes (CRN): cada llegada sortea de entrada todas sus
+        # decisiones, así la k-ésima visita ve los mismos números en cualquier configuración
+        self.numeros_aleatorios_comunes = config.get('numeros_aleatorios_comunes', False)
         
         # ✅ OPTIMIZACIÓN 1: Usar diccionarios para búsquedas O(1)
         self.agentes = {i: Agente(i) for i in range(self.num_agentes)}
-        self.agentes_disponibles: Set[int] = set(range(self.num_agentes))  # Índice de disponibles
+        self.agentes_disponibles = IndiceAgentesDisponibles(self.agentes)  # Índice de disponibles
         
         # ✅ OPTIMIZACIÓN 2: Diccionarios de propiedades por estado
-        self.propiedades_activas: Dict[int, Propiedad] = {}
-        self.propiedades_vendidas: Dict[int, Propiedad] = {}
+        self.propiedades_activas = IndicePropiedadesActivas()
+        # ✅ NUEVO: Guardar el detalle de cada propiedad vendida es opcional (crece con el horizonte)
+        self.retener_propiedades_vendidas = config.get('retener_propiedades_vendidas', False)
+        self.propiedades_vendidas = ColumnasPropiedadesVendidas() if self.retener_propiedades_vendidas else None
         self.propiedades_expiradas: Dict[int, Propiedad] = {}
         
         # Crear propiedades activas al inicio
@@ -98,13 +314,24 @@ class SimulacionInmobiliaria:
             self.propiedades_activas[i] = prop
         
         self.tiempo_actual = 0
+        self.tiempo_total_minutos = 0
         self.total_ventas = 0
         self.ventas_perdidas = 0
         self.visitas_perdidas = 0
         self.visitas_perdidas_fuera_horario = 0
         self.visitas_sin_venta = 0
         self.total_visitas_generadas = 0
-        self.eventos = []
+        # ✅ NUEVO: Lista de eventos futuros configurable (heap, calendar queue o carriles FIFO)
+        self.eventos = crear_cola_eventos(config.get('cola_eventos', 'heap'), CODIGOS_DEMORA_CONSTANTE)
+        self.eventos_procesados = 0
+        self.eventos_por_segundo = 0.0
+        self.segundos_bucle = 0.0  # Tiempo de reloj acumulado en el bucle principal
+
+        # ✅ NUEVO: Checkpoints periódicos (intervalo en tiempo SIMULADO)
+        self.ruta_checkpoint = config.get('ruta_checkpoint')
+        intervalo_checkpoint_horas = config.get('intervalo_checkpoint_horas')
+        self.intervalo_checkpoint = intervalo_checkpoint_horas * 60 if intervalo_checkpoint_horas and self.ruta_checkpoint else None
+        self.proximo_checkpoint = self.intervalo_checkpoint if self.intervalo_checkpoint else math.inf
         self.ventas_ganadas_por_re_engagement = 0
         
         # ✅ NUEVO: Control de reposición de propiedades
@@ -114,15 +341,66 @@ class SimulacionInmobiliaria:
         
         self.max_propiedades_verificacion_por_agente = config.get('max_propiedades_verificacion_por_agente', 3)
         self.visitas_perdidas_por_limite_verificacion = 0
+
+        # ✅ NUEVO: Red de oficinas: buzón con los tiempos de las visitas sin agente a derivar
+        # (None = oficina aislada, la visita se pierde; lo activa red_oficinas)
+        self.derivaciones: Optional[List[float]] = None
+        self.visitas_derivadas_enviadas = 0
+        self.visitas_derivadas_recibidas = 0
+        # Recibidas que se pierden acá (cerrado, sin propiedades o sin agentes): aparte de las
+        # pérdidas propias, porque no están en total_visitas_generadas de esta oficina
+        self.visitas_derivadas_perdidas = 0
         
         # Métricas
-        self.tiempos_venta = []
-        self.utilizacion_agentes = [0] * self.num_agentes
+        # ✅ NUEVO: Estadísticas online (memoria constante sin importar el horizonte)
+        self.estadistica_tiempo_venta = EstadisticaOnline(cuantiles=(0.5, 0.9))
+        self.estadistica_visitas_por_venta = EstadisticaOnline()
+        # ✅ NUEVO: Promedios temporales de las variables de estado (O(1) por cambio, sin series)
+        self.estado_propiedades_activas = AcumuladorTemporal(len(self.propiedades_activas))  # N(t)
+        self.estado_propiedades_en_espera = AcumuladorTemporal(len(self.propiedades_activas))  # Q(t): sin gestión en curso
+        self.estado_propiedades_en_gestion = AcumuladorTemporal()  # B(t): con al menos una gestión en curso
+        self.estado_etapas = {etapa: AcumuladorTemporal() for etapa in ETAPAS}  # Gestiones en cada etapa
+        self.estado_agentes_ocupados = AcumuladorTemporal()
+
+        # ✅ NUEVO: Detección del calentamiento (MSER-5 sobre ventas y utilización diarias)
+        self.detector_calentamiento = None
+        self.proximo_corte_diario = math.inf
+        if config.get('detectar_calentamiento', False):
+            self.detector_calentamiento = DetectorCalentamiento(
+                ('ventas', 'utilizacion'),
+                tamano_lote=config.get('tamano_lote_calentamiento', 5),
+                lotes_minimos=config.get('lotes_minimos_calentamiento', 20),
+                lotes_maximos=config.get('lotes_maximos_calentamiento', 200),
+            )
+            self.proximo_corte_diario = MINUTOS_POR_DIA
+        self.ventas_al_corte = 0
+        self.integral_ocupados_al_corte = 0.0
+        self.tiempo_inicio_medicion = 0  # Las estadísticas miden desde acá (fin del calentamiento)
+        self.propiedades_activas_inicio_medicion = len(self.propiedades_activas)
+        # Mientras el detector no decide: un corte por lote y las ventas con su tiempo, para poder
+        # truncar después en el punto MSER (que cae en el pasado) sin guardar series por evento.
+        # Acotado por lotes_maximos_calentamiento: si no decide antes, se descartan
+        self.cortes_calentamiento: Optional[List[CorteEstadisticas]] = None
+        self.ventas_calentamiento: Optional[List[tuple]] = None
+        if self.detector_calentamiento is not None:
+            self.cortes_calentamiento = []
+            self.ventas_calentamiento = []
+            self.registrar_corte(0)
         
-        # ✅ OPTIMIZACIÓN 3: Logging configurable (solo eventos importantes)
+        # ✅ OPTIMIZACIÓN 3: Logging estructurado y perezoso (se formatea sólo al consumirse)
         self.verbose_logging = config.get('verbose_logging', False)
-        self.log_actividades = []
-        self.log_eventos_criticos = []  # Solo ventas, errores, etc.
+        self.registro, self.log_eventos_criticos, self.log_actividades = log.crear_registro(config)
+        self._sumideros_criticos = self.registro.sumideros_criticos  # Solo ventas, errores, etc.
+        self._sumideros_detalle = self.registro.sumideros_detalle
+
+        # ✅ NUEVO: Traza binaria opcional de cada evento procesado
+        directorio_traza = config.get('directorio_traza')
+        self.registrador_traza = RegistradorTraza(directorio_traza) if directorio_traza else None
+        self.propiedad_visitada = -1  # Propiedad/agente de la última llegada (para la traza)
+        self.agente_visita = -1
+
+        # ✅ NUEVO: Perfilado opcional del bucle de despacho (sin costo si está desactivado)
+        self.perfil = PerfilEventos() if config.get('perfilar_eventos', False) else None
         
     def convertir_a_horas_minutos(self, minutos_totales: float) -> str:
         """Convierte minutos totales a formato HH:MM"""
@@ -132,58 +410,71 @@ class SimulacionInmobiliaria:
     
     def convertir_a_dias_horas(self, horas_totales: float) -> str:
         """Convierte horas totales a formato legible (años, días, horas)"""
-        años = int(horas_totales // (365 * 24))
-        resto_horas = horas_totales % (365 * 24)
-        dias = int(resto_horas // 24)
-        horas = int(resto_horas % 24)
-        
-        partes = []
-        if años > 0:
-            partes.append(f"{años} año{'s' if años != 1 else ''}")
-        if dias > 0:
-            partes.append(f"{dias} día{'s' if dias != 1 else ''}")
-        if horas > 0:
-            partes.append(f"{horas} hora{'s' if horas != 1 else ''}")
-        
-        return ", ".join(partes) if partes else "0 horas"
+        return formatear_dias_horas(horas_totales)
     
     def generar_tiempo_entre_visitas(self) -> float:
         """✅ NUEVO: Genera tiempo entre visitas según configuración"""
         if self.usar_distribucion:
-            # Inverse sampling de distribución Triangular
-            U = random.uniform(0, 1)
-            
-            if U <= self.dist_c:
-                # Primera rama: [a, m]
-                X = self.dist_a + math.sqrt(U * (self.dist_b - self.dist_a) * (self.dist_m - self.dist_a))
-            else:
-                # Segunda rama: [m, b]
-                X = self.dist_b - math.sqrt((1 - U) * (self.dist_b - self.dist_a) * (self.dist_b - self.dist_m))
-            
-            return X
+            # Inverse sampling de distribución Triangular (vectorizado por bloques en el flujo)
+            return self.siguiente_tiempo_visita()
         else:
             # Tiempo fijo
             return self.tiempo_entre_visitas
     
-    def esta_en_horario_laboral(self) -> bool:
-        """✅ NUEVO: Verifica si el tiempo actual está dentro de la jornada laboral"""
+    def esta_en_horario_laboral(self, tiempo: Optional[float] = None) -> bool:
+        """✅ NUEVO: Verifica si el tiempo (por defecto el actual) está dentro de la jornada laboral"""
         if not self.usar_jornada_laboral:
             return True  # Si no se usa jornada, siempre es horario laboral
         
         # Obtener minutos del día actual (0-1439)
-        minutos_del_dia = self.tiempo_actual % 1440
+        minutos_del_dia = (self.tiempo_actual if tiempo is None else tiempo) % 1440
         
         return self.hora_inicio_jornada <= minutos_del_dia < self.hora_fin_jornada
+
+    def proxima_apertura(self, tiempo: float) -> float:
+        """Instante (en minutos) en que abre la próxima jornada a partir de un tiempo fuera de horario"""
+        inicio_dia = tiempo - tiempo % 1440
+        if tiempo % 1440 < self.hora_inicio_jornada:
+            return inicio_dia + self.hora_inicio_jornada
+        return inicio_dia + 1440 + self.hora_inicio_jornada
+
+    def saltar_periodo_cerrado(self, tiempo_llegada: float) -> float:
+        """✅ NUEVO: Cuenta en bloque las visitas que caen con la oficina cerrada.
+
+        Recibe la primera llegada fuera de horario y devuelve el tiempo de la
+        próxima llegada candidata a partir de la apertura. Las llegadas del
+        intervalo cerrado se cuentan sin generar eventos:
+          - tiempo fijo: cantidad exacta, conservando la fase de llegadas
+          - distribución: aproximación normal del proceso de renovación,
+            N(L) ~ Normal(L/μ, L·σ²/μ³)
+        """
+        apertura = self.proxima_apertura(tiempo_llegada)
+        fin_intervalo = min(apertura, self.tiempo_total_minutos)
+        longitud = max(fin_intervalo - tiempo_llegada, 0)
+
+        if self.usar_distribucion:
+            media = longitud / self.tiempo_entre_visitas
+            desvio = math.sqrt(longitud * self.varianza_entre_visitas / self.tiempo_entre_visitas ** 3)
+            llegadas_extra = max(0, round(media + desvio * self.flujos['fuera_horario'].siguiente()))
+            # Tiempo residual hasta la primera llegada posterior a la apertura
+            proxima = apertura + self.flujos['apertura'].siguiente() * self.generar_tiempo_entre_visitas()
+        else:
+            llegadas_extra = max(0, math.ceil(longitud / self.tiempo_entre_visitas) - 1)
+            proxima = tiempo_llegada + (llegadas_extra + 1) * self.tiempo_entre_visitas
+
+        if tiempo_llegada <= self.tiempo_total_minutos:
+            perdidas = 1 + llegadas_extra
+            self.total_visitas_generadas += perdidas
+            self.visitas_perdidas_fuera_horario += perdidas
+        return proxima
         
-    def registrar_actividad(self, mensaje: str, critico: bool = False):
-        """Registra actividades - solo verboso si está habilitado"""
-        if critico or self.verbose_logging:
-            tiempo_actual_str = self.convertir_a_horas_minutos(self.tiempo_actual)
-            log_entry = f"{tiempo_actual_str} -> {mensaje}"
-            if critico:
-                self.log_eventos_criticos.append(log_entry)
-            if self.verbose_logging:
-                self.log_actividades.append(log_entry)
+    def registrar_actividad(self, codigo: int, *argumentos, critico: bool = False):
+        """Registra una actividad como (tiempo, código, argumentos); el texto se arma en el sumidero"""
+        sumideros = self._sumideros_criticos if critico else self._sumideros_detalle
+        if sumideros:
+            registro = (self.tiempo_actual, codigo, argumentos)
+            for sumidero in sumideros:
+                sumidero.consumir(registro)
 
     def bloquear_agente(self, agente_id: int, propiedad_id: int, tipo_evento: str, duracion: float):
         """✅ OPTIMIZADO: Bloquea un agente y actualiza índice de disponibles"""
@@ -194,7 +485,8 @@ class SimulacionInmobiliaria:
             agente.tiempo_inicio_bloqueo = self.tiempo_actual
             agente.contador_tareas += 1
             # Remover de índice de disponibles
-            self.agentes_disponibles.discard(agente_id)
+            self.agentes_disponibles.quitar(agente_id)
+            self.estado_agentes_ocupados.sumar(self.tiempo_actual, 1)
 
     def desbloquear_agente(self, agente_id: int, propiedad_id: int):
         """✅ OPTIMIZADO: Desbloquea un agente y actualiza índice"""
@@ -207,36 +499,78 @@ class SimulacionInmobiliaria:
             agente.tiempo_inicio_bloqueo = None
             agente.tiempo_ultima_actividad = self.tiempo_actual
             # Agregar a índice de disponibles
-            self.agentes_disponibles.add(agente_id)
+            self.agentes_disponibles.agregar(agente_id)
+            self.estado_agentes_ocupados.sumar(self.tiempo_actual, -1)
+
+            # ✅ NUEVO: Si tiene escribanías en espera, arranca la siguiente ya mismo
+            while agente.escribanias_pendientes:
+                pendiente = self.propiedades_activas.get(agente.escribanias_pendientes.popleft())
+                if pendiente is not None:
+                    self.iniciar_escribania(pendiente, agente_id, 'espera_escribania')
+                    break
+                self.descartar_etapa('espera_escribania')
+
+    def cambiar_etapa(self, propiedad: Propiedad, anterior: Optional[str], etapa: Optional[str]):
+        """Mueve una gestión de `anterior` a `etapa` y actualiza los promedios temporales de estado.
+
+        Las etapas cuentan gestiones, no propiedades: una propiedad en verificación
+        puede recibir otra visita, y esa visita no pisa la etapa de la venta en
+        curso. Espera y gestión cuentan propiedades: cambian sólo cuando la
+        propiedad abre su primera gestión o cierra la última.
+        """
+        tiempo = self.tiempo_actual
+        if anterior is not None:
+            self.estado_etapas[anterior].sumar(tiempo, -1)
+        else:
+            propiedad.gestiones_abiertas += 1
+            if propiedad.gestiones_abiertas == 1:
+                self.estado_propiedades_en_espera.sumar(tiempo, -1)
+                self.estado_propiedades_en_gestion.sumar(tiempo, 1)
+        if etapa is not None:
+            self.estado_etapas[etapa].sumar(tiempo, 1)
+        else:
+            propiedad.gestiones_abiertas -= 1
+            if propiedad.gestiones_abiertas == 0:
+                self.estado_propiedades_en_espera.sumar(tiempo, 1)
+                self.estado_propiedades_en_gestion.sumar(tiempo, -1)
+        propiedad.etapa_actual = etapa
+
+    def descartar_etapa(self, etapa: str):
+        """Una gestión termina sobre una propiedad ya vendida: sólo sale de su etapa.
+
+        La propiedad dejó de contar en gestión al venderse, aunque le quedaran otras gestiones abiertas.
+        """
+        self.estado_etapas[etapa].sumar(self.tiempo_actual, -1)
 
     def buscar_agente_equitativo(self) -> Optional[int]:
-        """✅ OPTIMIZADO: Búsqueda O(k) donde k = agentes disponibles"""
-        if not self.agentes_disponibles:
-            return None
-        
-        # Buscar solo entre disponibles el que menos tareas hizo
-        agente_id = min(
-            self.agentes_disponibles, 
-            key=lambda aid: self.agentes[aid].contador_tareas
-        )
-        return agente_id
+        """✅ OPTIMIZADO: Búsqueda O(log k) en el índice de disponibles"""
+        # El disponible que menos tareas hizo (empate → menor id)
+        return self.agentes_disponibles.minimo()
 
-    def simular_venta(self) -> bool:
-        """Simula si una visita resulta en venta"""
-        return random.random() < self.prob_venta
+    def simular_venta(self, agente: Optional[Agente] = None) -> bool:
+        """Simula si una visita resulta en venta (en modo CRN usa lo sorteado en la llegada)"""
+        if agente is not None and agente.numeros_comunes is not None:
+            return agente.numeros_comunes[0]
+        return self.siguiente_venta()
 
-    def simular_arrepentimiento(self) -> bool:
+    def simular_arrepentimiento(self, agente: Optional[Agente] = None) -> bool:
         """Simula si un cliente se arrepiente después de la venta"""
-        return random.random() < self.prob_arrepentimiento
+        if agente is not None and agente.numeros_comunes is not None:
+            return agente.numeros_comunes[1]
+        return self.siguiente_arrepentimiento()
 
-    def rutina_reengagement(self, propiedad: Propiedad) -> bool:
+    def rutina_reengagement(self, propiedad: Propiedad, agente: Optional[Agente] = None) -> bool:
         """Maneja la rutina de re-engagement para ventas caídas"""
         if propiedad.contador_renegociaciones >= self.max_renegociaciones:
             return False
         
         prob_convencimiento = max(0.1, self.prob_base_reengagement - 
                                 (propiedad.contador_renegociaciones * self.penalizacion_reengagement))
-        convencido = random.random() < prob_convencimiento
+        if agente is not None and agente.numeros_comunes is not None:
+            u = agente.numeros_comunes[2]
+        else:
+            u = self.siguiente_u_reengagement()
+        convencido = u < prob_convencimiento
         
         if convencido:
             propiedad.contador_renegociaciones += 1
@@ -251,58 +585,109 @@ class SimulacionInmobiliaria:
         self.propiedades_activas[self.proximo_id_propiedad] = nueva_propiedad
         self.proximo_id_propiedad += 1
         self.propiedades_creadas_nuevas += 1
-        self.registrar_actividad(
-            f"✨ NUEVA PROPIEDAD {nueva_propiedad.id} publicada - Total activas: {len(self.propiedades_activas)}",
-            critico=False
-        )
+        self.estado_propiedades_activas.sumar(self.tiempo_actual, 1)
+        self.estado_propiedades_en_espera.sumar(self.tiempo_actual, 1)
+        self.registrar_actividad(log.NUEVA_PROPIEDAD, nueva_propiedad.id, len(self.propiedades_activas))
         return nueva_propiedad
     
     def programar_proxima_visita(self):
         """✅ MEJORADO: Programa la próxima visita (fija o aleatoria)"""
         tiempo_hasta_proxima = self.generar_tiempo_entre_visitas()
         proxima_visita = self.tiempo_actual + tiempo_hasta_proxima
-        heapq.heappush(self.eventos, (proxima_visita, 'visita', None))
 
-    def procesar_visita(self, _):
+        # ✅ NUEVO: Con la oficina cerrada se salta directo a la próxima apertura
+        if self.saltar_horario_cerrado:
+            while not self.esta_en_horario_laboral(proxima_visita):
+                if proxima_visita > self.tiempo_total_minutos:
+                    return
+                proxima_visita = self.saltar_periodo_cerrado(proxima_visita)
+
+        self.eventos.programar(proxima_visita, VISITA)
+
+    def procesar_llegada_visita(self, propiedad_id: int, agente_id: int):
+        """Evento VISITA: atiende la llegada y programa la siguiente"""
+        resultado = self.procesar_visita()
+        if self.tiempo_actual + self.tiempo_entre_visitas <= self.tiempo_total_minutos:
+            self.programar_proxima_visita()
+        return resultado
+
+    def procesar_visita_derivada(self, propiedad_id: int, agente_id: int):
+        """Evento VISITA_DERIVADA: llega una visita de otra oficina (se atiende o se pierde, no se re-deriva)"""
+        self.visitas_derivadas_recibidas += 1
+        return self.procesar_visita(derivada=True)
+
+    def procesar_visita(self, derivada: bool = False):
         """✅ OPTIMIZADO: Procesa visita con búsquedas O(1)"""
-        self.total_visitas_generadas += 1
+        if not derivada:
+            # Una visita derivada ya se contó como generada en la oficina de origen
+            self.total_visitas_generadas += 1
         
         # ✅ VERIFICAR HORARIO LABORAL
         if not self.esta_en_horario_laboral():
-            self.visitas_perdidas_fuera_horario += 1
-            self.registrar_actividad(f"❌ VISITA FUERA DE HORARIO - Hora: {self.tiempo_actual % 1440:.0f} min del día")
-            return
+            if derivada:
+                self.visitas_derivadas_perdidas += 1
+            else:
+                self.visitas_perdidas_fuera_horario += 1
+            self.registrar_actividad(log.VISITA_FUERA_HORARIO, self.tiempo_actual % 1440)
+            self.propiedad_visitada = self.agente_visita = -1
+            return traza.VISITA_FUERA_HORARIO
+
+        if self.numeros_aleatorios_comunes:
+            # Modo CRN: se consume lo mismo de cada flujo en toda llegada, sin importar qué pase después
+            u_propiedad = self.siguiente_u_propiedad()
+            numeros_comunes = (self.siguiente_venta(), self.siguiente_arrepentimiento(), self.siguiente_u_reengagement())
         
         # Verificar si hay propiedades activas
         if not self.propiedades_activas:
-            self.visitas_perdidas += 1
-            self.registrar_actividad("❌ VISITA PERDIDA - No hay propiedades activas", critico=True)
-            return
+            if derivada:
+                self.visitas_derivadas_perdidas += 1
+            else:
+                self.visitas_perdidas += 1
+            self.registrar_actividad(log.VISITA_SIN_PROPIEDADES, critico=True)
+            self.propiedad_visitada = self.agente_visita = -1
+            return traza.VISITA_SIN_PROPIEDADES
         
-        # ✅ Seleccionar propiedad aleatoria - O(1) con choice sobre keys
-        propiedad_id = random.choice(list(self.propiedades_activas.keys()))
-        propiedad = self.propiedades_activas[propiedad_id]
+        # ✅ Seleccionar propiedad aleatoria - O(1) sobre el índice, sin copiar claves
+        if not self.numeros_aleatorios_comunes:
+            u_propiedad = self.siguiente_u_propiedad()
+        propiedad = self.propiedades_activas.elegir_aleatoria(u_propiedad)
+        propiedad_id = propiedad.id
         propiedad.total_visitas_recibidas += 1
         
         # Buscar agente disponible
         agente_id = self.buscar_agente_equitativo()
+        self.propiedad_visitada = propiedad_id
         
         if agente_id is None:
-            self.visitas_perdidas += 1
-            self.registrar_actividad(f"❌ VISITA PERDIDA prop {propiedad_id} - No hay agentes")
-            return
+            self.agente_visita = -1
+            if self.derivaciones is not None and not derivada:
+                # ✅ NUEVO: En una red de oficinas, la visita pasa a otra oficina
+                self.derivaciones.append(self.tiempo_actual)
+                self.visitas_derivadas_enviadas += 1
+                return traza.VISITA_DERIVADA
+            if derivada:
+                self.visitas_derivadas_perdidas += 1
+            else:
+                self.visitas_perdidas += 1
+            self.registrar_actividad(log.VISITA_SIN_AGENTES, propiedad_id)
+            return traza.VISITA_SIN_AGENTES
+        self.agente_visita = agente_id
 
         # Bloquear agente SIEMPRE
         self.bloquear_agente(agente_id, propiedad.id, "VISITA", self.tiempo_atencion_visitas)
+        if self.numeros_aleatorios_comunes:
+            # El agente queda bloqueado de la visita a la renegociación: lleva las decisiones consigo
+            self.agentes[agente_id].numeros_comunes = numeros_comunes
         propiedad.tiempo_ultima_visita_agente = self.tiempo_actual
         propiedad.agente_asignado = agente_id
-        propiedad.etapa_actual = 'visita'
+        self.cambiar_etapa(propiedad, None, 'visita')
 
-        self.registrar_actividad(f"Agente {agente_id} → VISITA prop {propiedad_id} (#{propiedad.total_visitas_recibidas})")
+        self.registrar_actividad(log.VISITA_ATENDIDA, agente_id, propiedad_id, propiedad.total_visitas_recibidas)
 
         # Programar fin de visita
         tiempo_fin_visita = self.tiempo_actual + self.tiempo_atencion_visitas
-        heapq.heappush(self.eventos, (tiempo_fin_visita, 'fin_visita', propiedad_id, agente_id))
+        self.eventos.programar(tiempo_fin_visita, FIN_VISITA, propiedad_id, agente_id)
+        return traza.VISITA_ATENDIDA
 
     def procesar_fin_visita(self, propiedad_id: int, agente_id: int):
         """✅ OPTIMIZADO: Búsqueda O(1) en diccionario"""
@@ -312,102 +697,115 @@ class SimulacionInmobiliaria:
         agente = self.agentes[agente_id]
         
         if not propiedad:
-            self.registrar_actividad(f"⚠️ Prop {propiedad_id} no encontrada", critico=True)
+            self.registrar_actividad(log.PROPIEDAD_NO_ENCONTRADA, propiedad_id, critico=True)
+            self.descartar_etapa('visita')
             self.desbloquear_agente(agente_id, propiedad_id)
-            return
+            return traza.PROPIEDAD_INEXISTENTE
         
         # Decidir venta al final
-        hay_venta = self.simular_venta()
+        hay_venta = self.simular_venta(agente)
+        resultado = traza.SIN_VENTA
         
         # ✅ NUEVO: Verificar si el agente puede tomar más propiedades en verificación
         if hay_venta and len(agente.propiedades_en_verificacion) >= self.max_propiedades_verificacion_por_agente:
             # Rechazar venta porque el agente ya tiene demasiadas en verificación
             hay_venta = False
+            resultado = traza.VENTA_RECHAZADA
             self.visitas_perdidas_por_limite_verificacion += 1
             self.registrar_actividad(
-                f"❌ Venta RECHAZADA - Agente {agente_id} tiene {len(agente.propiedades_en_verificacion)} props en verificación (máx: {self.max_propiedades_verificacion_por_agente})",
-                critico=False
+                log.VENTA_RECHAZADA, agente_id, len(agente.propiedades_en_verificacion),
+                self.max_propiedades_verificacion_por_agente
             )
         
         if hay_venta:
             # HAY VENTA - Continuar con papeles
             propiedad.en_venta = True
-            self.registrar_actividad(f"Agente {agente_id} COMPLETA visita prop {propiedad_id} - ✅ VENTA", critico=True)
+            self.registrar_actividad(log.VISITA_CON_VENTA, agente_id, propiedad_id, critico=True)
             
-            propiedad.etapa_actual = 'papeles'
+            self.cambiar_etapa(propiedad, 'visita', 'papeles')
             tiempo_gestion_papeles = self.tiempo_actual + self.tiempo_gestion_papeles
-            heapq.heappush(self.eventos, (tiempo_gestion_papeles, 'fin_gestion_papeles', propiedad_id, agente_id))
+            self.eventos.programar(tiempo_gestion_papeles, FIN_GESTION_PAPELES, propiedad_id, agente_id)
+            return traza.VENTA
             
         else:
             # NO HAY VENTA - Liberar agente
             self.visitas_sin_venta += 1
             self.desbloquear_agente(agente_id, propiedad_id)
             
-            propiedad.etapa_actual = None
+            self.cambiar_etapa(propiedad, 'visita', None)
             propiedad.agente_asignado = None
             
-            self.registrar_actividad(f"Agente {agente_id} COMPLETA visita prop {propiedad_id} - ❌ SIN VENTA")
+            self.registrar_actividad(log.VISITA_SIN_VENTA, agente_id, propiedad_id)
+            return resultado
 
     def procesar_fin_gestion_papeles(self, propiedad_id: int, agente_id: int):
         """✅ OPTIMIZADO: Búsqueda O(1)"""
         
         propiedad = self.propiedades_activas.get(propiedad_id)
         if not propiedad:
+            self.descartar_etapa('papeles')
             self.desbloquear_agente(agente_id, propiedad_id)
-            return
+            return traza.PROPIEDAD_INEXISTENTE
 
-        self.registrar_actividad(f"Agente {agente_id} COMPLETA papeles prop {propiedad_id}")
+        self.registrar_actividad(log.FIN_PAPELES, agente_id, propiedad_id)
 
-        if self.simular_arrepentimiento():
+        if self.simular_arrepentimiento(self.agentes[agente_id]):
             propiedad.arrepentimiento = True
-            self.registrar_actividad(f"ARREPENTIMIENTO prop {propiedad_id}", critico=True)
+            self.registrar_actividad(log.ARREPENTIMIENTO, propiedad_id, critico=True)
             
-            propiedad.etapa_actual = 'renegociacion'
+            self.cambiar_etapa(propiedad, 'papeles', 'renegociacion')
             tiempo_renegociacion = self.tiempo_actual + self.tiempo_gestion_renegociacion
-            heapq.heappush(self.eventos, (tiempo_renegociacion, 'renegociacion', propiedad_id, agente_id))
+            self.eventos.programar(tiempo_renegociacion, RENEGOCIACION, propiedad_id, agente_id)
+            return traza.ARREPENTIMIENTO
                 
         else:
             # No hay arrepentimiento - verificación (NO BLOQUEANTE)
-            self.registrar_actividad(f"Prop {propiedad_id} → VERIFICACIÓN")
+            self.registrar_actividad(log.INICIO_VERIFICACION, propiedad_id)
             self.desbloquear_agente(agente_id, propiedad_id)
             
             # ✅ NUEVO: Agregar propiedad a la lista de verificación del agente
             agente = self.agentes[agente_id]
             agente.propiedades_en_verificacion.add(propiedad_id)
+            self.cambiar_etapa(propiedad, 'papeles', 'verificacion')
             
             tiempo_verificacion = self.tiempo_actual + self.tiempo_gestion_verificacion
-            heapq.heappush(self.eventos, (tiempo_verificacion, 'fin_verificacion', propiedad_id, agente_id))
+            self.eventos.programar(tiempo_verificacion, FIN_VERIFICACION, propiedad_id, agente_id)
+            return traza.A_VERIFICACION
 
     def procesar_renegociacion(self, propiedad_id: int, agente_id: int):
         """✅ OPTIMIZADO: Búsqueda O(1)"""
         
         propiedad = self.propiedades_activas.get(propiedad_id)
         if not propiedad:
+            self.descartar_etapa('renegociacion')
             self.desbloquear_agente(agente_id, propiedad_id)
-            return
+            return traza.PROPIEDAD_INEXISTENTE
 
-        self.registrar_actividad(f"Agente {agente_id} COMPLETA renegociación prop {propiedad_id}")
+        self.registrar_actividad(log.FIN_RENEGOCIACION, agente_id, propiedad_id)
 
-        if self.rutina_reengagement(propiedad):
-            self.registrar_actividad(f"RENEGOCIACIÓN EXITOSA prop {propiedad_id}", critico=True)
+        if self.rutina_reengagement(propiedad, self.agentes[agente_id]):
+            self.registrar_actividad(log.RENEGOCIACION_EXITOSA, propiedad_id, critico=True)
             self.desbloquear_agente(agente_id, propiedad_id)
             
             # ✅ NUEVO: Agregar propiedad a la lista de verificación del agente
             agente = self.agentes[agente_id]
             agente.propiedades_en_verificacion.add(propiedad_id)
+            self.cambiar_etapa(propiedad, 'renegociacion', 'verificacion')
             
             self.ventas_ganadas_por_re_engagement += 1
             tiempo_verificacion = self.tiempo_actual + self.tiempo_gestion_verificacion
-            heapq.heappush(self.eventos, (tiempo_verificacion, 'fin_verificacion', propiedad_id, agente_id))
+            self.eventos.programar(tiempo_verificacion, FIN_VERIFICACION, propiedad_id, agente_id)
+            return traza.RENEGOCIACION_EXITOSA
             
         else:
-            self.registrar_actividad(f"RENEGOCIACIÓN FALLIDA prop {propiedad_id}", critico=True)
+            self.registrar_actividad(log.RENEGOCIACION_FALLIDA, propiedad_id, critico=True)
             self.ventas_perdidas += 1
             self.desbloquear_agente(agente_id, propiedad_id)
             
             propiedad.arrepentimiento = False
             propiedad.en_venta = False
-            propiedad.etapa_actual = None
+            self.cambiar_etapa(propiedad, 'renegociacion', None)
+            return traza.RENEGOCIACION_FALLIDA
 
     def procesar_fin_verificacion(self, propiedad_id: int, agente_id: int):
         """✅ OPTIMIZADO: Búsqueda O(1)"""
@@ -417,9 +815,10 @@ class SimulacionInmobiliaria:
             # ✅ NUEVO: Remover de verificación si la propiedad ya no existe
             agente = self.agentes[agente_id]
             agente.propiedades_en_verificacion.discard(propiedad_id)
-            return
+            self.descartar_etapa('verificacion')
+            return traza.PROPIEDAD_INEXISTENTE
 
-        self.registrar_actividad(f"VERIFICACIÓN COMPLETADA prop {propiedad_id}")
+        self.registrar_actividad(log.FIN_VERIFICACION, propiedad_id)
         propiedad.paso_verificacion = True
 
         agente = self.agentes[agente_id]
@@ -428,14 +827,20 @@ class SimulacionInmobiliaria:
         agente.propiedades_en_verificacion.discard(propiedad_id)
         
         if agente.disponible:
-            self.bloquear_agente(agente_id, propiedad_id, "ESCRIBANIA", self.tiempo_gestion_escribania)
-            propiedad.etapa_actual = 'escribania'
-            
-            tiempo_escribania = self.tiempo_actual + self.tiempo_gestion_escribania
-            heapq.heappush(self.eventos, (tiempo_escribania, 'fin_escribania', propiedad_id, agente_id))
-        else:
-            # Esperar (pero ya la sacamos de verificación)
-            heapq.heappush(self.eventos, (self.tiempo_actual + 5, 'fin_verificacion', propiedad_id, agente_id))
+            self.iniciar_escribania(propiedad, agente_id, 'verificacion')
+            return traza.ESCRIBANIA_INICIADA
+        # ✅ NUEVO: Encolar en el agente; desbloquear_agente la arranca al liberarse
+        agente.escribanias_pendientes.append(propiedad_id)
+        self.cambiar_etapa(propiedad, 'verificacion', 'espera_escribania')
+        return traza.ESCRIBANIA_EN_ESPERA
+
+    def iniciar_escribania(self, propiedad: Propiedad, agente_id: int, etapa_anterior: str):
+        """Bloquea al agente y programa el fin de la escribanía"""
+        self.bloquear_agente(agente_id, propiedad.id, "ESCRIBANIA", self.tiempo_gestion_escribania)
+        self.cambiar_etapa(propiedad, etapa_anterior, 'escribania')
+
+        tiempo_escribania = self.tiempo_actual + self.tiempo_gestion_escribania
+        self.eventos.programar(tiempo_escribania, FIN_ESCRIBANIA, propiedad.id, agente_id)
 
     def procesar_fin_escribania(self, propiedad_id: int, agente_id: int):
         """✅ OPTIMIZADO: Búsqueda y remoción O(1)"""
@@ -445,41 +850,91 @@ class SimulacionInmobiliaria:
             # VENTA CONCRETADA
             self.total_ventas += 1
             tiempo_total_venta = self.tiempo_actual - propiedad.tiempo_ultima_visita_agente
-            self.tiempos_venta.append(tiempo_total_venta)
+            self.estadistica_tiempo_venta.agregar(tiempo_total_venta)
+            self.estadistica_visitas_por_venta.agregar(propiedad.total_visitas_recibidas)
+            if self.ventas_calentamiento is not None:
+                self.ventas_calentamiento.append((self.tiempo_actual, tiempo_total_venta, propiedad.total_visitas_recibidas))
             
             self.registrar_actividad(
-                f"🎉 VENTA prop {propiedad_id} por Agente {agente_id} - "
-                f"Tiempo: {self.convertir_a_horas_minutos(tiempo_total_venta)} - "
-                f"Visitas: {propiedad.total_visitas_recibidas}",
-                critico=True
+                log.VENTA_CONCRETADA, propiedad_id, agente_id, tiempo_total_venta,
+                propiedad.total_visitas_recibidas, critico=True
             )
             
-            # ✅ Remoción O(1) de diccionario
+            # ✅ Remoción O(1) por swap-remove en el índice
+            # La propiedad sale de N(t) desde gestión; sus otras gestiones abiertas se descartan al terminar
+            self.estado_etapas['escribania'].sumar(self.tiempo_actual, -1)
             del self.propiedades_activas[propiedad_id]
-            self.propiedades_vendidas[propiedad_id] = propiedad
+            self.estado_propiedades_activas.sumar(self.tiempo_actual, -1)
+            self.estado_propiedades_en_gestion.sumar(self.tiempo_actual, -1)
+            if self.propiedades_vendidas is not None:
+                self.propiedades_vendidas.agregar(propiedad, self.tiempo_actual)
             
             # ✅ NUEVO: Reposición automática de propiedades
             if self.mantener_propiedades_constante:
                 self.crear_nueva_propiedad()
-                self.registrar_actividad(
-                    f"🔄 Propiedad {propiedad_id} vendida → Nueva propiedad creada - "
-                    f"Total activas: {len(self.propiedades_activas)}",
-                    critico=False
-                )
+                self.registrar_actividad(log.REPOSICION_PROPIEDAD, propiedad_id, len(self.propiedades_activas))
             
             self.desbloquear_agente(agente_id, propiedad_id)
-        else:
-            self.desbloquear_agente(agente_id, propiedad_id)
+            return traza.VENTA_CONCRETADA
+        # Otra gestión de la misma propiedad ya la vendió
+        self.descartar_etapa('escribania')
+        self.desbloquear_agente(agente_id, propiedad_id)
+        return traza.PROPIEDAD_INEXISTENTE
 
-    def ejecutar_simulacion(self, tiempo_total_simulacion: float):
-        """Ejecuta la simulación por el tiempo especificado (en HORAS)"""
-        tiempo_total_minutos = tiempo_total_simulacion * 60
-        
+    def ejecutar_simulacion(
+        self,
+        tiempo_total_simulacion: float,
+        reporte: bool = True,
+        progreso: Optional[Callable[[Progreso], None]] = None,
+        intervalo_progreso_segundos: float = 1.0,
+    ) -> ResultadoSimulacion:
+        """Ejecuta la simulación por el tiempo especificado (en HORAS) y devuelve sus resultados.
+
+        - `reporte`: imprime el encabezado y el reporte final (False = modo silencioso, para librerías y workers)
+        - `progreso`: callback que recibe un `Progreso` cada `intervalo_progreso_segundos` de reloj
+          (por defecto, con `reporte`, la línea de progreso en consola)
+        """
+        if reporte:
+            self.imprimir_encabezado(tiempo_total_simulacion)
+        self.iniciar_simulacion(tiempo_total_simulacion)
+        return self.continuar_simulacion(reporte, progreso, intervalo_progreso_segundos)
+
+    def iniciar_simulacion(self, tiempo_total_simulacion: float):
+        """Fija el horizonte (en HORAS) y programa la primera visita, sin correr eventos.
+
+        Para avanzar por tramos (ver `avanzar_hasta`); ejecutar_simulacion lo hace solo.
+        """
+        self.tiempo_total_minutos = tiempo_total_simulacion * 60
+        # Programar primera visita
+        self.programar_proxima_visita()
+
+    def avanzar_hasta(self, tiempo_limite: float):
+        """✅ NUEVO: Procesa los eventos con tiempo < `tiempo_limite` (sin pasar el horizonte) y vuelve.
+
+        El estado queda listo para inyectar eventos (p. ej. `inyectar_visita_derivada`)
+        y seguir avanzando; al final, `finalizar_simulacion` arma los resultados.
+        """
+        self._bucle_principal(hasta=tiempo_limite)
+
+    def proximo_evento(self) -> float:
+        """Tiempo del próximo evento pendiente (infinito si la cola está vacía o se pasó el horizonte)"""
+        if not self.eventos or self.tiempo_actual > self.tiempo_total_minutos:
+            return math.inf
+        return self.eventos.proximo_tiempo()
+
+    def inyectar_visita_derivada(self, tiempo: float):
+        """Programa la llegada de una visita derivada por otra oficina"""
+        self.eventos.programar(tiempo, VISITA_DERIVADA)
+
+    def imprimir_encabezado(self, tiempo_total_simulacion: float):
+        """Resumen de la configuración al iniciar la corrida"""
         print("🚀 INICIANDO SIMULACIÓN OPTIMIZADA")
         print(f"⏰ Tiempo total: {tiempo_total_simulacion:.0f} horas ({self.convertir_a_dias_horas(tiempo_total_simulacion)})")
         print(f"👥 Agentes: {self.num_agentes}")
         if self.usar_jornada_laboral:
             print(f"⏱️  Jornada laboral: {self.hora_inicio_jornada//60}:00 - {self.hora_fin_jornada//60}:00")
+            if self.saltar_horario_cerrado:
+                print(f"⏭️  Horario cerrado: se salta a la apertura (visitas fuera de horario contadas en bloque)")
         else:
             print(f"⏱️  Jornada: 24/7 (sin restricciones)")
         print(f"🏠 Propiedades activas inicial: {len(self.propiedades_activas)}")
@@ -496,49 +951,221 @@ class SimulacionInmobiliaria:
         print(f"📝 Logging: {'VERBOSE' if self.verbose_logging else 'SOLO EVENTOS CRÍTICOS'}")
         print("=" * 50)
 
-        # Programar primera visita
-        self.programar_proxima_visita()
+    def continuar_simulacion(
+        self,
+        reporte: bool = True,
+        progreso: Optional[Callable[[Progreso], None]] = None,
+        intervalo_progreso_segundos: float = 1.0,
+    ) -> ResultadoSimulacion:
+        """Corre el bucle principal hasta el horizonte y devuelve los resultados.
+
+        Sirve tanto para una corrida nueva (después de ejecutar_simulacion) como
+        para una simulación recuperada de un checkpoint (ver `reanudar`).
+        """
+        if progreso is None and reporte:
+            progreso = imprimir_progreso
+        self._bucle_principal(progreso, intervalo_progreso_segundos)
+        return self.finalizar_simulacion(reporte)
+
+    def finalizar_simulacion(self, reporte: bool = False) -> ResultadoSimulacion:
+        """Cierra registros y traza, calcula las métricas finales y devuelve los resultados"""
+        self.registro.cerrar()
+        if self.registrador_traza is not None:
+            self.registrador_traza.cerrar()
+        self.calcular_metricas()
+        resultado = self.obtener_resultado()
+        if reporte:
+            print()  # Nueva línea después del progress bar
+            imprimir_reporte(resultado)
+        return resultado
+
+    def _bucle_principal(
+        self,
+        progreso: Optional[Callable[[Progreso], None]] = None,
+        intervalo_progreso_segundos: float = 1.0,
+        hasta: float = math.inf,
+    ):
+        """Procesa eventos hasta agotar la cola, pasar el horizonte o llegar a `hasta` (exclusivo)"""
+        tiempo_total_minutos = self.tiempo_total_minutos
+
+        # ✅ OPTIMIZADO: Tabla de manejadores indexada por código de evento
+        manejadores = [None] * len(NOMBRES_EVENTOS)
+        manejadores[VISITA] = self.procesar_llegada_visita
+        manejadores[FIN_VISITA] = self.procesar_fin_visita
+        manejadores[FIN_GESTION_PAPELES] = self.procesar_fin_gestion_papeles
+        manejadores[RENEGOCIACION] = self.procesar_renegociacion
+        manejadores[FIN_VERIFICACION] = self.procesar_fin_verificacion
+        manejadores[FIN_ESCRIBANIA] = self.procesar_fin_escribania
+        manejadores[VISITA_DERIVADA] = self.procesar_visita_derivada
+
+        eventos = self.eventos
+        extraer = eventos.extraer
+        if self.perfil is not None:
+            manejadores = self.perfil.instrumentar(manejadores, self)
+            extraer = self.perfil.instrumentar_extraccion(extraer)
 
         # Bucle principal de simulación
-        eventos_procesados = 0
-        while self.eventos and self.tiempo_actual <= tiempo_total_minutos:
-            tiempo_evento, tipo_evento, *args = heapq.heappop(self.eventos)
+        registrador_traza = self.registrador_traza
+        eventos_procesados = self.eventos_procesados
+        proximo_corte_diario = self.proximo_corte_diario
+        inicio_reloj = time.perf_counter()
+        # ✅ NUEVO: El reloj se consulta cada EVENTOS_POR_CONSULTA_RELOJ eventos y el callback
+        # se llama como mucho una vez por intervalo (sin callback, una comparación contra infinito)
+        proxima_consulta_reloj = eventos_procesados + EVENTOS_POR_CONSULTA_RELOJ if progreso is not None else math.inf
+        proximo_aviso = inicio_reloj + intervalo_progreso_segundos
+        por_tramos = hasta < math.inf
+        while eventos and self.tiempo_actual <= tiempo_total_minutos:
+            if por_tramos and eventos.proximo_tiempo() >= hasta:
+                break
+            tiempo_evento, _, codigo, propiedad_id, agente_id = extraer()
+            # ✅ NUEVO: Cierre de días para el detector de calentamiento (antes de procesar el evento)
+            if tiempo_evento >= proximo_corte_diario:
+                self.cerrar_dias(tiempo_evento)
+                proximo_corte_diario = self.proximo_corte_diario
             self.tiempo_actual = tiempo_evento
             eventos_procesados += 1
             
-            # Progress bar cada 10,000 eventos
-            if eventos_procesados % 10000 == 0:
-                progreso = (self.tiempo_actual / tiempo_total_minutos) * 100
-                print(f"⏳ Progreso: {progreso:.1f}% - Eventos: {eventos_procesados:,} - Ventas: {self.total_ventas}", end='\r')
-            
-            if tipo_evento == 'visita':
-                self.procesar_visita(None)
-                if self.tiempo_actual + self.tiempo_entre_visitas <= tiempo_total_minutos:
-                    self.programar_proxima_visita()
-            
-            elif tipo_evento == 'fin_visita':
-                propiedad_id, agente_id = args
-                self.procesar_fin_visita(propiedad_id, agente_id)
-            
-            elif tipo_evento == 'fin_gestion_papeles':
-                propiedad_id, agente_id = args
-                self.procesar_fin_gestion_papeles(propiedad_id, agente_id)
-            
-            elif tipo_evento == 'renegociacion':
-                propiedad_id, agente_id = args
-                self.procesar_renegociacion(propiedad_id, agente_id)
-            
-            elif tipo_evento == 'fin_verificacion':
-                propiedad_id, agente_id = args
-                self.procesar_fin_verificacion(propiedad_id, agente_id)
+            if eventos_procesados >= proxima_consulta_reloj:
+                proxima_consulta_reloj += EVENTOS_POR_CONSULTA_RELOJ
+                ahora = time.perf_counter()
+                if ahora >= proximo_aviso:
+                    proximo_aviso = ahora + intervalo_progreso_segundos
+                    progreso(Progreso(
+                        self.tiempo_actual / tiempo_total_minutos, self.tiempo_actual, eventos_procesados,
+                        self.total_ventas, self.segundos_bucle + ahora - inicio_reloj,
+                    ))
             
-            elif tipo_evento == 'fin_escribania':
-                propiedad_id, agente_id = args
-                self.procesar_fin_escribania(propiedad_id, agente_id)
+            resultado = manejadores[codigo](propiedad_id, agente_id)
+            if registrador_traza is not None:
+                if codigo == VISITA or codigo == VISITA_DERIVADA:
+                    propiedad_id, agente_id = self.propiedad_visitada, self.agente_visita
+                registrador_traza.registrar(tiempo_evento, codigo, propiedad_id, agente_id, resultado)
 
-        print()  # Nueva línea después del progress bar
-        self.calcular_metricas()
-        self.generar_reporte()
+            # ✅ NUEVO: Checkpoint entre eventos (el estado queda consistente)
+            if self.tiempo_actual >= self.proximo_checkpoint:
+                self.eventos_procesados = eventos_procesados
+                self.segundos_bucle += time.perf_counter() - inicio_reloj
+                inicio_reloj = time.perf_counter()
+                self.guardar_checkpoint()
+
+        self.segundos_bucle += time.perf_counter() - inicio_reloj
+        self.eventos_procesados = eventos_procesados
+        self.eventos_por_segundo = eventos_procesados / self.segundos_bucle if self.segundos_bucle > 0 else 0.0
+        if progreso is not None and not por_tramos:
+            progreso(Progreso(
+                min(self.tiempo_actual / tiempo_total_minutos, 1.0), self.tiempo_actual, eventos_procesados,
+                self.total_ventas, self.segundos_bucle,
+            ))
+
+    def cerrar_dias(self, tiempo: float):
+        """Pasa al detector las ventas y la utilización de cada día completo antes de `tiempo`"""
+        detector = self.detector_calentamiento
+        while tiempo >= self.proximo_corte_diario:
+            corte = self.proximo_corte_diario
+            integral_ocupados = self.estado_agentes_ocupados.integral(corte)
+            observacion = {
+                'ventas': self.total_ventas - self.ventas_al_corte,
+                'utilizacion': (integral_ocupados - self.integral_ocupados_al_corte) / (MINUTOS_POR_DIA * self.num_agentes),
+            }
+            self.ventas_al_corte = self.total_ventas
+            self.integral_ocupados_al_corte = integral_ocupados
+            self.proximo_corte_diario += MINUTOS_POR_DIA
+
+            detectado = detector.agregar(observacion)
+            if detector.observaciones % detector.tamano_lote == 0:
+                self.registrar_corte(corte)
+            if detectado:
+                # El punto MSER cae en el pasado, en el fin de un lote: se descarta todo hasta ahí
+                self.truncar_estadisticas(detector.truncamiento // detector.tamano_lote)
+                self.proximo_corte_diario = math.inf
+            elif detector.abandonado:
+                self.abandonar_calentamiento()
+                self.proximo_corte_diario = math.inf
+
+    def acumuladores_estado(self) -> Dict[str, AcumuladorTemporal]:
+        """Variables de estado por nombre; los cortes guardan sus tramos en este mismo orden"""
+        return {
+            'propiedades_activas': self.estado_propiedades_activas,
+            'propiedades_en_espera': self.estado_propiedades_en_espera,
+            'propiedades_en_gestion': self.estado_propiedades_en_gestion,
+            **{f"etapa_{etapa}": acumulador for etapa, acumulador in self.estado_etapas.items()},
+            'agentes_ocupados': self.estado_agentes_ocupados,
+        }
+
+    def registrar_corte(self, tiempo: float):
+        """Guarda los acumulados de salida en `tiempo` (fin de un lote del detector)"""
+        tramos = [acumulador.cerrar_tramo(tiempo) for acumulador in self.acumuladores_estado().values()]
+        self.cortes_calentamiento.append(CorteEstadisticas(
+            tiempo,
+            tuple(getattr(self, contador) for contador in CONTADORES_SALIDA),
+            tuple(integral for integral, _, _ in tramos),
+            tuple(maximo for _, maximo, _ in tramos),
+            tuple(minimo for _, _, minimo in tramos),
+            tuple(
+                agente.tiempo_total_bloqueado
+                + (tiempo - agente.tiempo_inicio_bloqueo if agente.tiempo_inicio_bloqueo is not None else 0)
+                for agente in self.agentes.values()
+            ),
+            len(self.propiedades_activas),
+        ))
+
+    def truncar_estadisticas(self, indice_corte: int):
+        """Descarta las estadísticas de salida acumuladas hasta el corte `indice_corte` (el estado del sistema no cambia)"""
+        corte = self.cortes_calentamiento[indice_corte]
+        posteriores = self.cortes_calentamiento[indice_corte + 1:]
+        tiempo = corte.tiempo
+        self.tiempo_inicio_medicion = tiempo
+        self.propiedades_activas_inicio_medicion = corte.propiedades_activas
+        for contador, valor in zip(CONTADORES_SALIDA, corte.contadores):
+            setattr(self, contador, getattr(self, contador) - valor)
+
+        self.estadistica_tiempo_venta = EstadisticaOnline(cuantiles=(0.5, 0.9))
+        self.estadistica_visitas_por_venta = EstadisticaOnline()
+        for tiempo_venta, tiempo_total_venta, visitas in self.ventas_calentamiento:
+            if tiempo_venta >= tiempo:
+                self.estadistica_tiempo_venta.agregar(tiempo_total_venta)
+                self.estadistica_visitas_por_venta.agregar(visitas)
+
+        for i, acumulador in enumerate(self.acumuladores_estado().values()):
+            acumulador.descontar(
+                tiempo, corte.integrales[i],
+                max((c.maximos[i] for c in posteriores), default=-math.inf),
+                min((c.minimos[i] for c in posteriores), default=math.inf),
+            )
+
+        # Utilización: se descuenta el tiempo bloqueado hasta el corte
+        # (contador_tareas se conserva: es el criterio de asignación equitativa)
+        for agente, bloqueado in zip(self.agentes.values(), corte.tiempos_bloqueado):
+            agente.tiempo_total_bloqueado -= bloqueado
+
+        self.cortes_calentamiento = None
+        self.ventas_calentamiento = None
+
+    def abandonar_calentamiento(self):
+        """El detector no decidió en lotes_maximos_calentamiento: se mide desde 0 y se liberan los cortes"""
+        cortes = self.cortes_calentamiento
+        for i, acumulador in enumerate(self.acumuladores_estado().values()):
+            # Sin descontar nada: sólo se recuperan los extremos de los tramos cerrados
+            acumulador.descontar(
+                acumulador.tiempo_inicial, 0.0,
+                max(corte.maximos[i] for corte in cortes), min(corte.minimos[i] for corte in cortes),
+            )
+        self.cortes_calentamiento = None
+        self.ventas_calentamiento = None
+
+    def guardar_checkpoint(self, ruta: Optional[str] = None):
+        """Guarda un snapshot versionado del estado completo de la simulación"""
+        while self.proximo_checkpoint <= self.tiempo_actual:
+            self.proximo_checkpoint += self.intervalo_checkpoint or math.inf
+        guardar_checkpoint(self, ruta or self.ruta_checkpoint)
+
+    @classmethod
+    def reanudar(cls, ruta: str) -> 'SimulacionInmobiliaria':
+        """Recupera una simulación desde un checkpoint (luego llamar a continuar_simulacion)"""
+        simulacion = cargar_checkpoint(ruta)
+        if not isinstance(simulacion, cls):
+            raise TypeError(f"El checkpoint no contiene una {cls.__name__}")
+        return simulacion
 
     def calcular_metricas(self):
         """Calcula las métricas finales"""
@@ -549,108 +1176,103 @@ class SimulacionInmobiliaria:
                 agente.disponible = True
                 agente.tiempo_inicio_bloqueo = None
 
-    def generar_reporte(self):
-        """Genera un reporte completo"""
-        tiempo_total_horas = self.tiempo_actual / 60
-        tiempo_total_str = self.convertir_a_horas_minutos(self.tiempo_actual)
-        tiempo_promedio = sum(self.tiempos_venta) / len(self.tiempos_venta) if self.tiempos_venta else 0
-        tiempo_promedio_str = self.convertir_a_horas_minutos(tiempo_promedio)
-        
-        comision_minima = self.negociacion(self.max_renegociaciones)
-        tasa_conversion_visitas = self.total_ventas / max(self.total_visitas_generadas, 1)
-        
-        print("\n" + "=" * 80)
-        print("📊 REPORTE FINAL DE SIMULACIÓN")
-        print("=" * 80)
-        
-        print(f"\n⏰ TIEMPO:")
-        print(f"  Total simulado: {tiempo_total_str} ({tiempo_total_horas:.0f} horas = {self.convertir_a_dias_horas(tiempo_total_horas)})")
-        
-        print(f"\n🏠 PROPIEDADES:")
-        print(f"  Activas al inicio: {self.num_propiedades_activas}")
-        print(f"  Activas al final: {len(self.propiedades_activas)}")
-        if self.mantener_propiedades_constante:
-            print(f"  ✅ Reposición automática: ACTIVADA")
-            print(f"  Nuevas propiedades creadas: {self.propiedades_creadas_nuevas:,}")
-        print(f"  Vendidas: {len(self.propiedades_vendidas)}")
-        if self.mantener_propiedades_constante:
-            print(f"  Tasa de rotación: {len(self.propiedades_vendidas)/(self.num_propiedades_activas + self.propiedades_creadas_nuevas)*100:.1f}%")
-        else:
-            print(f"  Tasa de venta: {len(self.propiedades_vendidas)/self.num_propiedades_activas*100:.1f}%")
-        
-        print(f"\n👥 VISITAS:")
-        print(f"  Total generadas: {self.total_visitas_generadas:,}")
-        print(f"  Con venta concretada: {self.total_ventas:,}")
-        print(f"  Con venta perdida: {self.ventas_perdidas:,}")
-        print(f"  Sin venta: {self.visitas_sin_venta:,}")
-        print(f"  Perdidas (sin agentes): {self.visitas_perdidas:,}")
-        if self.visitas_perdidas_por_limite_verificacion > 0:
-            print(f"  Perdidas (agente saturado de props en verificación): {self.visitas_perdidas_por_limite_verificacion:,}")
-        #if self.usar_jornada_laboral:
-             #print(f"  Perdidas (fuera de horario): {self.visitas_perdidas_fuera_horario:,}")
-        
-        print(f"\n📈 TASAS DE CONVERSIÓN:")
-        print(f"  Visitas → Ventas: {tasa_conversion_visitas:.1%}")
-        print(f"  P(Venta|Visita) esperada: {self.prob_venta:.1%}")
-        print(f"  Diferencia: {(tasa_conversion_visitas - self.prob_venta)*100:+.2f}%")
-        
-        print(f"\n💰 VENTAS:")
-        print(f"  Concretadas: {self.total_ventas:,}")
-        print(f"  Ganadas por re-engagement: {self.ventas_ganadas_por_re_engagement}")
-        print(f"  Tiempo promedio por venta: {tiempo_promedio_str}")
-        
-        print(f"\n👨‍💼 UTILIZACIÓN DE AGENTES:")
-        
+    def calcular_tiempo_efectivo(self) -> float:
+        """Tiempo (en minutos) sobre el que se mide la utilización de los agentes"""
         # ✅ CORRECCIÓN: Calcular tiempo efectivo según jornada laboral
         if self.usar_jornada_laboral:
             # Solo contar horas de jornada laboral
             horas_por_dia = (self.hora_fin_jornada - self.hora_inicio_jornada) / 60
-            tiempo_efectivo = (self.tiempo_actual / 1440) * horas_por_dia * 60  # en minutos
-            nota_jornada = f" (jornada {self.hora_inicio_jornada//60}:00-{self.hora_fin_jornada//60}:00)"
-        else:
-            # Contar todas las horas (24/7)
-            tiempo_efectivo = self.tiempo_actual
-            nota_jornada = " (24/7)"
-        
-        print(f"  Base de cálculo: {self.convertir_a_horas_minutos(tiempo_efectivo)}{nota_jornada}")
-        print()
-        
-        for agente_id, agente in self.agentes.items():
-            utilizacion = agente.tiempo_total_bloqueado / max(tiempo_efectivo, 1)
-            tiempo_bloqueo_str = self.convertir_a_horas_minutos(agente.tiempo_total_bloqueado)
-            tareas = agente.contador_tareas
-            
-            # Marcar si está sobrecargado
-            marcador = " ⚠️ SOBRECARGA" if utilizacion > 1.0 else ""
-            print(f"  Agente {agente_id}: {utilizacion:.1%} ({tiempo_bloqueo_str}) - Tareas: {tareas:,}{marcador}")
-        
-        # ✅ RESUMEN DE UTILIZACIÓN
-        utilizaciones = [agente.tiempo_total_bloqueado / max(tiempo_efectivo, 1) for agente in self.agentes.values()]
-        util_promedio = sum(utilizaciones) / len(utilizaciones)
-        util_min = min(utilizaciones)
-        util_max = max(utilizaciones)
-        agentes_sobrecargados = sum(1 for u in utilizaciones if u > 1.0)
-        
-        print(f"\n  📊 RESUMEN UTILIZACIÓN:")
-        print(f"     Promedio: {util_promedio:.1%}")
-        print(f"     Mínimo: {util_min:.1%}")
-        print(f"     Máximo: {util_max:.1%}")
-        if agentes_sobrecargados > 0:
-            print(f"     ⚠️  Agentes sobrecargados (>100%): {agentes_sobrecargados}/{len(self.agentes)}")
-        
-        if self.propiedades_vendidas:
-            visitas_por_prop = [p.total_visitas_recibidas for p in self.propiedades_vendidas.values()]
-            print(f"\n📊 VISITAS POR PROPIEDAD VENDIDA:")
-            print(f"  Promedio: {sum(visitas_por_prop)/len(visitas_por_prop):.1f} visitas")
-            print(f"  Mínimo: {min(visitas_por_prop)} visitas")
-            print(f"  Máximo: {max(visitas_por_prop)} visitas")
-        
-        print(f"\n📝 LOGGING:")
-        print(f"  Eventos críticos registrados: {len(self.log_eventos_criticos):,}")
-        if self.verbose_logging:
-            print(f"  Total actividades: {len(self.log_actividades):,}")
-        
-        print("=" * 80)
+            return ((self.tiempo_actual - self.tiempo_inicio_medicion) / 1440) * horas_por_dia * 60  # en minutos
+        # Contar todas las horas (24/7)
+        return self.tiempo_actual - self.tiempo_inicio_medicion
+
+    def calcular_utilizaciones(self) -> List[float]:
+        """Utilización de cada agente (tiempo bloqueado / tiempo efectivo)"""
+        tiempo_efectivo = self.calcular_tiempo_efectivo()
+        return [agente.tiempo_total_bloqueado / max(tiempo_efectivo, 1) for agente in self.agentes.values()]
+
+    def estadisticas_estado(self) -> Dict[str, Dict[str, float]]:
+        """Promedio temporal y máximo de cada variable de estado hasta el tiempo actual"""
+        tiempo = self.tiempo_actual
+        cortes = self.cortes_calentamiento or ()
+        return {
+            nombre: {
+                'media': acumulador.media(tiempo),
+                # Sin calentamiento detectado, el máximo de la corrida es el de todos los tramos cerrados
+                'maximo': max([acumulador.maximo, *(corte.maximos[i] for corte in cortes)]),
+            }
+            for i, (nombre, acumulador) in enumerate(self.acumuladores_estado().items())
+        }
+
+    def obtener_resultado(self) -> ResultadoSimulacion:
+        """Resultados de la corrida como un registro tipado y picklable"""
+        tiempo_efectivo = self.calcular_tiempo_efectivo()
+        tiempos_venta = self.estadistica_tiempo_venta
+        visitas_por_venta = self.estadistica_visitas_por_venta
+        detector = self.detector_calentamiento
+
+        return ResultadoSimulacion(
+            tiempo_simulado=self.tiempo_actual,
+            tiempo_inicio_medicion=self.tiempo_inicio_medicion,
+            tiempo_efectivo=tiempo_efectivo,
+            propiedades_activas_inicio=self.propiedades_activas_inicio_medicion,
+            propiedades_activas_final=len(self.propiedades_activas),
+            propiedades_creadas_nuevas=self.propiedades_creadas_nuevas,
+            mantener_propiedades_constante=self.mantener_propiedades_constante,
+            total_visitas_generadas=self.total_visitas_generadas,
+            total_ventas=self.total_ventas,
+            ventas_perdidas=self.ventas_perdidas,
+            visitas_sin_venta=self.visitas_sin_venta,
+            visitas_perdidas=self.visitas_perdidas,
+            visitas_perdidas_fuera_horario=self.visitas_perdidas_fuera_horario,
+            visitas_perdidas_por_limite_verificacion=self.visitas_perdidas_por_limite_verificacion,
+            ventas_ganadas_por_re_engagement=self.ventas_ganadas_por_re_engagement,
+            visitas_derivadas_enviadas=self.visitas_derivadas_enviadas,
+            visitas_derivadas_recibidas=self.visitas_derivadas_recibidas,
+            visitas_derivadas_perdidas=self.visitas_derivadas_perdidas,
+            tiempo_venta=ResumenSerie(
+                tiempos_venta.n, tiempos_venta.media, tiempos_venta.desvio, tiempos_venta.minimo, tiempos_venta.maximo,
+                tiempos_venta.cuantil(0.5), tiempos_venta.cuantil(0.9),
+            ),
+            visitas_por_venta=ResumenSerie(
+                visitas_por_venta.n, visitas_por_venta.media, visitas_por_venta.desvio,
+                visitas_por_venta.minimo, visitas_por_venta.maximo,
+            ),
+            probabilidad_venta=self.prob_venta,
+            comision_minima=self.negociacion(self.max_renegociaciones),
+            usar_jornada_laboral=self.usar_jornada_laboral,
+            hora_inicio_jornada=self.hora_inicio_jornada if self.usar_jornada_laboral else 0,
+            hora_fin_jornada=self.hora_fin_jornada if self.usar_jornada_laboral else 24 * 60,
+            agentes=[
+                ResultadoAgente(
+                    agente_id, agente.tiempo_total_bloqueado / max(tiempo_efectivo, 1),
+                    agente.tiempo_total_bloqueado, agente.contador_tareas,
+                )
+                for agente_id, agente in self.agentes.items()
+            ],
+            estado=self.estadisticas_estado(),
+            eventos_procesados=self.eventos_procesados,
+            eventos_por_segundo=self.eventos_por_segundo,
+            segundos_bucle=self.segundos_bucle,
+            perfil=self.perfil,
+            calentamiento_detectado=detector.detectado if detector is not None else None,
+            calentamiento_abandonado=detector is not None and detector.abandonado,
+            dia_fin_calentamiento=detector.truncamiento if detector is not None else None,
+            dias_observados_calentamiento=detector.observaciones if detector is not None else 0,
+            tamano_lote_calentamiento=detector.tamano_lote if detector is not None else 5,
+            log_criticos=(
+                (self.log_eventos_criticos.total, len(self.log_eventos_criticos))
+                if self.log_eventos_criticos is not None else None
+            ),
+            log_actividades=(
+                (self.log_actividades.total, len(self.log_actividades))
+                if self.log_actividades is not None else None
+            ),
+        )
+
+    def generar_reporte(self):
+        """Genera un reporte completo (en consola)"""
+        imprimir_reporte(self.obtener_resultado())
 
     def negociacion(self, N, max_intentos=6, inicio=0.036, fin=0.026):
         """Calcula la comisión mínima según el número de intentos de re-negociación"""
@@ -683,6 +1305,7 @@ CONFIGURACION = {
     'usar_jornada_laboral': True,  # True = agentes solo trabajan en horario definido
     'hora_inicio_jornada': 9,  # 9 AM
     'hora_fin_jornada': 14,  # 6 PM (18:00)
+    'saltar_horario_cerrado': True,  # True = no genera eventos de visita con la oficina cerrada (se cuentan en bloque)
     
     # ✅ TIEMPO ENTRE VISITAS: Elegir una opción
     # Opción A: Valor FIJO (modelo simple) - RECOMENDADO PARA EMPEZAR
@@ -697,23 +1320,69 @@ CONFIGURACION = {
      'dist_loc': 169.04207586301385 / 9537,  # ← DIVIDIR
      'dist_scale': 30433.163765426078 / 9537,  # ← DIVIDIR
     
+    # ✅ NÚMEROS ALEATORIOS
+    'semilla': None,  # None = semilla aleatoria; un entero hace la corrida reproducible
+    'numeros_aleatorios_comunes': False,  # True = CRN: cada llegada sortea todas sus decisiones (comparaciones pareadas)
+    
     # Control de logging
     'verbose_logging': False,  # True = guarda todo, False = solo eventos críticos
+    'capacidad_log_criticos': 1000,  # Últimos N eventos críticos en memoria (0 = no guardar)
+    'capacidad_log_actividades': 10000,  # Últimas N actividades en memoria (solo con verbose)
+    'archivo_log': None,  # Ruta para volcar el log a disco a medida que se genera
+    'directorio_traza': None,  # Directorio para la traza binaria de eventos (None = sin traza)
+    'perfilar_eventos': False,  # True = mide cantidad y tiempo por tipo de evento (ver sección RENDIMIENTO)
+    
+    # ✅ LISTA DE EVENTOS FUTUROS
+    'cola_eventos': 'heap',  # 'heap' (heap binario), 'calendario' (calendar queue) o 'carriles' (FIFO por demora constante)
+    
+    # ✅ MODO RÁPIDO (aproximado, para barridos de capacidad en horizontes largos; ver modo_rapido.py)
+    'modo_rapido': False,  # True = réplicas y barridos usan SimulacionRapida (visitas sin venta en bloque)
+    'paso_tau_minutos': 30,  # Salto del modo rápido (se ajusta para dividir la duración de la visita)
+    
+    # ✅ CHECKPOINTS (para retomar corridas largas)
+    'ruta_checkpoint': None,  # Archivo del snapshot (None = sin checkpoints)
+    'intervalo_checkpoint_horas': 8760,  # Cada cuántas horas SIMULADAS se guarda
+    
+    # ✅ CALENTAMIENTO: descarta las estadísticas del transitorio inicial (sistema vacío)
+    'detectar_calentamiento': False,  # True = MSER-5 sobre ventas y utilización diarias
+    'tamano_lote_calentamiento': 5,  # Días por lote (el "5" de MSER-5)
+    'lotes_minimos_calentamiento': 20,  # Lotes antes de decidir (20 lotes = 100 días)
+    'lotes_maximos_calentamiento': 200,  # Sin decidir en 200 lotes (1000 días) deja de buscar y no trunca
     
     # ✅ REPOSICIÓN AUTOMÁTICA DE PROPIEDADES
     'mantener_propiedades_constante': True,  # True = crea nueva propiedad cuando se vende una
     
+    'retener_propiedades_vendidas': False,  # True = guarda el detalle de cada vendida (la memoria crece con el horizonte)
+    
     # ✅ LÍMITE DE PROPIEDADES EN VERIFICACIÓN POR AGENTE
     'max_propiedades_verificacion_por_agente': 3,  # Máximo de propiedades que un agente puede tener en verificación simultánea
 }
 
+def reanudar_simulacion(ruta_checkpoint: str, reporte: bool = True) -> ResultadoSimulacion:
+    """Retoma una corrida interrumpida desde su último checkpoint y la termina"""
+    if reporte:
+        print(f"♻️  Reanudando desde checkpoint: {ruta_checkpoint}")
+    simulacion = SimulacionInmobiliaria.reanudar(ruta_checkpoint)
+    return simulacion.continuar_simulacion(reporte)
+
 if __name__ == "__main__":
+    import sys
+    # Las clases se toman del módulo importado (no de __main__) para que los checkpoints se puedan cargar desde otros scripts
+    from remax_corregido_optimizado import CONFIGURACION, SimulacionInmobiliaria, reanudar_simulacion
+
+    # Uso: python remax_corregido_optimizado.py --reanudar <checkpoint>
+    if len(sys.argv) == 3 and sys.argv[1] == '--reanudar':
+        reanudar_simulacion(sys.argv[2])
+        sys.exit(0)
+
     print("\n🎯 SIMULACIÓN INMOBILIARIA RE/MAX - VERSIÓN OPTIMIZADA")
     print("="*80)
     print("✅ Optimizaciones:")
     print("   • Diccionarios para búsquedas O(1)")
-    print("   • Índice de agentes disponibles")
-    print("   • Logging configurable")
+    print("   • Índice de propiedades activas con muestreo O(1)")
+    print("   • Índice de agentes disponibles ordenado por tareas (heap)")
+    print("   • Flujos aleatorios vectorizados (NumPy) por proceso")
+    print("   • Logging estructurado y perezoso")
     print("   • Progress bar en tiempo real")
     print("="*80)
     print()
@@ -0,0 +1,249 @@
+"""
+Resultados de una corrida de la simulación, separados de su presentación.
+
+`ResultadoSimulacion` es un registro tipado y picklable con los contadores,
+las estadísticas por agente y los resúmenes de tiempo de venta: es lo que
+devuelve `ejecutar_simulacion` y lo que conviene mandar entre procesos.
+Imprimirlo es opcional: `imprimir_reporte` es el reporte de consola y
+`imprimir_progreso` el callback de progreso por defecto.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional
+
+from registro import formatear_horas_minutos
+
+
+class Progreso(NamedTuple):
+    """Estado de avance que recibe el callback de progreso"""
+    fraccion: float  # Tiempo simulado / horizonte
+    tiempo_simulado: float  # En minutos
+    eventos_procesados: int
+    total_ventas: int
+    segundos: float  # Tiempo de reloj en el bucle principal
+
+
+@dataclass
+class ResumenSerie:
+    """Resumen de una serie de observaciones (de una EstadisticaOnline)"""
+    n: int
+    media: float
+    desvio: float
+    minimo: float
+    maximo: float
+    mediana: Optional[float] = None
+    p90: Optional[float] = None
+
+
+@dataclass
+class ResultadoAgente:
+    id: int
+    utilizacion: float  # Tiempo bloqueado / tiempo efectivo
+    tiempo_bloqueado: float  # En minutos
+    tareas: int
+
+
+@dataclass
+class ResultadoSimulacion:
+    """Salida completa de una corrida"""
+    # Tiempo
+    tiempo_simulado: float  # En minutos
+    tiempo_inicio_medicion: float  # > 0 si se descartó el calentamiento
+    tiempo_efectivo: float  # Base de la utilización (sólo horas de jornada si aplica)
+
+    # Propiedades
+    propiedades_activas_inicio: int
+    propiedades_activas_final: int
+    propiedades_creadas_nuevas: int
+    mantener_propiedades_constante: bool
+
+    # Visitas y ventas
+    total_visitas_generadas: int
+    total_ventas: int
+    ventas_perdidas: int
+    visitas_sin_venta: int
+    visitas_perdidas: int
+    visitas_perdidas_fuera_horario: int
+    visitas_perdidas_por_limite_verificacion: int
+    ventas_ganadas_por_re_engagement: int
+    tiempo_venta: ResumenSerie
+    visitas_por_venta: ResumenSerie
+
+    # Parámetros que el reporte compara contra lo observado
+    probabilidad_venta: float
+    comision_minima: float
+    usar_jornada_laboral: bool
+    hora_inicio_jornada: int  # En minutos desde la medianoche
+    hora_fin_jornada: int
+
+    agentes: List[ResultadoAgente]
+    estado: Dict[str, Dict[str, float]]  # Promedio temporal y máximo de cada variable de estado
+
+    # Rendimiento
+    eventos_procesados: int
+    eventos_por_segundo: float
+    segundos_bucle: float
+    perfil: Optional[object] = None  # PerfilEventos si se pidió el perfilado
+
+    # Calentamiento (None si el detector está desactivado)
+    calentamiento_detectado: Optional[bool] = None
+    dia_fin_calentamiento: Optional[int] = None
+    dias_observados_calentamiento: int = 0
+    calentamiento_abandonado: bool = False  # Sin decidir en lotes_maximos_calentamiento
+    tamano_lote_calentamiento: int = 5
+
+    # Logging: (registrados, en memoria) o None si el buffer no está habilitado
+    log_criticos: Optional[tuple] = None
+    log_actividades: Optional[tuple] = None
+
+    # Red de oficinas (0 si la oficina corre aislada)
+    visitas_derivadas_enviadas: int = 0
+    visitas_derivadas_recibidas: int = 0
+    visitas_derivadas_perdidas: int = 0  # Recibidas y perdidas acá (no cuentan en las tasas de esta oficina)
+
+    @property
+    def utilizacion_promedio(self) -> float:
+        return sum(a.utilizacion for a in self.agentes) / max(len(self.agentes), 1)
+
+    @property
+    def tasa_conversion_visitas(self) -> float:
+        return self.total_ventas / max(self.total_visitas_generadas, 1)
+
+
+def formatear_dias_horas(horas_totales: float) -> str:
+    """Convierte horas totales a formato legible (años, días, horas)"""
+    años = int(horas_totales // (365 * 24))
+    resto_horas = horas_totales % (365 * 24)
+    dias = int(resto_horas // 24)
+    horas = int(resto_horas % 24)
+
+    partes = []
+    if años > 0:
+        partes.append(f"{años} año{'s' if años != 1 else ''}")
+    if dias > 0:
+        partes.append(f"{dias} día{'s' if dias != 1 else ''}")
+    if horas > 0:
+        partes.append(f"{horas} hora{'s' if horas != 1 else ''}")
+    return ", ".join(partes) if partes else "0 horas"
+
+
+def imprimir_progreso(progreso: Progreso):
+    """Callback de progreso por defecto: una línea que se reescribe en la consola"""
+    print(f"⏳ Progreso: {progreso.fraccion * 100:.1f}% - Eventos: {progreso.eventos_procesados:,} "
+          f"- Ventas: {progreso.total_ventas}", end='\r')
+
+
+def imprimir_reporte(resultado: ResultadoSimulacion):
+    """Reporte completo de consola a partir de un resultado"""
+    r = resultado
+    tiempo_total_horas = r.tiempo_simulado / 60
+    tiempos_venta = r.tiempo_venta
+    tasa_conversion_visitas = r.tasa_conversion_visitas
+
+    print("\n" + "=" * 80)
+    print("📊 REPORTE FINAL DE SIMULACIÓN")
+    print("=" * 80)
+
+    print(f"\n⏰ TIEMPO:")
+    print(f"  Total simulado: {formatear_horas_minutos(r.tiempo_simulado)} ({tiempo_total_horas:.0f} horas = {formatear_dias_horas(tiempo_total_horas)})")
+    if r.calentamiento_detectado is not None:
+        if r.calentamiento_detectado:
+            dias_medidos = (r.tiempo_simulado - r.tiempo_inicio_medicion) / (24 * 60)
+            print(f"  🌡️ Calentamiento (MSER-{r.tamano_lote_calentamiento}): termina el día {r.dia_fin_calentamiento}; "
+                  f"estadísticas medidas desde el día {r.tiempo_inicio_medicion / (24 * 60):.0f} "
+                  f"({dias_medidos:.0f} días en régimen)")
+        elif r.calentamiento_abandonado:
+            print(f"  🌡️ Calentamiento (MSER-{r.tamano_lote_calentamiento}): NO detectado en {r.dias_observados_calentamiento} días "
+                  f"- se dejó de buscar (lotes_maximos_calentamiento); las estadísticas incluyen el transitorio")
+        else:
+            print(f"  🌡️ Calentamiento (MSER-{r.tamano_lote_calentamiento}): NO detectado en {r.dias_observados_calentamiento} días "
+                  f"- las estadísticas incluyen el transitorio (alargar el horizonte)")
+
+    print(f"\n🏠 PROPIEDADES:")
+    print(f"  Activas al inicio: {r.propiedades_activas_inicio}")
+    print(f"  Activas al final: {r.propiedades_activas_final}")
+    if r.mantener_propiedades_constante:
+        print(f"  ✅ Reposición automática: ACTIVADA")
+        print(f"  Nuevas propiedades creadas: {r.propiedades_creadas_nuevas:,}")
+    print(f"  Vendidas: {r.total_ventas}")
+    if r.mantener_propiedades_constante:
+        print(f"  Tasa de rotación: {r.total_ventas/(r.propiedades_activas_inicio + r.propiedades_creadas_nuevas)*100:.1f}%")
+    else:
+        print(f"  Tasa de venta: {r.total_ventas/r.propiedades_activas_inicio*100:.1f}%")
+
+    print(f"\n👥 VISITAS:")
+    print(f"  Total generadas: {r.total_visitas_generadas:,}")
+    print(f"  Con venta concretada: {r.total_ventas:,}")
+    print(f"  Con venta perdida: {r.ventas_perdidas:,}")
+    print(f"  Sin venta: {r.visitas_sin_venta:,}")
+    print(f"  Perdidas (sin agentes): {r.visitas_perdidas:,}")
+    if r.visitas_perdidas_por_limite_verificacion > 0:
+        print(f"  Perdidas (agente saturado de props en verificación): {r.visitas_perdidas_por_limite_verificacion:,}")
+    if r.visitas_derivadas_enviadas or r.visitas_derivadas_recibidas:
+        print(f"  Derivadas a otras oficinas: {r.visitas_derivadas_enviadas:,}")
+        print(f"  Recibidas de otras oficinas: {r.visitas_derivadas_recibidas:,} "
+              f"({r.visitas_derivadas_perdidas:,} perdidas)")
+
+    print(f"\n📈 TASAS DE CONVERSIÓN:")
+    print(f"  Visitas → Ventas: {tasa_conversion_visitas:.1%}")
+    print(f"  P(Venta|Visita) esperada: {r.probabilidad_venta:.1%}")
+    print(f"  Diferencia: {(tasa_conversion_visitas - r.probabilidad_venta)*100:+.2f}%")
+
+    print(f"\n💰 VENTAS:")
+    print(f"  Concretadas: {r.total_ventas:,}")
+    print(f"  Ganadas por re-engagement: {r.ventas_ganadas_por_re_engagement}")
+    print(f"  Tiempo promedio por venta: {formatear_horas_minutos(tiempos_venta.media)}")
+    if tiempos_venta.n:
+        print(f"  Tiempo por venta (mediana / p90): {formatear_horas_minutos(tiempos_venta.mediana)} / "
+              f"{formatear_horas_minutos(tiempos_venta.p90)}")
+        print(f"  Tiempo por venta (mín / máx): {formatear_horas_minutos(tiempos_venta.minimo)} / "
+              f"{formatear_horas_minutos(tiempos_venta.maximo)}")
+
+    print(f"\n👨‍💼 UTILIZACIÓN DE AGENTES:")
+    if r.usar_jornada_laboral:
+        nota_jornada = f" (jornada {r.hora_inicio_jornada//60}:00-{r.hora_fin_jornada//60}:00)"
+    else:
+        nota_jornada = " (24/7)"
+    print(f"  Base de cálculo: {formatear_horas_minutos(r.tiempo_efectivo)}{nota_jornada}")
+    print()
+
+    for agente in r.agentes:
+        # Marcar si está sobrecargado
+        marcador = " ⚠️ SOBRECARGA" if agente.utilizacion > 1.0 else ""
+        print(f"  Agente {agente.id}: {agente.utilizacion:.1%} ({formatear_horas_minutos(agente.tiempo_bloqueado)}) "
+              f"- Tareas: {agente.tareas:,}{marcador}")
+
+    # ✅ RESUMEN DE UTILIZACIÓN
+    utilizaciones = [agente.utilizacion for agente in r.agentes]
+    agentes_sobrecargados = sum(1 for u in utilizaciones if u > 1.0)
+    print(f"\n  📊 RESUMEN UTILIZACIÓN:")
+    print(f"     Promedio: {r.utilizacion_promedio:.1%}")
+    print(f"     Mínimo: {min(utilizaciones):.1%}")
+    print(f"     Máximo: {max(utilizaciones):.1%}")
+    if agentes_sobrecargados > 0:
+        print(f"     ⚠️  Agentes sobrecargados (>100%): {agentes_sobrecargados}/{len(r.agentes)}")
+
+    visitas_por_prop = r.visitas_por_venta
+    if visitas_por_prop.n:
+        print(f"\n📊 VISITAS POR PROPIEDAD VENDIDA:")
+        print(f"  Promedio: {visitas_por_prop.media:.1f} visitas")
+        print(f"  Mínimo: {visitas_por_prop.minimo} visitas")
+        print(f"  Máximo: {visitas_por_prop.maximo} visitas")
+
+    print(f"\n📐 VARIABLES DE ESTADO (promedio temporal / máximo):")
+    for nombre, valores in r.estado.items():
+        print(f"  {nombre}: {valores['media']:,.2f} / {valores['maximo']:,}")
+
+    print(f"\n⚡ RENDIMIENTO:")
+    print(f"  Eventos procesados: {r.eventos_procesados:,} ({r.eventos_por_segundo:,.0f} eventos/seg)")
+    if r.perfil is not None:
+        print(r.perfil.tabla())
+
+    print(f"\n📝 LOGGING:")
+    if r.log_criticos is not None:
+        total, en_memoria = r.log_criticos
+        print(f"  Eventos críticos registrados: {total:,} (últimos {en_memoria:,} en memoria)")
+    if r.log_actividades is not None:
+        total, en_memoria = r.log_actividades
+        print(f"  Total actividades: {total:,} (últimas {en_memoria:,} en memoria)")
+
+    print("=" * 80)
@@ -0,0 +1,63 @@
+"""
+Chequeos de la detección del calentamiento (MSER) sobre las estadísticas de estado.
+
+La detección sólo recorta estadísticas: la trayectoria del sistema es la misma
+con o sin detector, así que cada máximo reportado se puede comparar contra una
+corrida idéntica sin detección. Se corre con pytest o directamente
+(`python test_calentamiento.py`).
+"""
+from remax_corregido_optimizado import CONFIGURACION, SimulacionInmobiliaria
+
+
+def correr(horas: float, semilla: int, **config):
+    configuracion = dict(CONFIGURACION, semilla=semilla, **config)
+    return SimulacionInmobiliaria(configuracion).ejecutar_simulacion(horas, reporte=False)
+
+
+def comparar_maximos(horas: float, semilla: int):
+    con_deteccion = correr(horas, semilla, detectar_calentamiento=True)
+    sin_deteccion = correr(horas, semilla)
+    assert list(con_deteccion.estado) == list(sin_deteccion.estado)
+    for nombre, valores in con_deteccion.estado.items():
+        maximo_completo = sin_deteccion.estado[nombre]['maximo']
+        if con_deteccion.calentamiento_detectado:
+            # Recortado en el punto MSER: el máximo es el del tramo medido, nunca mayor al de la corrida
+            assert valores['maximo'] <= maximo_completo, nombre
+        else:
+            assert valores['maximo'] == maximo_completo, nombre
+    return con_deteccion
+
+
+def test_maximos_con_deteccion_pendiente():
+    """Mientras el detector no decide, cada variable reporta su propio máximo de toda la corrida"""
+    resultado = comparar_maximos(500, semilla=3)
+    assert not resultado.calentamiento_detectado
+
+
+def test_maximos_con_calentamiento_detectado():
+    resultado = comparar_maximos(8000, semilla=1)
+    assert resultado.calentamiento_detectado
+
+
+def test_deteccion_abandonada_libera_los_cortes():
+    """Sin decidir en lotes_maximos_calentamiento: no trunca, suelta los cortes y conserva los extremos"""
+    simulacion = SimulacionInmobiliaria(dict(
+        CONFIGURACION, semilla=3, detectar_calentamiento=True, lotes_maximos_calentamiento=22,
+    ))
+    con_deteccion = simulacion.ejecutar_simulacion(3000, reporte=False)
+    sin_deteccion = correr(3000, semilla=3)
+
+    assert con_deteccion.calentamiento_abandonado and not con_deteccion.calentamiento_detectado
+    assert con_deteccion.dias_observados_calentamiento == 22 * con_deteccion.tamano_lote_calentamiento
+    assert simulacion.cortes_calentamiento is None and simulacion.ventas_calentamiento is None
+    assert con_deteccion.total_ventas == sin_deteccion.total_ventas
+    for nombre, valores in con_deteccion.estado.items():
+        assert valores['maximo'] == sin_deteccion.estado[nombre]['maximo'], nombre
+        assert valores['media'] == sin_deteccion.estado[nombre]['media'], nombre
+
+
+if __name__ == "__main__":
+    test_maximos_con_deteccion_pendiente()
+    test_maximos_con_calentamiento_detectado()
+    test_deteccion_abandonada_libera_los_cortes()
+    print("✅ Los máximos de estado coinciden con la corrida sin detección")
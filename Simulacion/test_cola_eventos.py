@@ -0,0 +1,83 @@
+"""
+Chequeo cruzado de las colas de eventos contra el heap de referencia (ColaEventos).
+
+Programa y extrae eventos al azar, con la mezcla que genera el motor (demoras
+fijas, llegadas aleatorias, eventos lejanos y empates) y exige que cada cola
+devuelva exactamente la misma secuencia que el heap. Se corre con pytest o
+directamente (`python test_cola_eventos.py`).
+"""
+import random
+
+import pytest
+
+from cola_eventos import ColaCalendario, ColaCarriles, ColaEventos, FIN_VISITA, FIN_VERIFICACION, VISITA
+
+DEMORAS_FIJAS = {FIN_VISITA: 60.0, FIN_VERIFICACION: 43200.0}
+
+
+def crear_cola(tipo: str):
+    if tipo == 'calendario':
+        return ColaCalendario()
+    return ColaCarriles(tuple(DEMORAS_FIJAS))
+
+
+def comparar_con_heap(tipo: str, semilla: int, operaciones: int = 20000):
+    azar = random.Random(semilla)
+    referencia = ColaEventos()
+    cola = crear_cola(tipo)
+    ahora = 0.0
+    for _ in range(operaciones):
+        if referencia and azar.random() < 0.45:
+            if azar.random() < 0.5:
+                assert cola.proximo_tiempo() == referencia.proximo_tiempo()
+            evento = cola.extraer()
+            assert evento == referencia.extraer()
+            ahora = evento[0]
+            continue
+
+        sorteo = azar.random()
+        if sorteo < 0.4:
+            codigo = azar.choice(tuple(DEMORAS_FIJAS))
+            tiempo = ahora + DEMORAS_FIJAS[codigo]
+        elif sorteo < 0.5:
+            codigo, tiempo = VISITA, ahora  # Empate con el reloj: desempata la secuencia
+        elif sorteo < 0.55:
+            codigo, tiempo = VISITA, ahora + azar.uniform(1e4, 1e6)  # Lejano: más de un "año" de buckets
+        else:
+            codigo, tiempo = VISITA, ahora + round(azar.expovariate(1 / 3), 1) * 0.775
+        referencia.programar(tiempo, codigo, 1, 2)
+        cola.programar(tiempo, codigo, 1, 2)
+        assert len(cola) == len(referencia)
+
+    while referencia:
+        assert cola.extraer() == referencia.extraer()
+    assert not cola
+
+
+@pytest.mark.parametrize('tipo', ['calendario', 'carriles'])
+@pytest.mark.parametrize('semilla', [90, 1, 2025])
+def test_mismo_orden_que_el_heap(tipo, semilla):
+    comparar_con_heap(tipo, semilla)
+
+
+def test_calendario_sin_deriva_del_tope():
+    """Con un ancho no representable exacto (0.775) y miles de días recorridos, ningún evento se saltea"""
+    referencia = ColaEventos()
+    cola = ColaCalendario(cantidad_buckets=4, ancho=0.775)
+    for dia in range(1, 3000):
+        tiempo = dia * 0.775  # Justo en el borde de cada día
+        referencia.programar(tiempo, VISITA)
+        cola.programar(tiempo, VISITA)
+        referencia.programar(tiempo + 0.1, VISITA)
+        cola.programar(tiempo + 0.1, VISITA)
+        assert cola.extraer() == referencia.extraer()
+    while referencia:
+        assert cola.extraer() == referencia.extraer()
+
+
+if __name__ == "__main__":
+    for tipo in ('calendario', 'carriles'):
+        for semilla in (90, 1, 2025):
+            comparar_con_heap(tipo, semilla)
+    test_calendario_sin_deriva_del_tope()
+    print("✅ Las colas devuelven el mismo orden que el heap")
@@ -0,0 +1,63 @@
+"""
+Chequeos de las variables de estado de propiedades (espera y gestión).
+
+Espera y gestión cuentan propiedades: en todo momento suman las activas, y en
+el motor exacto gestión es la cantidad de propiedades con alguna gestión
+pendiente en la cola de eventos o en la cola de escribanías de un agente.
+Se corre con pytest o directamente (`python test_estado.py`).
+"""
+from collections import Counter
+
+import pytest
+
+from cola_eventos import VISITA
+from modo_rapido import SimulacionRapida
+from motor_vectorizado import COLUMNA_ACTIVAS, COLUMNA_ESPERA, COLUMNA_GESTION, SimulacionVectorizada
+from remax_corregido_optimizado import CONFIGURACION, SimulacionInmobiliaria
+
+HORAS = 2000
+
+
+def configuracion(mantener: bool):
+    return dict(CONFIGURACION, semilla=1, mantener_propiedades_constante=mantener, cola_eventos='heap')
+
+
+@pytest.mark.parametrize('mantener', [True, False])
+def test_gestion_cuenta_propiedades_con_gestiones_pendientes(mantener):
+    simulacion = SimulacionInmobiliaria(configuracion(mantener))
+    simulacion.ejecutar_simulacion(HORAS, reporte=False)
+
+    pendientes = Counter(evento[3] for evento in simulacion.eventos._heap if evento[2] != VISITA)
+    for agente in simulacion.agentes.values():
+        pendientes.update(agente.escribanias_pendientes)
+    en_gestion = sum(1 for propiedad_id in simulacion.propiedades_activas if pendientes[propiedad_id])
+
+    assert simulacion.estado_propiedades_en_gestion.valor == en_gestion
+    assert simulacion.estado_propiedades_en_espera.valor == len(simulacion.propiedades_activas) - en_gestion
+
+
+@pytest.mark.parametrize('mantener', [True, False])
+def test_espera_mas_gestion_son_las_activas_en_modo_rapido(mantener):
+    simulacion = SimulacionRapida(configuracion(mantener))
+    simulacion.ejecutar_simulacion(HORAS, reporte=False)
+    assert (simulacion.estado_propiedades_en_espera.valor + simulacion.estado_propiedades_en_gestion.valor
+            == simulacion.estado_propiedades_activas.valor == len(simulacion.propiedades_activas))
+
+
+@pytest.mark.parametrize('mantener', [True, False])
+def test_espera_mas_gestion_son_las_activas_en_motor_vectorizado(mantener):
+    simulacion = SimulacionVectorizada(configuracion(mantener), 4)
+    simulacion.ejecutar_simulacion(HORAS)
+    valor = simulacion.estado.valor
+    assert (valor[:, COLUMNA_ESPERA] + valor[:, COLUMNA_GESTION] == valor[:, COLUMNA_ACTIVAS]).all()
+    assert (valor[:, COLUMNA_ACTIVAS] == simulacion.propiedades_activas).all()
+    # Las casillas vendidas vuelven a cero gestiones abiertas (las descartadas ya no cuentan)
+    assert ((simulacion.gestiones_abiertas > 0).sum(1) == valor[:, COLUMNA_GESTION]).all()
+
+
+if __name__ == "__main__":
+    for mantener in (True, False):
+        test_gestion_cuenta_propiedades_con_gestiones_pendientes(mantener)
+        test_espera_mas_gestion_son_las_activas_en_modo_rapido(mantener)
+        test_espera_mas_gestion_son_las_activas_en_motor_vectorizado(mantener)
+    print("✅ Espera y gestión cuentan propiedades en los tres motores")
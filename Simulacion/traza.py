@@ -0,0 +1,158 @@
+"""
+Traza binaria columnar de los eventos procesados por la simulación.
+
+Cada evento procesado se guarda como una fila (tiempo, código de evento,
+propiedad, agente, resultado) en un buffer estructurado de NumPy
+pre-reservado. Cuando el buffer se llena, cada columna se agrega a su propio
+archivo binario crudo en el directorio de la traza. Al cerrar se escribe
+`traza.json` con el esquema y la cantidad de filas, y `cargar_traza` devuelve
+las columnas como `np.memmap` (no hace falta leer ni parsear todo el archivo).
+"""
+import json
+import os
+from typing import Dict
+
+import numpy as np
+
+from cola_eventos import NOMBRES_EVENTOS
+
+VERSION_TRAZA = 1
+
+# Resultados de los manejadores de eventos
+SIN_RESULTADO = 0
+VISITA_ATENDIDA = 1
+VISITA_FUERA_HORARIO = 2
+VISITA_SIN_PROPIEDADES = 3
+VISITA_SIN_AGENTES = 4
+VENTA = 5
+SIN_VENTA = 6
+VENTA_RECHAZADA = 7
+ARREPENTIMIENTO = 8
+A_VERIFICACION = 9
+RENEGOCIACION_EXITOSA = 10
+RENEGOCIACION_FALLIDA = 11
+ESCRIBANIA_INICIADA = 12
+ESCRIBANIA_EN_ESPERA = 13
+VENTA_CONCRETADA = 14
+PROPIEDAD_INEXISTENTE = 15
+VISITA_DERIVADA = 16  # Sin agentes: derivada a otra oficina de la red
+
+NOMBRES_RESULTADOS = (
+    'sin_resultado',
+    'visita_atendida',
+    'visita_fuera_horario',
+    'visita_sin_propiedades',
+    'visita_sin_agentes',
+    'venta',
+    'sin_venta',
+    'venta_rechazada',
+    'arrepentimiento',
+    'a_verificacion',
+    'renegociacion_exitosa',
+    'renegociacion_fallida',
+    'escribania_iniciada',
+    'escribania_en_espera',
+    'venta_concretada',
+    'propiedad_inexistente',
+    'visita_derivada',
+)
+
+DTYPE_TRAZA = np.dtype([
+    ('tiempo', '<f8'),
+    ('codigo', 'u1'),
+    ('propiedad', '<i8'),
+    ('agente', '<i4'),
+    ('resultado', 'u1'),
+])
+
+
+class RegistradorTraza:
+    """Acumula eventos en un buffer estructurado y lo vuelca por columnas a disco"""
+
+    def __init__(self, directorio: str, tamano_bloque: int = 65536):
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.buffer = np.empty(tamano_bloque, dtype=DTYPE_TRAZA)
+        self.cantidad_buffer = 0
+        self.total = 0
+        self.archivos = {
+            campo: open(os.path.join(directorio, f"{campo}.bin"), 'wb')
+            for campo in DTYPE_TRAZA.names
+        }
+
+    def registrar(self, tiempo: float, codigo: int, propiedad_id: int, agente_id: int, resultado: int):
+        self.buffer[self.cantidad_buffer] = (tiempo, codigo, propiedad_id, agente_id, resultado)
+        self.cantidad_buffer += 1
+        if self.cantidad_buffer == len(self.buffer):
+            self.volcar()
+
+    def volcar(self):
+        """Agrega el contenido del buffer al final de cada archivo de columna"""
+        n = self.cantidad_buffer
+        if n == 0:
+            return
+        for campo, archivo in self.archivos.items():
+            self.buffer[campo][:n].tofile(archivo)
+        self.total += n
+        self.cantidad_buffer = 0
+
+    def cerrar(self):
+        """Vuelca lo pendiente y escribe el esquema de la traza"""
+        if not self.archivos:
+            return
+        self.volcar()
+        for archivo in self.archivos.values():
+            archivo.close()
+        self.archivos = {}
+
+        esquema = {
+            'version': VERSION_TRAZA,
+            'filas': self.total,
+            'columnas': {campo: DTYPE_TRAZA[campo].str for campo in DTYPE_TRAZA.names},
+            'eventos': list(NOMBRES_EVENTOS),
+            'resultados': list(NOMBRES_RESULTADOS),
+        }
+        with open(os.path.join(self.directorio, 'traza.json'), 'w', encoding='utf-8') as archivo:
+            json.dump(esquema, archivo, indent=2)
+
+    def __getstate__(self):
+        # Para checkpoints: se vuelca el buffer y se guarda sólo cuántas filas hay en disco
+        abierta = bool(self.archivos)
+        if abierta:
+            self.volcar()
+            for archivo in self.archivos.values():
+                archivo.flush()
+        estado = dict(self.__dict__)
+        estado['archivos'] = abierta
+        estado['buffer'] = len(self.buffer)
+        return estado
+
+    def __setstate__(self, estado):
+        abierta = estado.pop('archivos')
+        self.__dict__.update(estado)
+        self.buffer = np.empty(estado['buffer'], dtype=DTYPE_TRAZA)
+        self.archivos = {}
+        if abierta:
+            # Descartar las filas escritas después del checkpoint y seguir agregando
+            for campo in DTYPE_TRAZA.names:
+                ruta = os.path.join(self.directorio, f"{campo}.bin")
+                with open(ruta, 'r+b') as archivo:
+                    archivo.truncate(self.total * DTYPE_TRAZA[campo].itemsize)
+                self.archivos[campo] = open(ruta, 'ab')
+
+
+def cargar_traza(directorio: str) -> Dict[str, np.ndarray]:
+    """Abre una traza como columnas mapeadas en memoria (solo lectura)"""
+    with open(os.path.join(directorio, 'traza.json'), encoding='utf-8') as archivo:
+        esquema = json.load(archivo)
+    if esquema['version'] != VERSION_TRAZA:
+        raise ValueError(f"Versión de traza no soportada: {esquema['version']}")
+
+    filas = esquema['filas']
+    columnas = {}
+    for campo, tipo in esquema['columnas'].items():
+        if filas == 0:
+            columnas[campo] = np.empty(0, dtype=tipo)
+        else:
+            columnas[campo] = np.memmap(os.path.join(directorio, f"{campo}.bin"), dtype=tipo, mode='r', shape=(filas,))
+    return columnas